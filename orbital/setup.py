@@ -37,7 +37,7 @@ setup(
     },
     packages=['orbital', 'orbital.cossin', 'orbital.pov', 'orbital.povray', 'orbital.prod', 'orbital.sphere'],
     # include_package_data = True,
-    package_data={'orbital': ['orb_tools.sobj'], 'orbital.cossin':['cos_sin.txt']},
+    package_data={'orbital': ['orb_tools.sobj'], 'orbital.cossin':['cos_sin.txt', 'cos_sin.bin']},
     install_requires=['linear_series'],
     setup_requires=['pytest-runner'],
     tests_require=['pytest'],
@@ -42,6 +42,9 @@ from orbital.class_orb_ring import OrbRing
 
 from orbital.prod.class_orb_input import OrbInput
 from orbital.prod.orb_product import orb_product
+from orbital.prod.orb_batch import orb_product_batch
+from orbital.prod.class_orb_dedup import OrbDedup
+from orbital.prod.orb_bench import orb_bench
 
 from linear_series.class_linear_series import LinearSeries
 from linear_series.class_base_points import BasePointTree
@@ -178,6 +181,58 @@ def usecase_orb_product( num=10 ):
             OrbTools.p( o )
 
 
+def usecase_orb_product_batch( num=100, workers=4, timeout=600 ):
+    '''
+    As "usecase_orb_product()", but the random surfaces are
+    computed in parallel by "workers" child processes.
+    Computations that take longer than "timeout" seconds
+    are aborted. Random inputs that are equivalent to a
+    previous input are skipped (see "OrbDedup").
+
+    Parameters
+    ----------
+    num : int
+        Number of times a random surface should be computed.
+
+    workers : int
+        Number of child processes.
+
+    timeout : int
+        Number of seconds.
+    '''
+
+    input_lst = []
+    for idx in range( num ):
+        input = OrbInput().random( 3, False )  # random input
+        for key in input.do.keys(): input.do[key] = False
+        input.do['imp'] = True
+        input.do['dde'] = True
+        input_lst += [input]
+
+    dedup = OrbDedup()
+    for idx, o, err in orb_product_batch( input_lst, workers, timeout, dedup ):
+        if err != None and err.startswith( 'Equivalent' ):
+            OrbTools.p( 'Skipped input', idx, ':', err )
+        elif err != None:
+            OrbTools.p( 'Exception occurred: ', err )
+            OrbTools.p( input_lst[idx] )
+        else:
+            OrbTools.p( '(deg, emb, dim ) =', ( o.deg, o.emb, o.dim ), ' short string =', o.get_short_str() )
+    OrbTools.p( dedup )
+
+
+def usecase_orb_bench( fname='orb_bench.json' ):
+    '''
+    Benchmarks the stages of "orb_product()" for fixed examples
+    and writes the timings and memory usage as JSON to "fname".
+    Use "orb_bench.orb_bench_compare()" to compare two such files.
+    '''
+    out_dct = orb_bench( fname=fname )
+    for name in out_dct['bench']:
+        for stage in out_dct['bench'][name]:
+            OrbTools.p( name, stage, out_dct['bench'][name][stage] )
+
+
 def usecase_orb_product_implicit_circle( num=10 ):
     '''
     Outputs "num" random surfaces in the projective n-sphere S^n, 
@@ -322,6 +377,8 @@ if __name__ == '__main__':
     usecase_celestial_types()
     # usecase_povray()  # takes a long time
     usecase_orb_product( 10 )
+    # usecase_orb_product_batch( 100, 4, 600 )
+    # usecase_orb_bench( 'orb_bench.json' )
     usecase_orb_product_implicit_circle( 10 )
     usecase_orb_product_investigate_example()
     usecase__two_sphere_cyclide()
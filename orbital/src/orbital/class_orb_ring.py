@@ -11,8 +11,26 @@ from orbital.sage_interface import sage_PolynomialRing
 from orbital.sage_interface import sage__eval
 from orbital.sage_interface import sage_var
 
+from orbital.poly_maps import convert_pol
 
-class OrbRing:
+
+class OrbRingMeta( type ):
+    '''
+    Metaclass of "OrbRing" such that the ring "OrbRing.R" 
+    is only constructed when it is accessed for the first time.
+    '''
+
+    def __getattr__( cls, name ):
+        '''
+        Called if the class attribute "name" does not exist.
+        '''
+        if name != 'R':
+            raise AttributeError( 'type object ' + repr( cls.__name__ ) + ' has no attribute ' + repr( name ) )
+        cls.R = sage_PolynomialRing( cls.num_field, sage_var( cls.vstr ), order='degrevlex' )
+        return cls.R
+
+
+class OrbRing( metaclass=OrbRingMeta ):
 
     num_field = sage_QQ
 
@@ -22,11 +40,93 @@ class OrbRing:
     vstr += 'c0,s0,c1,s1,'
     vstr += 't0,t1,t2,t3,t4,t5,t6,t7'
 
-    R = sage_PolynomialRing( num_field, sage_var( vstr ), order='degrevlex' )
+    # R = sage_PolynomialRing( num_field, sage_var( vstr ), order='degrevlex' )
+    # is constructed on first use by "OrbRingMeta"
+
+    ring_dct = {}  # used by "OrbRing.get_ring()"
 
     @staticmethod
     def coerce( expr ):
-        return sage__eval( str( expr ), OrbRing.R.gens_dict() )
+        '''
+        Parameters
+        ----------
+        expr : object
+            A string, a polynomial or a (nested) list of polynomials.
+        
+        Returns
+        -------
+        object
+            The evaluation of "expr" in "OrbRing.R". Polynomials are 
+            converted via their exponent/coefficient dictionaries 
+            (see "poly_maps.convert_pol()").
+        '''
+        if type( expr ) == str:
+            return sage__eval( expr, OrbRing.R.gens_dict() )
+        return convert_pol( expr, OrbRing.R )
+
+    @staticmethod
+    def get_ring( vstr, base=None, order='degrevlex' ):
+        '''
+        Parameters
+        ----------
+        vstr : string
+            A string of comma separated variable names (eg. 'x0,x1,c0,s0').
+            
+        base : sage_RING
+            The base ring. If None, then "OrbRing.num_field" is used.
+            
+        order : string
+            A monomial order.
+        
+        Returns
+        -------
+        sage_RING
+            A polynomial ring over "base" with only the variables 
+            in "vstr". The ring is constructed only once for each 
+            input. Polynomials in "OrbRing.R" that only depend on the 
+            variables in "vstr" can be converted to this ring with
+            "ring(pol)" and back with "OrbRing.R(pol)", where 
+            variables with the same name are identified.  
+        '''
+        if base == None:
+            base = OrbRing.num_field
+
+        key = ( vstr, base, order )
+        if key not in OrbRing.ring_dct:
+            OrbRing.ring_dct[key] = sage_PolynomialRing( base, vstr, order=order )
+
+        return OrbRing.ring_dct[key]
+
+    @staticmethod
+    def get_var_ring( pol_lst, base=None, order='degrevlex' ):
+        '''
+        Parameters
+        ----------
+        pol_lst : list<OrbRing.R>
+            A list of polynomials.
+            
+        base : sage_RING
+            Passed to "OrbRing.get_ring()".
+
+        order : string
+            Passed to "OrbRing.get_ring()".
+        
+        Returns
+        -------
+        sage_RING
+            A polynomial ring with only the variables of "OrbRing.R"
+            that occur in "pol_lst". The variables are ordered as in
+            "OrbRing.R" so that a monomial order on both rings
+            agrees on polynomials in "pol_lst".
+        '''
+        var_set = set( [] )
+        for pol in pol_lst:
+            var_set.update( OrbRing.R( pol ).variables() )
+        if var_set == set( [] ):
+            var_set = set( [OrbRing.R.gen( 0 )] )
+        vstr = ','.join( [ str( gen ) for gen in OrbRing.R.gens() if gen in var_set ] )
+
+        return OrbRing.get_ring( vstr, base, order )
 
     @staticmethod
     def random_int( val ):
@@ -7,7 +7,7 @@ Created on Nov 23, 2017
 from orbital.sage_interface import sage_save
 from orbital.sage_interface import sage_load
 
-import inspect
+import types
 import time
 import sys
 import os
@@ -41,6 +41,14 @@ class OrbTools():
     __filter_fname_lst = []
     __prev_filter_fname_lst = None
 
+    # private static variables used by ".p()"
+    # Output of ".p()" with a level larger than "__level"
+    # is surpressed. The dictionary "__fname_dct" caches the
+    # base names of the file names of calling modules.
+    #
+    __level = 2
+    __fname_dct = {}
+
     @staticmethod
     def filter( filter_fname_lst ):
         '''
@@ -71,12 +79,32 @@ class OrbTools():
         OrbTools.__filter_fname_lst = OrbTools.__prev_filter_fname_lst
 
     @staticmethod
-    def p( *arg_lst ):
+    def set_level( level ):
+        '''
+        Parameters
+        ----------
+        level : int
+            Output of "OrbTools.p( ..., lvl=<lvl> )" is surpressed 
+            if <lvl> is larger than "level". By default "level" is 2.
+            If "level" is 0, then all output is surpressed.
+        '''
+        OrbTools.__level = level
+
+    @staticmethod
+    def p( *arg_lst, lvl=1 ):
         '''
         Parameters
         ----------
         *arg_lst
-            Variable length argument list.
+            Variable length argument list. Arguments that are 
+            functions without parameters (eg. "lambda: str(pol)") 
+            are only called if the output is not surpressed, 
+            and their return values are printed instead.
+            
+        lvl : int
+            The level of the output. We use 1 for progress 
+            information and 2 for large details, such as lists
+            of polynomials (see ".set_level()").
         
         Returns
         -------
@@ -84,20 +112,27 @@ class OrbTools():
             If ".filter_on(<fname>)" has been called and the file name
             of the calling module does not coincide with <fname>
             and <fname>!=None, then the output is surpressed and 
-            "None" is returned.
+            "None" is returned. Also if "lvl" is larger than the 
+            level set by ".set_level()" then "None" is returned.
                                                      
             Otherwise, this method prints arguments to "sys.stdout" 
-            together with reflection info from "inspect.stack()".
+            together with the method name and line number of the caller.
             Additional returns the output string.
               
             Call ".filter_off()" to turn off filter, such that
             all output is send to "sys.stdout".                                     
         '''
-        # collect relevant info from stack trace
-        sk_lst_lst = inspect.stack()
-        file_name = os.path.basename( str( sk_lst_lst[1][1] ) )  # exclude path from file name
-        line = str( sk_lst_lst[1][2] )
-        method_name = str( sk_lst_lst[1][3] )
+        # return immediately if all output is surpressed
+        if OrbTools.__filter_fname_lst == [] or lvl > OrbTools.__level:
+            return None
+
+        # collect relevant info from the frame of the caller
+        frame = sys._getframe( 1 )
+        code = frame.f_code
+        file_name = OrbTools.__fname_dct.get( code.co_filename, None )
+        if file_name == None:
+            file_name = os.path.basename( str( code.co_filename ) )  # exclude path from file name
+            OrbTools.__fname_dct[code.co_filename] = file_name
 
         # only output when .p() is called from module whose
         # file name is in OrbTools.__filter_fname_lst
@@ -106,8 +141,10 @@ class OrbTools():
                 return
 
         # construct output string
-        s = method_name + '(' + line + ')' + ': '
+        s = code.co_name + '(' + str( frame.f_lineno ) + ')' + ': '
         for arg in arg_lst:
+            if type( arg ) == types.FunctionType:
+                arg = arg()
             s += str( arg ) + ' '
 
         # print output
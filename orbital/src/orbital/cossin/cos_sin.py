@@ -5,22 +5,32 @@ Created on Aug 10, 2016
 '''
 
 import os
+import math
+import bisect
+import struct
 
-from orbital.sage_interface import sage_QQ
-from orbital.sage_interface import sage_pi
-from orbital.sage_interface import sage_sin
-from orbital.sage_interface import sage_cos
-from orbital.sage_interface import sage_arctan
+from fractions import Fraction
 
 from orbital.class_orb_tools import OrbTools
 
+# The format of a record in the binary table "cos_sin.bin" (see "build_pt_table()"):
+# little-endian unsigned short <angle> followed by three signed ints <a>, <b> and <c>.
+pt_fmt = '<H3i'
+
+pt_table_dct = {}  # used by "get_pt_dct()"
+pt_index_dct = {}  # used by "get_pt_index()"
+
+# ( cos, sin ) at 0, 90, 180 and 270 degrees
+cs_exact_lst = [( 1, 0 ), ( 0, 1 ), ( -1, 0 ), ( 0, -1 )]
+
 
 def get_cs( angle ):
     '''
     Parameters
     ----------
     angle: int 
-        An integer in [0,360).
+        An integer in [0,360). If "angle" is not an integer, 
+        then the output of "get_cs_approx( angle )" is returned.
     
     Returns
     -------
@@ -30,12 +40,18 @@ def get_cs( angle ):
         and ( a, b ) is a rational approximation of 
             ( cos(angle/180*pi), sin(angle/180*pi) ).
     '''
-    angle = angle % 360
+    # import Sage only when needed (see "build_pt_table()")
+    from orbital.sage_interface import sage_QQ
+
+    if angle != int( angle ):
+        return get_cs_approx( angle )
 
-    radi = ( sage_QQ( angle ) / 180 ) * sage_pi
+    angle = int( angle ) % 360
 
-    if sage_sin( radi ) in sage_QQ and sage_cos( radi ) in sage_QQ:
-        return ( sage_QQ( sage_cos( radi ) ), sage_QQ( sage_sin( radi ) ) )
+    # cosine and sine are both rational only at multiples of 90 degrees
+    if angle % 90 == 0:
+        c, s = cs_exact_lst[angle // 90]
+        return ( sage_QQ( c ), sage_QQ( s ) )
 
     p0, p1, p2 = get_pt_dct()[angle % 90]
 
@@ -53,76 +69,292 @@ def get_cs( angle ):
     return rc, rs
 
 
-def get_pt_dct( fname='cos_sin' ):
+def get_pt_index( fname='cos_sin' ):
+    '''
+    Parameters
+    ----------
+    fname: string
+        Name of file without extention (see "build_pt_table()").
+    
+    Returns
+    -------
+    tuple
+        A 2-tuple ( <angle_lst>, <pt_lst> ) where <pt_lst> is a list of 
+        the primitive Pythagorian triples [a,b,c] in "<fname>.txt" 
+        together with all their sign changes and swaps of a and b,
+        and the triples [1,0,1], [0,1,1], [-1,0,1] and [0,-1,1].
+        The list <angle_lst> contains the angles of the points (a/c,b/c)
+        on the unit circle in degrees in [0,360). Both lists are sorted 
+        by angle so that a nearest point can be found with bisection
+        (see "get_cs_approx()"). The index is computed once and kept 
+        in memory.
+    '''
+    if fname in pt_index_dct:
+        return pt_index_dct[fname]
+
+    path = os.path.dirname( os.path.abspath( __file__ ) ) + '/'
+    ang_pt_lst = [ ( 90.0 * k, [c, s, 1] ) for k, ( c, s ) in enumerate( cs_exact_lst ) ]
+    with open( path + fname + '.txt', 'r' ) as f:
+        for line in f:
+            p0, p1, p2 = [ int( ps ) for ps in line.split() ]
+            if math.gcd( p0, p1 ) != 1:
+                continue  # multiple of a smaller triple
+            for a, b in [( p0, p1 ), ( p1, p0 )]:
+                for sa, sb in [( 1, 1 ), ( -1, 1 ), ( -1, -1 ), ( 1, -1 )]:
+                    angle = math.degrees( math.atan2( sb * b, sa * a ) ) % 360
+                    ang_pt_lst += [( angle, [sa * a, sb * b, p2] )]
+
+    ang_pt_lst.sort( key = lambda ang_pt: ang_pt[0] )
+    pt_index_dct[fname] = ( [ ang for ang, pt in ang_pt_lst ], [ pt for ang, pt in ang_pt_lst ] )
+
+    return pt_index_dct[fname]
+
+
+def get_sb_simplest( lo, hi ):
+    '''
+    Parameters
+    ----------
+    lo : fractions.Fraction
+        A positive rational number.
+        
+    hi : fractions.Fraction
+        A rational number with lo<=hi.
+    
+    Returns
+    -------
+    fractions.Fraction
+        The simplest rational number in the interval [lo,hi], 
+        namely the first rational number in this interval that
+        is met when walking down the Stern-Brocot tree. It has 
+        the smallest denominator and numerator among the rational 
+        numbers in [lo,hi]. The number of steps is logarithmic
+        in the size of the output, since runs of steps in the same 
+        direction are taken at once via continued fractions.
+    '''
+    n = math.floor( lo )
+    if n == lo:
+        return Fraction( n )
+    if n + 1 <= hi:
+        return Fraction( n + 1 )
+    return n + 1 / get_sb_simplest( 1 / ( hi - n ), 1 / ( lo - n ) )
+
+
+def get_cs_approx( angle, tol = 1e-3, max_height = None ):
+    '''
+    Parameters
+    ----------
+    angle : float
+        An angle in degrees.
+        
+    tol : float
+        Tolerance in degrees. If None, then the nearest
+        point in "get_pt_index()" is returned.
+        
+    max_height : int
+        Upper bound for the common denominator of the output.
+        If None, then the height is not bounded.
+
+    Returns
+    -------
+    (sage_QQ,sage_QQ)
+        A pair of rational numbers (a,b) such that a^2+b^2=1 
+        and the angle of (a,b) differs at most "tol" from "angle".
+        At multiples of 90 degrees we return exact values.
+        Otherwise, let t be the simplest rational number in the
+        interval [ tan((angle-tol)/2), tan((angle+tol)/2) ] 
+        (see "get_sb_simplest()"). We return 
+            ( (1-t^2)/(1+t^2), 2t/(1+t^2) ),
+        which is a rational point of smallest height within the 
+        tolerance. A ValueError is raised if the common denominator 
+        is larger than "max_height".
+    '''
+    # import Sage only when needed (see "build_pt_table()")
+    from orbital.sage_interface import sage_QQ
+
+    angle = float( angle ) % 360
+
+    # nearest point in index
+    if tol == None:
+        angle_lst, pt_lst = get_pt_index()
+        idx = bisect.bisect_left( angle_lst, angle ) % len( angle_lst )
+        dist = lambda i: min( abs( angle_lst[i] - angle ), 360 - abs( angle_lst[i] - angle ) )
+        a, b, c = pt_lst[ min( [idx - 1, idx], key = dist ) ]
+        return ( sage_QQ( a ) / c, sage_QQ( b ) / c )
+
+    # exact points
+    k = round( angle / 90 )
+    if abs( angle - 90 * k ) <= tol:
+        c, s = cs_exact_lst[k % 4]
+        return ( sage_QQ( c ), sage_QQ( s ) )
+
+    # Stern-Brocot walk; the interval does not contain a multiple
+    # of 90 degrees so that tan(<angle>/2) is monotone and of constant sign.
+    t0 = Fraction( math.tan( math.radians( angle - tol ) / 2 ) )
+    t1 = Fraction( math.tan( math.radians( angle + tol ) / 2 ) )
+    if t0 > 0:
+        t = get_sb_simplest( t0, t1 )
+    else:
+        t = -get_sb_simplest( -t1, -t0 )
+
+    p, q = t.numerator, t.denominator
+    a, b, c = q * q - p * p, 2 * p * q, q * q + p * p
+    g = math.gcd( math.gcd( a, b ), c )
+    a, b, c = a // g, b // g, c // g
+    if max_height != None and c > max_height:
+        raise ValueError( 'No rational point within tolerance and height bound:', angle, tol, max_height )
+
+    return ( sage_QQ( a ) / c, sage_QQ( b ) / c )
+
+
+def get_cs_lst( angle_lst, tol = 1e-3, max_height = None ):
+    '''
+    Parameters
+    ----------
+    angle_lst : list<float>
+        A list of angles in degrees.
+        
+    tol : float
+    
+    max_height : int
+    
+    Returns
+    -------
+    list
+        A list of outputs of "get_cs( <angle> )" for each integral 
+        angle and of "get_cs_approx( <angle>, tol, max_height )" 
+        otherwise. Angles that occur more than once are computed once.
+    '''
+    cs_dct = {}
+    cs_lst = []
+    for angle in angle_lst:
+        if angle not in cs_dct:
+            if angle == int( angle ):
+                cs_dct[angle] = get_cs( angle )
+            else:
+                cs_dct[angle] = get_cs_approx( angle, tol, max_height )
+        cs_lst += [ cs_dct[angle] ]
+    return cs_lst
+
+
+def get_pt_txt_dct( fname='cos_sin' ):
     '''
     Reads in a list of Pythagorian triples, which was obtained from:
     <http://www.tsm-resources.com/alists/PythagTriples.txt>
+    This method does not write any files and does not depend on Sage.
     
     Parameters
     ----------
     fname: string
         Name of file without extention
-        The file should contain 3 integers on each line separated by spaces. 
-        We expect them to be Pythagorian triples.
+        The file "<fname>.txt" should contain 3 integers on each line 
+        separated by spaces. We expect them to be Pythagorian triples.
         
     Returns
     -------
     dict
-        A dictionary 
-            { 
-                angle : [a,b,c],
-                ... 
-            }
-        where a^2+b^2=c^2 and <angle> corresponds to 
-            round(arctan( <b>/<a> )*180/pi)
-        The key <angle> runs from 1 to 89 degrees.           
+        The dictionary as returned by "get_pt_dct()".
+        A ValueError is raised if a line in the file
+        is not a Pythagorian triple.        
     '''
-
-    key = 'cossin'
-    if key in OrbTools.get_tool_dct():
-        return OrbTools.get_tool_dct()[key]
-
     path = os.path.dirname( os.path.abspath( __file__ ) ) + '/'
     file_name = path + fname
     OrbTools.p( 'Calculating Pythagorian triples and angles from:', file_name )
 
-    angle_lst = []
     pt_dct = {}
     with open( file_name + '.txt', 'r' ) as f:
         for line in f:
-            ps_lst = line.replace( '\r\n', '' ).split()
-            pt0 = [ sage_QQ( ps ) for ps in ps_lst ]  # need to be divisable!
+            p0, p1, p2 = [ int( ps ) for ps in line.split() ]
+            if p0 ** 2 + p1 ** 2 != p2 ** 2:
+                raise ValueError( 'Expect a file containing Pythagorian triples:', line )
 
-            # Try all combinations
-            # while a triple is still small.
             # We assume that the Pythagorian triples are
-            # ordered on coefficient size in the input file.
+            # ordered on coefficient size in the input file
+            # so that we keep the smallest triple for each angle.
+            # Sign changes do not lead to new positive angles.
             #
-            pt1a = [ pt0[0], pt0[1], pt0[2]]
-            pt1b = [ -pt0[0], pt0[1], pt0[2]]
-            pt1c = [ pt0[0], -pt0[1], pt0[2]]
-            pt1d = [ -pt0[0], -pt0[1], pt0[2]]
+            for pt in [ [p0, p1, p2], [p1, p0, p2] ]:
 
-            pt2a = [ pt0[1], pt0[0], pt0[2]]
-            pt2b = [ -pt0[1], pt0[0], pt0[2]]
-            pt2c = [ pt0[1], -pt0[0], pt0[2]]
-            pt2d = [ -pt0[1], -pt0[0], pt0[2]]
+                # cos = pt[0]/pt[2], sin = pt[1]/pt[2], tan=sin/cos
+                angle = round( math.degrees( math.atan( pt[1] / pt[0] ) ) )
 
-            for pt in [pt1a, pt1b, pt1c, pt1d, pt2a, pt2b, pt2c, pt2d]:
+                if angle not in pt_dct and angle > 0:
+                    pt_dct[angle] = pt
 
-                if pt[0] ** 2 + pt[1] ** 2 != pt[2] ** 2:
-                    raise ValueError( 'Expect a file containing Pythagorian triples:', pt )
+    OrbTools.p( len( pt_dct.keys() ) )
 
-                # cos = pt[0]/pt[2], sin = pt[1]/pt[2], tan=sin/cos
-                angle = round( sage_arctan( pt[1] / pt[0] ) * 180 / sage_pi )
+    return pt_dct
 
-                if angle not in angle_lst and angle > 0:
-                    angle_lst += [angle]
-                    pt_dct.update( {angle:pt} )
 
-    OrbTools.p( len( pt_dct.keys() ) )
+def build_pt_table( fname='cos_sin' ):
+    '''
+    Writes the dictionary "get_pt_txt_dct( fname )" as a compact 
+    binary table "<fname>.bin", which is shipped with the package 
+    and loaded by "get_pt_dct()". This method is a build step:
+        python -m orbital.cossin.cos_sin
+    
+    Parameters
+    ----------
+    fname: string
+        Name of file without extention.
+        
+    Returns
+    -------
+    dict
+        The dictionary "get_pt_txt_dct( fname )".
+    '''
+    pt_dct = get_pt_txt_dct( fname )
+
+    file_name = os.path.dirname( os.path.abspath( __file__ ) ) + '/' + fname + '.bin'
+    OrbTools.p( 'Writing binary table:', file_name )
+    with open( file_name, 'wb' ) as f:
+        for angle in sorted( pt_dct.keys() ):
+            f.write( struct.pack( pt_fmt, angle, *pt_dct[angle] ) )
+
+    return pt_dct
+
+
+def get_pt_dct( fname='cos_sin' ):
+    '''
+    Parameters
+    ----------
+    fname: string
+        Name of file without extention.
+        
+    Returns
+    -------
+    dict
+        A dictionary 
+            { 
+                angle : [a,b,c],
+                ... 
+            }
+        where a^2+b^2=c^2 are integers and <angle> corresponds to 
+            round(arctan( <b>/<a> )*180/pi)
+        The key <angle> runs from 1 to 89 degrees.
+        The dictionary is loaded from the binary table "<fname>.bin" 
+        and kept in memory. If the table does not exist, then the 
+        dictionary is read from "<fname>.txt" (see "get_pt_txt_dct()").
+        The table is not written, since the package directory may
+        be read-only (see "build_pt_table()").           
+    '''
+    if fname in pt_table_dct:
+        return pt_table_dct[fname]
+
+    file_name = os.path.dirname( os.path.abspath( __file__ ) ) + '/' + fname + '.bin'
+    try:
+        with open( file_name, 'rb' ) as f:
+            buf = f.read()
+        pt_dct = {}
+        for angle, a, b, c in struct.iter_unpack( pt_fmt, buf ):
+            pt_dct[angle] = [a, b, c]
+    except OSError:
+        pt_dct = get_pt_txt_dct( fname )
 
-    OrbTools.get_tool_dct()[key] = pt_dct
-    OrbTools.save_tool_dct()
+    pt_table_dct[fname] = pt_dct
 
     return pt_dct
+
+
+if __name__ == '__main__':
+
+    build_pt_table()
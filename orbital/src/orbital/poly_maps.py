@@ -4,6 +4,8 @@ Created on Nov 23, 2017
 
 @author: Niels Lubbes
 '''
+import re
+
 from orbital.sage_interface import sage_PolynomialRing
 from orbital.sage_interface import sage_FractionField
 from orbital.sage_interface import sage__eval
@@ -43,12 +45,160 @@ def ring_dict( R ):
     return dct
 
 
+def get_var_info( f, *X_lst ):
+    '''
+    Parameters
+    ----------
+    f : string(list<sage_POLY>)
+        A list of polynomials in x=(x0,...,xn) or y=(y0,...,yn),
+        or a string thereof.
+    
+    *X_lst
+        Lists of polynomials or strings thereof.
+    
+    Returns
+    -------
+    tuple
+        A 3-tuple ( <vx>, <vy>, <n> ) where ( <vx>, <vy> ) is ( 'x', 'y' )
+        if "f" consists of polynomials in x and ( 'y', 'x' ) otherwise.
+        The integer <n> is the maximal index of a <vx>-variable
+        occurring in "f" or in a list of "X_lst".
+        For polynomials the variables are obtained from their 
+        parents so that no string representations are computed.
+    '''
+    f_set = get_var_set( f )
+    ( vx, vy ) = ( 'x', 'y' ) if 'x' in [ name[0] for name in f_set ] else ( 'y', 'x' )
+
+    n_lst = [ int( name[1:] ) for name in f_set.union( *[ get_var_set( X ) for X in X_lst ] ) if name[0] == vx ]
+
+    return vx, vy, max( n_lst )
+
+
+def get_var_set( pol ):
+    '''
+    Parameters
+    ----------
+    pol : string(sage_POLY)
+        A polynomial, a list of polynomials or a string thereof.
+    
+    Returns
+    -------
+    set<string>
+        The set of names of variables of the form 'x#' or 'y#' that 
+        occur in "pol", where # denotes a non-negative integer. 
+    '''
+    if isinstance( pol, ( list, tuple ) ):
+        return set( [] ).union( *[ get_var_set( elt ) for elt in pol ] )
+
+    if type( pol ) != str and hasattr( pol, 'exponents' ) and hasattr( pol, 'variables' ):
+        pol = ','.join( [ str( var ) for var in pol.variables() ] )
+
+    return set( re.findall( r'\b[xy][0-9]+\b', str( pol ) ) )
+
+
+def get_len( f ):
+    '''
+    Parameters
+    ----------
+    f : string(list<sage_POLY>)
+        A list of polynomials or a string thereof.
+    
+    Returns
+    -------
+    int
+        The number of polynomials in "f".
+    '''
+    if isinstance( f, ( list, tuple ) ):
+        return len( f )
+    return len( str( f ).split( ',' ) )
+
+
+def convert_pol( pol, ring, vmap=None ):
+    '''
+    Converts polynomials to polynomials in another ring via 
+    their exponent/coefficient dictionaries. 
+    
+    Parameters
+    ----------
+    pol : sage_POLY
+        A polynomial, or a list or tuple of polynomials. Symbolic 
+        expressions in sage_SR are converted directly as well. If "pol"
+        is a string or not a polynomial (eg. an element of a 
+        fraction field), then it is converted via its string 
+        representation instead.  
+    
+    ring : sage_RING
+        A polynomial ring.
+    
+    vmap : dict<string,string>
+        A dictionary, which maps variable names of the parent of 
+        "pol" to variable names of "ring". Variables that are not 
+        keys of "vmap" are mapped to variables of "ring" with
+        the same name. If None, then all variables are mapped 
+        by name.
+    
+    Returns
+    -------
+    sage_POLY
+        The polynomial "pol" as an element of "ring", or a list
+        of such polynomials if "pol" is a list or tuple. 
+        A ValueError is raised if a variable occurring in "pol" 
+        is not mapped to a variable of "ring".
+    '''
+    if isinstance( pol, ( list, tuple ) ):
+        return [ convert_pol( elt, ring, vmap ) for elt in pol ]
+
+    # symbolic expressions
+    if vmap == None and type( pol ) != str and hasattr( pol, 'parent' ) and pol.parent() is sage_SR:
+        return pol.polynomial( None, ring=ring )
+
+    if type( pol ) == str or not hasattr( pol, 'exponents' ) \
+        or not hasattr( pol.parent(), 'variable_names' ):
+        if vmap != None:
+            raise ValueError( 'Cannot map variables of non-polynomial:', pol )
+        return sage__eval( str( pol ), ring_dict( ring ) )
+
+    if vmap == None:
+        vmap = {}
+
+    # index in "ring" of each variable of the parent of "pol"
+    name_lst = ring.variable_names()
+    idx_lst = []
+    for name in pol.parent().variable_names():
+        name = vmap.get( name, name )
+        idx_lst += [ name_lst.index( name ) if name in name_lst else None ]
+
+    # univariate polynomials have integer exponents
+    multi = hasattr( ring.gen().exponents()[0], 'nonzero_positions' )
+
+    base = ring.base_ring()
+    dct = {}
+    for exp, cf in pol.dict().items():
+
+        if hasattr( exp, 'nonzero_positions' ):
+            pos_lst = exp.nonzero_positions()
+        else:
+            exp, pos_lst = [exp], [0] if exp != 0 else []
+
+        new_exp = len( name_lst ) * [0]
+        for i in pos_lst:
+            if idx_lst[i] == None:
+                raise ValueError( 'Variable not in ring:', pol.parent().variable_names()[i], ring )
+            new_exp[idx_lst[i]] += exp[i]
+
+        key = tuple( new_exp ) if multi else new_exp[0]
+        dct[key] = dct.get( key, 0 ) + base( cf )
+
+    return ring( dct )
+
+
 def invert_map( f, X, base=sage_QQ ):
     '''
     Computes the inverse of a map defined by polynomials.
     
-    If the parameters f and X are not strings, then
-    they are automatically converted to strings.
+    The parameters f and X can be either strings or 
+    polynomials, which are converted without computing 
+    their string representations.
     
     Parameters
     ----------
@@ -80,22 +230,10 @@ def invert_map( f, X, base=sage_QQ ):
         where R=B(y) and base ring B is defined by the base
         parameter.  
     '''
-    # make sure that the input are strings
-    f = str( f )
-    X = str( X )
-
     # if the input are polynomials in x then the output
-    # is a list of poynomials in y
-    ( vx, vy ) = ( 'x', 'y' ) if 'x' in f else ( 'y', 'x' )
-
+    # is a list of poynomials in y. We also
     # detect the number of x-variables occurring
-    n_lst = []
-    n = 0
-    while n < 50:
-        if vx + str( n ) in f or vx + str( n ) in X:
-            n_lst += [n]
-        n = n + 1
-    n = max( n_lst )
+    ( vx, vy, n ) = get_var_info( f, X )
 
     # construct ring B(y0,...ym)[x0,...,xn]
     # over fraction field B(y0,...ym)
@@ -107,19 +245,18 @@ def invert_map( f, X, base=sage_QQ ):
     # ring   = sage_PolynomialRing( yfield, 'x0,x1,x2,x3,x4')
     #
     x_lst = [ vx + str( i ) for i in range( n + 1 ) ]
-    y_lst = [ vy + str( i ) for i in range( len( f.split( ',' ) ) ) ]
+    y_lst = [ vy + str( i ) for i in range( get_len( f ) ) ]
     yfield = sage_FractionField( sage_PolynomialRing( base, y_lst ) )
     ring = sage_PolynomialRing( yfield, x_lst )
     y_lst = yfield.gens()
     x_lst = ring.gens()
 
-    dct = ring_dict( ring )
-    X = sage__eval( X, dct )
-    f = sage__eval( f, dct )
+    X = convert_pol( X, ring )
+    f = convert_pol( f, ring )
     mmap = [ y_lst[i] - f[i] for i in range( len( f ) ) ]
     gb_lst = list( sage_ideal( X + mmap ).groebner_basis() )
 
-    OrbTools.p( gb_lst )
+    OrbTools.p( gb_lst, lvl = 2 )
 
     return gb_lst
 
@@ -128,8 +265,9 @@ def invert_birational_map( f, X, base=sage_QQ ):
     '''
     Computes the inverse of a birational map.
     
-    If the parameters f and X are not strings, then
-    they are automatically converted to strings.
+    The parameters f and X can be either strings or 
+    polynomials, which are converted without computing 
+    their string representations.
     
     Parameters
     ----------
@@ -177,7 +315,7 @@ def invert_birational_map( f, X, base=sage_QQ ):
             if str( x ) in str( ga ):
                 gb_lst += [-( ga - x )]
 
-    OrbTools.p( gb_lst )
+    OrbTools.p( gb_lst, lvl = 2 )
 
     # The x-variables did not occur as expected
     for gb in gb_lst:
@@ -203,8 +341,9 @@ def image_map( f, X, base=sage_QQ ):
     Computes the image f(X) of a variety X
     under a map f, defined by polynomials.
     
-    If the parameters f and X are not strings, then
-    they are automatically converted to strings.
+    The parameters f and X can be either strings or 
+    polynomials, which are converted without computing 
+    their string representations.
     
     Parameters
     ----------
@@ -232,36 +371,23 @@ def image_map( f, X, base=sage_QQ ):
         if the input are polynomials in x, and
         vice versa.            
     '''
-    # make sure that the input are strings
-    f = str( f )
-    X = str( X )
-
     # if the input are polynomials in x then the output
-    # is a list of poynomials in y
-    ( vx, vy ) = ( 'x', 'y' ) if 'x' in f else ( 'y', 'x' )
-
+    # is a list of poynomials in y. We also
     # detect the number of x-variables occurring
-    n_lst = []
-    n = 0
-    while n < 50:
-        if vx + str( n ) in f or vx + str( n ) in X:
-            n_lst += [n]
-        n = n + 1
-    n = max( n_lst )
+    ( vx, vy, n ) = get_var_info( f, X )
 
     # construct polynomial ring B[x0,...,xn,y0,...,ym]
     # where B is given by parameter base.
     x_lst = [ vx + str( i ) for i in range( n + 1 ) ]
-    y_lst = [ vy + str( i ) for i in range( len( f.split( ',' ) ) ) ]
+    y_lst = [ vy + str( i ) for i in range( get_len( f ) ) ]
     mord = 'degrevlex' if base == sage_QQ else 'deglex'  # needed for elimination
     xyring = sage_PolynomialRing( base, x_lst + y_lst, order=mord )
     x_lst = xyring.gens()[:len( x_lst )]
     y_lst = xyring.gens()[len( x_lst ):]
 
     # coerce into common ring with xi and yi variables
-    dct = ring_dict( xyring )
-    f_lst = sage__eval( f, dct )
-    X_lst = sage__eval( X, dct )
+    f_lst = convert_pol( f, xyring )
+    X_lst = convert_pol( X, xyring )
     mf_lst = [ y_lst[i] - f_lst[i] for i in range( len( f_lst ) ) ]
 
     # compute image by using groebner basis
@@ -277,7 +403,7 @@ def image_map( f, X, base=sage_QQ ):
 
         OrbTools.p( 'Exception occurred:', repr( e ) )
         gb_lst = sage_ideal( X_lst + mf_lst ).groebner_basis()
-        OrbTools.p( gb_lst )
+        OrbTools.p( gb_lst, lvl = 2 )
         e_lst = []
         for gb in gb_lst:
             if vx not in str( gb ):
@@ -291,8 +417,9 @@ def preimage_map( f, X, Y, base=sage_QQ ):
     f: X ---> P^m, defined by polynomials, where the domain 
     X is a variety and P^m denotes projective space.
     
-    If the parameters f, X and Y are not strings, then
-    they are automatically converted to strings.
+    The parameters f, X and Y can be either strings or 
+    polynomials, which are converted without computing 
+    their string representations.
     
     Parameters
     ----------
@@ -330,38 +457,24 @@ def preimage_map( f, X, Y, base=sage_QQ ):
         are not part of the ideal, but correspond to the locus 
         where the map f is not defined.             
     '''
-    # make sure that the input are strings
-    f = str( f )
-    X = str( X )
-    Y = str( Y )
-
     # if the input are polynomials in x then the output
-    # is a list of poynomials in y
-    ( vx, vy ) = ( 'x', 'y' ) if 'x' in f else ( 'y', 'x' )
-
+    # is a list of poynomials in y. We also
     # detect the number of x-variables occurring
-    n_lst = []
-    n = 0
-    while n < 50:
-        if vx + str( n ) in f or vx + str( n ) in X:
-            n_lst += [n]
-        n = n + 1
-    n = max( n_lst )
+    ( vx, vy, n ) = get_var_info( f, X )
 
     # construct polynomial ring B[x0,...,xn,y0,...,ym]
     # where B is given by parameter base.
     x_lst = [ vx + str( i ) for i in range( n + 1 ) ]
-    y_lst = [ vy + str( i ) for i in range( len( f.split( ',' ) ) ) ]
+    y_lst = [ vy + str( i ) for i in range( get_len( f ) ) ]
     mord = 'degrevlex' if base == sage_QQ else 'lex'  # needed for elimination
     xyring = sage_PolynomialRing( base, y_lst + x_lst, order=mord )
     y_lst = xyring.gens()[:len( y_lst )]
     x_lst = xyring.gens()[len( y_lst ):]
 
     # coerce into common ring with xi and yi variables
-    dct = ring_dict( xyring )
-    f_lst = sage__eval( f, dct )
-    X_lst = sage__eval( X, dct )
-    Y_lst = sage__eval( Y, dct )
+    f_lst = convert_pol( f, xyring )
+    X_lst = convert_pol( X, xyring )
+    Y_lst = convert_pol( Y, xyring )
     mf_lst = [ y_lst[i] - f_lst[i] for i in range( len( f_lst ) ) ]
 
     # compute image by using groebner basis
@@ -378,7 +491,7 @@ def preimage_map( f, X, Y, base=sage_QQ ):
 
         OrbTools.p( 'Exception occurred:', repr( e ) )
         gb_lst = sage_ideal( X_lst + mf_lst + Y_lst ).groebner_basis()
-        OrbTools.p( gb_lst )
+        OrbTools.p( gb_lst, lvl = 2 )
         e_lst = []
         for gb in gb_lst:
             if vy not in str( gb ):
@@ -394,8 +507,8 @@ def compose_maps( g, f, base=sage_QQ ):
     in either x=(x0,...,xn) or y=(y0,...,yn) with n<=50,
     but not both.
     
-    The input parameters are explicitly converted to 
-    strings, in case they are not strings.
+    The input parameters can be either strings or 
+    polynomials.
     
     Parameters
     ----------
@@ -404,14 +517,12 @@ def compose_maps( g, f, base=sage_QQ ):
         defines a projective map:
         f: P^a ---> P^b
         where P^a denotes projective n-space.    
-        If the value is not a string, then it will
-        be converted to a string.
+        The value can also be a list of polynomials.
     
     g : string(list<sage_POLY>)
         A string of a list of c+1 polynomials that
         defines a projective map: g: P^b ---> P^c.   
-        If the value is not a string, then it will
-        be converted to a string.         
+        The value can also be a list of polynomials.
     
     base : sage_RING 
         Ground field of polynomials.       
@@ -421,23 +532,15 @@ def compose_maps( g, f, base=sage_QQ ):
     list<sage_POLY>
         The composition of the maps f o g: P^a ---> P^c.    
     '''
-    # make sure that the input are strings
-    g = str( g )
-    f = str( f )
-
     # check variables
-    ( vf, vg ) = ( 'x', 'y' ) if 'x' in f else ( 'y', 'x' )
-    if vg not in g:
-        g = g.replace( vf, vg )
+    ( vf, vg, n ) = get_var_info( f )
+    g_set = get_var_set( g )
+    vmap = None
+    if vg not in [ name[0] for name in g_set ]:
+        vmap = { name:vg + name[1:] for name in g_set }
 
     # detect the number of vf-variables occurring
-    n_lst = []
-    n = 0
-    while n < 50:
-        if vf + str( n ) in f or vg + str( n ) in g:
-            n_lst += [n]
-        n = n + 1
-    n = max( n_lst )
+    n = max( [n] + [ int( name[1:] ) for name in g_set if vmap != None or name[0] == vg ] )
 
     # construct the ring
     v_lst = []
@@ -445,9 +548,10 @@ def compose_maps( g, f, base=sage_QQ ):
     v_lst += [ vg + str( i ) for i in range( n + 1 ) ]
     ring = sage_PolynomialRing( base, v_lst )
     vg_lst = ring.gens()[n + 1:]
-    dct = ring_dict( ring )
-    g_lst = sage__eval( g, dct )
-    f_lst = sage__eval( f, dct )
+    if type( g ) == str and vmap != None:
+        g, vmap = g.replace( vf, vg ), None
+    g_lst = convert_pol( g, ring, vmap )
+    f_lst = convert_pol( f, ring )
 
     # compose the maps
     for i in range( len( f_lst ) ):
@@ -484,27 +588,15 @@ def euclidean_type_form( X, base=sage_QQ ):
         If #variables is equal to 3, then
         also include the form in x,y and z variables.
     '''
-    # make sure that the input are strings
-    X = str( X )
-
     # if the input are polynomials in x then the output
-    # is a list of poynomials in y
-    ( vx, vy ) = ( 'x', 'y' ) if 'x' in X else ( 'y', 'x' )
-
+    # is a list of poynomials in y. We also
     # detect the number of x-variables occurring
-    n_lst = []
-    n = 0
-    while n < 50:
-        if vx + str( n ) in X:
-            n_lst += [n]
-        n = n + 1
-    n = max( n_lst )
+    ( vx, vy, n ) = get_var_info( X )
 
     x_lst = [ vx + str( i ) for i in range( n + 1 ) ]
     ring = sage_PolynomialRing( base, x_lst )
     x_lst = ring.gens()
-    dct = ring_dict( ring )
-    X = sage__eval( X, dct )
+    X = convert_pol( X, ring )
     XA = sage_factor( X.subs( {x_lst[0]:0} ) )
     XB = sage_factor( X - XA )
     assert X == XA + XB
@@ -545,27 +637,15 @@ def hilbert_poly( X, base=sage_QQ ):
         Hilbert polynomial of ideal.
     
     '''
-    # make sure that the input are strings
-    X = str( X )
-
     # if the input are polynomials in x then the output
-    # is a list of poynomials in y
-    ( vx, vy ) = ( 'x', 'y' ) if 'x' in X else ( 'y', 'x' )
-
+    # is a list of poynomials in y. We also
     # detect the number of x-variables occurring
-    n_lst = []
-    n = 0
-    while n < 50:
-        if vx + str( n ) in X:
-            n_lst += [n]
-        n = n + 1
-    n = max( n_lst )
+    ( vx, vy, n ) = get_var_info( X )
 
     x_lst = [ vx + str( i ) for i in range( n + 1 ) ]
     ring = sage_PolynomialRing( base, x_lst )
     x_lst = ring.gens()
-    dct = ring_dict( ring )
-    X = sage__eval( X, dct )
+    X = convert_pol( X, ring )
 
     return sage_ideal( X ).hilbert_polynomial()
 
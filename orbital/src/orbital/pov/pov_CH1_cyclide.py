@@ -45,7 +45,7 @@ def CH1_cyclide():
     pmz_AB_lst = list( MZ * V )
     OrbTools.p( 'V =', V )
     OrbTools.p( 'pmz_AB_lst =', pmz_AB_lst )
-    for pmz in pmz_AB_lst: OrbTools.p( '\t\t', sage_factor( pmz ) )
+    for pmz in pmz_AB_lst: OrbTools.p( '\t\t', lambda: sage_factor( pmz ) )
 
 
     # Convert the trigonometric parametrization to a rational parametrization
@@ -64,7 +64,7 @@ def CH1_cyclide():
     pmz_lst = [den] + [ ( elt.subs( dct ) * den ).simplify_full() for elt in list( MZ * V ) ]
     OrbTools.p( 'pmz_lst =', pmz_lst )
     for pmz in pmz_lst:
-        OrbTools.p( '\t\t', sage_factor( pmz ) )
+        OrbTools.p( '\t\t', lambda: sage_factor( pmz ) )
 
     # do a basepoint analysis on the rational parametrization
     # The True argument is for resetting the number field to QQ!
@@ -52,7 +52,7 @@ def dp8_clifford():
     pmz_AB_lst = [ p[0] - p[4], p[1], p[2], p[3] ]
 
     for pmz in pmz_AB_lst:
-        OrbTools.p( '\t\t', sage_factor( pmz ) )
+        OrbTools.p( '\t\t', lambda: sage_factor( pmz ) )
 
     # PovInput dp8 clifford
     #
@@ -35,7 +35,7 @@ def horn_cyclide():
     pmz_AB_lst = [1] + list( M * V )
     OrbTools.p( 'pmz_AB_lst =', pmz_AB_lst )
     for pmz in pmz_AB_lst:
-        OrbTools.p( '\t\t', sage_factor( pmz ) )
+        OrbTools.p( '\t\t', lambda: sage_factor( pmz ) )
 
     # PovInput horn cyclide
     #
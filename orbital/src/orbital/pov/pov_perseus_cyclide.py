@@ -47,7 +47,7 @@ def perseus_cyclide():
     OrbTools.p( 'V =', V )
     OrbTools.p( 'pmz_AB_lst =', pmz_AB_lst )
     for pmz in pmz_AB_lst:
-        OrbTools.p( '\t\t', sage_factor( pmz ) )
+        OrbTools.p( '\t\t', lambda: sage_factor( pmz ) )
 
     # We convert the trigonometric parametrization to a
     # rational parametrization, via the following formulas:
@@ -65,7 +65,7 @@ def perseus_cyclide():
     pmz_lst = [den] + [ ( elt.subs( dct ) * den ).simplify_full() for elt in list( MZ * V ) ]
     OrbTools.p( 'pmz_lst =', pmz_lst )
     for pmz in pmz_lst:
-        OrbTools.p( '\t\t', sage_factor( pmz ) )
+        OrbTools.p( '\t\t', lambda: sage_factor( pmz ) )
 
     # do a basepoint analysis on the rational parametrization
     #
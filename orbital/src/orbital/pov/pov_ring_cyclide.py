@@ -40,7 +40,7 @@ def ring_cyclide():
     pmz_AB_lst = [1] + list( M * V )
     OrbTools.p( 'pmz_AB_lst =', pmz_AB_lst )
     for pmz in pmz_AB_lst:
-        OrbTools.p( '\t\t', sage_factor( pmz ) )
+        OrbTools.p( '\t\t', lambda: sage_factor( pmz ) )
 
     # convert pmz_AB_lst to rational parametrization pmz_lst
     C0 = ( y ** 2 - x ** 2 ) / ( y ** 2 + x ** 2 )
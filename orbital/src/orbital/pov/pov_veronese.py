@@ -58,7 +58,7 @@ def veronese():
     for A, pmz_lst in lst_lst:
         OrbTools.p( 'pmz_' + A + '_lst =', pmz_lst )
         for pmz in pmz_lst:
-            OrbTools.p( '\t\t', sage_factor( pmz ) )
+            OrbTools.p( '\t\t', lambda: sage_factor( pmz ) )
 
 
     #############################
@@ -13,6 +13,8 @@ class PovInput:
     ----------
     impl : sage_POLY
         Polynomial for implicit equation of a surface in QQ[x,y,z].
+        Alternatively, a precomputed 2-tuple ( <degree>, <coefficient list> )
+        as returned by "povray_aux.pov_coef_lst()".
     
     pmz_dct : dict
         A dictionary of parametrizations.
@@ -84,6 +86,10 @@ class PovInput:
     
     ani_delay : int 
         Delay in ms between frames of animation.
+
+    ani_workers : int
+        Maximal number of povray processes that render
+        frames of an animation at the same time.
                 
     curve_dct: dict
         {
@@ -119,7 +125,13 @@ class PovInput:
     curve_lst_dct : dict
         Place holder for the curve lists if computed by 
         method "povray_aux.get_curve_lst()".
-        
+
+    curve_inc_dct : dict
+        Place holder for the povray include files, which declare the
+        curves in "curve_lst_dct", if written by method
+        "povray.create_pov_curves_inc()". The values are 2-tuples
+        consisting of a copy of the curves and the file name.
+
     text_dct : dict
         Dictionary for texture.
         {
@@ -164,6 +176,7 @@ class PovInput:
         self.quality = 3  # quality is between 0-11
 
         self.ani_delay = 10
+        self.ani_workers = 1
 
         self.curve_dct = {}
         self.curve_dct['A'] = {'step0':2 * 36, 'step1':36, 'prec':5, 'width':0.02}
@@ -179,6 +192,7 @@ class PovInput:
         # beige = ( 0.8, 0.6, 0.2, 0.0 )
 
         self.curve_lst_dct = {}  # used by "povray_aux.get_curve_lst()"
+        self.curve_inc_dct = {}  # used by "povray.create_pov_curves_inc()"
 
 
     # human readable string representation of object
@@ -7,9 +7,14 @@ Created on Nov 23, 2017
 import time
 import sys
 import os
+import glob
+import hashlib
 import subprocess
 from subprocess import call
 
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
+
 from orbital.povray.class_pov_input import PovInput
 
 from orbital.povray.povray_aux import get_curve_lst
@@ -32,7 +37,10 @@ def create_pov( pin, fam_lst = [], show_surf = False, ani = False, ft_lst = [] )
     coefficients are too large).
       
     If "ani" then the curves are animated as moving in a 
-    family. In each frame, all curves in family <fam> are 
+    family. The animation of family <fam> is written to
+    "pin.path + pin.fname + '_' + <fam> + '.gif'" and its 
+    frames are only raytraced if they changed since a 
+    previous call (see "pov_render_lst()"). In each frame, all curves in family <fam> are 
     rendered with transparancy <t>, for all (<fam>,<t>) 
     in "ft_lst", such that <fam> is not the family that is 
     animated.      
@@ -61,29 +69,31 @@ def create_pov( pin, fam_lst = [], show_surf = False, ani = False, ft_lst = [] )
         Returns list of povray string for each family.
           
     '''
-    pov_str = ''
-    pov_str += create_pov_preamble( pin )
-    pov_str += create_pov_axes()
-    if show_surf: pov_str += create_pov_surface( pin )
+    pov_lst = []
+    pov_lst += [create_pov_preamble( pin )]
+    pov_lst += [create_pov_axes()]
+    if show_surf: pov_lst += [create_pov_surface( pin )]
 
     fam_pov_str_lst = []
     for fam in fam_lst:
         fam_pov_str_lst += [create_pov_curves( pin, fam )]
-        pov_str += fam_pov_str_lst[-1]
+        pov_lst += [fam_pov_str_lst[-1]]
 
     # fixed or animated image?
     if not ani:
 
         prv_fname = pin.fname
         pin.fname = prv_fname + '_' + ''.join( fam_lst ) + '_' + strftime( "%H-%M-%S" )
-        pov_raytrace( pin, pov_str )
+        pov_raytrace( pin, pov_lst )
         pin.fname = prv_fname
 
     elif ani:
 
+        # The file names of the frames do not contain a time stamp,
+        # so that a re-run only raytraces frames that changed.
         prv_fname = pin.fname
         for fam in fam_lst:
-            pin.fname = prv_fname + '_' + fam + '_' + strftime( "%H-%M-%S" )
+            pin.fname = prv_fname + '_' + fam
             pov_ani( pin, fam, show_surf, ft_lst )
         pin.fname = prv_fname
 
@@ -308,12 +318,122 @@ def create_pov_axes():
     return s
 
 
+def pov_write_inc( file_prefix, pov_itr ):
+    '''
+    Parameters
+    ----------
+    file_prefix : string
+        Location and name of the include file without extension.
+
+    pov_itr : iterable<string>
+        An iterable of strings whose concatenation is 
+        the content of a povray include file.
+    
+    Returns
+    -------
+    string
+        Writes the strings in "pov_itr" one by one to the file 
+            <file_prefix> + '-' + <hash> + '.inc'
+        and returns the absolute path of this file. Here <hash> is 
+        a hash of the file content so that a scene that includes 
+        this file changes if the content changes.
+    '''
+    tmp_name = os.path.abspath( file_prefix + '.' + str( os.getpid() ) + '.tmp' )
+    OrbTools.p( 'Writing povray include file:', tmp_name )
+    create_dir( tmp_name )
+    sha = hashlib.sha256()
+    with open( tmp_name, 'w' ) as inc_file:
+        for pov_frag in pov_itr:
+            sha.update( pov_frag.encode( 'utf-8' ) )
+            inc_file.write( pov_frag )
+
+    file_name = os.path.abspath( file_prefix + '-' + sha.hexdigest()[:16] + '.inc' )
+    os.replace( tmp_name, file_name )
+
+    return file_name
+
+
+def create_pov_curves_inc( pin, fam ):
+    '''
+    Writes a povray include file, which declares the curves 
+    in the family "fam" as povray objects with names
+        CURVE_<fam>_0, CURVE_<fam>_1, ...    
+    The curves are written to the file one by one so that the 
+    povray input is never kept in memory as a whole.   
+    
+    Parameters
+    ----------
+    pin : PovInput
+        Passed to "povray_aux.get_curve_lst()". 
+        The attribute "pin.path" is used as location and 
+        the attribute "pin.curve_inc_dct" is set.
+    
+    fam : string 
+        A string key denoting a family id (eg. 'A'). 
+    
+    Returns
+    -------
+    string
+        The absolute path of the include file. We set 
+            "pin.curve_inc_dct[<fam>] = ( <curve_lst>, <file name> )" 
+        where <curve_lst> is a copy of the curves in the include file.
+        If "pin.curve_inc_dct[<fam>]" was set before and its curves
+        are equal to "povray_aux.get_curve_lst( pin, fam )",
+        then the include file is not written again.
+        The file name contains a hash of the file content so that 
+        a scene that includes this file changes if the curves change.
+        Include files of previous runs for the family "fam" with 
+        different content are removed.
+    '''
+    curve_lst = get_curve_lst( pin, fam )
+
+    if pin.curve_inc_dct.get( fam, None ) != None:
+        inc_lst, file_name = pin.curve_inc_dct[fam]
+        if inc_lst == curve_lst and os.path.exists( file_name ):
+            return file_name
+
+    def get_inc_itr():
+        yield '// curves in family ' + fam + '\n'
+        for idx in range( len( curve_lst ) ):
+
+            # Needed for cubic spline algorithm.
+            # Due to a povray bug "curve + curve[0:3]"
+            # gives artifacts
+            #
+            curve = curve_lst[idx] + curve_lst[idx]
+
+            # Sweep the curves out by spheres
+            #
+            s_lst = []
+            s_lst += ['\n']
+            s_lst += ['#declare CURVE_' + fam + '_' + str( idx ) + ' = sphere_sweep\n']
+            s_lst += ['{\n']
+            s_lst += ['    cubic_spline\n']
+            s_lst += ['    ' + str( len( curve ) ) + ',\n']
+            for point in curve:
+                p_str = ','.join( [ str( coord ) for coord in point ] )
+                s_lst += ['    <' + p_str + '>, WIDTH_' + fam + '\n']
+            s_lst += ['}\n']
+            yield ''.join( s_lst )
+
+    file_name = pov_write_inc( pin.path + 'inc/' + fam, get_inc_itr() )
+    pin.curve_inc_dct[fam] = ( [ [ list( point ) for point in curve ] for curve in curve_lst ], file_name )
+
+    # remove include files of previous runs that are outdated
+    for old_name in glob.glob( glob.escape( pin.path + 'inc/' + fam ) + '-*.inc' ):
+        if os.path.abspath( old_name ) != file_name:
+            OrbTools.p( 'Removing outdated include file:', old_name )
+            os.remove( old_name )
+
+    return file_name
+
+
 def create_pov_curves( pin, fam, num = -1 ):
     '''
     Parameters
     ----------
     pin : PovInput
-        Passed to "povray_aux.get_curve_lst()".
+        Passed to "create_pov_curves_inc()".
     
     fam : string 
         A string key denoting a family id (eg. 'A'). 
@@ -327,45 +447,31 @@ def create_pov_curves( pin, fam, num = -1 ):
         Returns a povray input string for the curves in the family "fam" 
         up to curve indexed "num" (modulo the total number of curves).          
         If "num" is -1 then all curves in the family are 
-        declared in the povray input string.
+        included in the povray input string. The curves themselves
+        are declared in the include file "create_pov_curves_inc(pin,fam)".
     '''
 
-    curve_lst = get_curve_lst( pin, fam )
+    inc_name = create_pov_curves_inc( pin, fam )
+    nc = len( pin.curve_lst_dct[fam] )
 
     if num == -1:
-        num = len( pin.curve_lst_dct[fam] )
+        num = nc
 
-    s = '#if (SHOW_' + fam + ')\n'
+    s_lst = []
+    s_lst += ['#if (SHOW_' + fam + ')\n']
+    s_lst += ['#include "' + inc_name + '"\n']
     for idx in range( 0, num ):
 
         # the modulo % is useful for animations to have
         # a break between loops by overdrawing curves
         # after a loop
         #
-        curve = curve_lst[idx % len( pin.curve_lst_dct[fam] )]
+        s_lst += ['object { CURVE_' + fam + '_' + str( idx % nc ) + ' texture { TEXT_' + fam + ' } }\n']
 
-        # Needed for cubic spline algorithm.
-        # Due to a povray bug "curve += curve[0:3]"
-        # gives artifacts
-        #
-        curve += curve[0:]
-
-        # Sweep the curves out by spheres
-        #
-        s += '\n\n'
-        s += 'sphere_sweep\n'
-        s += '{\n'
-        s += '    cubic_spline\n'
-        s += '    ' + str( len( curve ) ) + ',\n'
-        for point in curve:
-            p_str = ','.join( [ str( coord ) for coord in point ] )
-            s += '    <' + p_str + '>, WIDTH_' + fam + '\n'
-        s += '    texture { TEXT_' + fam + '}\n'
-        s += '}\n'
-    s += '#end\n'
-    s += '\n\n'
+    s_lst += ['#end\n']
+    s_lst += ['\n\n']
 
-    return s
+    return ''.join( s_lst )
 
 
 
@@ -384,7 +490,10 @@ def create_pov_surface( pin ):
         and texture.         
     '''
 
-    d, coef_lst = pov_coef_lst( pin.impl )
+    if type( pin.impl ) == tuple:
+        d, coef_lst = pin.impl  # precomputed
+    else:
+        d, coef_lst = pov_coef_lst( pin.impl )
 
     s = ''
     s += '#if (SHOW_SURF)\n'
@@ -401,7 +510,7 @@ def create_pov_surface( pin ):
     return s
 
 
-def pov_raytrace( pin, pov_str ):
+def pov_write( pin, pov_str ):
     '''
     Parameters
     ----------
@@ -414,11 +523,18 @@ def pov_raytrace( pin, pov_str ):
         * pin.quality
     
     pov_str : string
-        A string of a povray input file.
+        A string of a povray input file, or a list of strings
+        whose concatenation is a povray input file.
     
     Returns
     -------
-        A povray image at "pin.path + pin.fname + '.pov'". 
+    tuple
+        Writes the povray input file "pin.path + pin.fname + '.pov'"
+        and returns a 3-tuple 
+            ( <cmd>, <output_name>, <scene_hash> )
+        where <cmd> is the povray command for rendering the image
+        "<output_name> = pin.path + pin.fname + '.png'". The string 
+        <scene_hash> is a hash of the povray input and the image settings.
     '''
 
     # set file name
@@ -426,18 +542,8 @@ def pov_raytrace( pin, pov_str ):
     file_name = pin.path + pin.fname + '.pov'
     output_name = pin.path + pin.fname + '.png'
 
-    # write povray string
+    # povray command
     #
-    OrbTools.p( 'Writing povray string to:', file_name )
-    create_dir( file_name )
-    with open( file_name, "w" ) as text_file:
-        text_file.write( pov_str )
-
-    # execute povray tracer
-    #
-    my_env = dict( os.environ )
-    my_env['LD_LIBRARY_PATH'] = ''  # prevent problems with C++ libraries
-
     cmd = ['povray']
     cmd += ['+O' + output_name]
     cmd += ['+W' + str( pin.width )]
@@ -448,12 +554,114 @@ def pov_raytrace( pin, pov_str ):
     cmd += ['-D']  # no popup window
     cmd += [file_name]
 
+    # write povray string
+    #
+    OrbTools.p( 'Writing povray string to:', file_name )
+    create_dir( file_name )
+    if type( pov_str ) == str:
+        pov_str = [pov_str]
+    sha = hashlib.sha256( str( cmd[2:-1] ).encode( 'utf-8' ) )
+    with open( file_name, "w" ) as text_file:
+        for pov_frag in pov_str:
+            sha.update( pov_frag.encode( 'utf-8' ) )
+            text_file.write( pov_frag )
+
+    return cmd, output_name, sha.hexdigest()
+
+
+def pov_run( cmd ):
+    '''
+    Parameters
+    ----------
+    cmd : list<string>
+        A povray command.
+    
+    Returns
+    -------
+    tuple
+        Executes the povray tracer and returns a 3-tuple
+            ( <returncode>, <out>, <err> )
+        where <out> and <err> are the standard and error output.
+    '''
+    my_env = dict( os.environ )
+    my_env['LD_LIBRARY_PATH'] = ''  # prevent problems with C++ libraries
+
     OrbTools.p( cmd )
     p = subprocess.Popen( cmd, stdout = subprocess.PIPE, stderr = subprocess.PIPE, env = my_env )
     out, err = p.communicate()
 
-    OrbTools.p( 'out =', out )
-    OrbTools.p( 'err =', err )
+    return p.returncode, out, err
+
+
+def pov_render_lst( job_lst, workers = 1 ):
+    '''
+    Renders povray images with at most "workers" povray 
+    processes at the same time.
+    
+    Parameters
+    ----------
+    job_lst : list<tuple>
+        A list of 3-tuples ( <cmd>, <output_name>, <scene_hash> )
+        as returned by "pov_write()".
+    
+    workers : int
+        A positive integer.
+    
+    Returns
+    -------
+        A povray image at <output_name> for each job in "job_lst".
+        A job is skipped if its image exists and the file
+            "<output_name> + '.hash'"  
+        contains <scene_hash>. Otherwise the image is rendered
+        and <scene_hash> is written to this file.
+    '''
+    todo_lst = []
+    for cmd, output_name, scene_hash in job_lst:
+        hash_name = output_name + '.hash'
+        if os.path.exists( output_name ) and os.path.exists( hash_name ):
+            with open( hash_name, 'r' ) as hash_file:
+                if hash_file.read().strip() == scene_hash:
+                    OrbTools.p( 'Skipping unchanged image:', output_name )
+                    continue
+        todo_lst += [( cmd, output_name, scene_hash )]
+
+    with ThreadPoolExecutor( max_workers = workers ) as executor:
+
+        future_dct = {}
+        for job in todo_lst:
+            future_dct[executor.submit( pov_run, job[0] )] = job
+
+        num_done = 0
+        for future in as_completed( future_dct ):
+            cmd, output_name, scene_hash = future_dct[future]
+            returncode, out, err = future.result()
+            num_done += 1
+
+            OrbTools.p( 'Rendered', num_done, '/', len( todo_lst ), ':', output_name )
+            OrbTools.p( 'out =', out )
+            OrbTools.p( 'err =', err )
+
+            if returncode == 0 and os.path.exists( output_name ):
+                with open( output_name + '.hash', 'w' ) as hash_file:
+                    hash_file.write( scene_hash )
+
+
+def pov_raytrace( pin, pov_str ):
+    '''
+    Parameters
+    ----------
+    pin : PovInput     
+        Passed to "pov_write()".
+    
+    pov_str : string
+        A string of a povray input file, or a list of strings
+        whose concatenation is a povray input file.
+    
+    Returns
+    -------
+        A povray image at "pin.path + pin.fname + '.png'". 
+    '''
+    pov_render_lst( [pov_write( pin, pov_str )] )
 
 
 def pov_ani( pin, fam, show_surf = False, ft_lst = [] ):
@@ -465,6 +673,7 @@ def pov_ani( pin, fam, show_surf = False, ft_lst = [] ):
         * "pin.path"
         * "pin.fname"
         * "pin.ani_delay"
+        * "pin.ani_workers"
                                                 
     fam : string 
         A string key for the family which should be animated. 
@@ -483,53 +692,72 @@ def pov_ani( pin, fam, show_surf = False, ft_lst = [] ):
         In each frame, all curves in family <fam> are 
         rendered with transparancy <t>, for all (<fam>,<t>) in "ft_lst", 
         such that <fam> is *not* the family that is animated.  
+        The part of the frames that is not animated is written 
+        once to an include file, whose name contains a hash of its
+        content. Since "pin.fname" does not change between runs 
+        (see "create_pov()"), a frame is only raytraced again 
+        if its povray input changed (see "pov_render_lst()"). 
+        The include files of previous runs are removed.
     '''
     # total number of curves that are raytraced in the
     # animation.
     num_curves = 0
 
-    # Raytrace the families and store into indexed ".png"
-    # files.
-    #
     path = pin.path
     fname = pin.fname
     nc = len( get_curve_lst( pin, fam ) )
     nc += 5  # delays loops between animations
+
+    # Write the part of the frames that does not change 
+    # during the animation to an include file.
+    #
+    col_dct = {}
+    for f, t in ft_lst:
+        if f != fam:
+            col_dct[f] = pin.text_dct[f][1]
+            pin.text_dct[f][1] = tuple( list( col_dct[f][:-1] ) + [t] )
+    static_lst = [create_pov_preamble( pin )]
+    for f, t in ft_lst:
+        if f != fam:
+            pin.text_dct[f][1] = col_dct[f]  # reset to previous value
+
+    if show_surf:
+        static_lst += [create_pov_surface( pin )]
+
+    for f, t in ft_lst:
+        if f != fam:
+            static_lst += [create_pov_curves( pin, f )]
+
+    static_name = pov_write_inc( path + 'ani/' + fname + '-static', static_lst )
+
+    # remove static parts of previous runs that are outdated
+    for old_name in glob.glob( glob.escape( path + 'ani/' + fname ) + '-static-*.inc' ):
+        if os.path.abspath( old_name ) != static_name:
+            OrbTools.p( 'Removing outdated include file:', old_name )
+            os.remove( old_name )
+
+    # Each frame includes the static part and adds
+    # the curves of the animated family.
+    #
+    job_lst = []
     for idx in range( 0, nc ):
 
         OrbTools.p( 'idx =', idx, '/', nc )
 
-        # set texture transparency in preamble
-        col_dct = {}
-        for f, t in ft_lst:
-            if f != fam:
-                col_dct[f] = pin.text_dct[f][1]
-                pin.text_dct[f][1] = tuple( list( col_dct[f][:-1] ) + [t] )
-        pov_str = create_pov_preamble( pin )
-        for f, t in ft_lst:
-            if f != fam:
-                pin.text_dct[f][1] = col_dct[f]  # reset to previous value
-
-        # setup implicit surface
-        if show_surf:
-            pov_str += create_pov_surface( pin )
-
-        # setup curves in animated family
-        pov_str += create_pov_curves( pin, fam, idx )
-
-        # setup families in ft_lst
-        for f, t in ft_lst:
-            if f != fam:
-                pov_str += create_pov_curves( pin, f )
-
-        # start raytracing
+        pov_lst = ['#include "' + static_name + '"\n\n']
+        pov_lst += [create_pov_curves( pin, fam, idx )]
+
+        # write povray file of frame
         pin.fname = fname + '-' + str( idx )
         pin.path = path + 'ani/'
-        pov_raytrace( pin, pov_str )
+        job_lst += [pov_write( pin, pov_lst )]
 
     pin.path = path
     pin.fname = fname
 
+    # start raytracing
+    pov_render_lst( job_lst, pin.ani_workers )
+
     # create animated gif
     convert_pngs_gif( pin.path, pin.fname, nc, pin.ani_delay )
 
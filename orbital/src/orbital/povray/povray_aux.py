@@ -8,7 +8,7 @@ import os
 import subprocess
 import errno
 
-from functools import reduce
+import numpy
 
 from copy import copy
 
@@ -16,20 +16,20 @@ from time import gmtime
 from time import strftime
 
 from orbital.sage_interface import sage_PolynomialRing
-from orbital.sage_interface import sage_QQ
-from orbital.sage_interface import sage__eval
 from orbital.sage_interface import sage_cos
 from orbital.sage_interface import sage_sin
-from orbital.sage_interface import sage_pi
 from orbital.sage_interface import sage_var
 from orbital.sage_interface import sage_RealField
 
 from orbital.class_orb_tools import OrbTools
 
-from orbital.class_orb_ring import OrbRing
-
 from orbital.povray.class_pov_input import PovInput
 
+# The modules "orbital.class_orb_ring" and "orbital.poly_maps" and the
+# variable "sage_QQ" are imported inside the methods that need them,
+# so that scenes can be created from precomputed numeric data
+# (eg. "PovInput.curve_lst_dct") without importing Sage.
+
 
 def pov_exp_lst( d, v, tbl=[] ):
     '''
@@ -87,7 +87,8 @@ def pov_coef_lst( poly ):
     Parameters
     ----------
     poly : string 
-        A string representing a polynomial in QQ[x,y,z].
+        A string representing a polynomial in QQ[x,y,z], 
+        or such a polynomial.
     
     Returns
     -------
@@ -98,18 +99,23 @@ def pov_coef_lst( poly ):
         http://www.povray.org/documentation/3.7.0/r3_4.html#r3_4_5_3_2
     '''
 
+    from orbital.sage_interface import sage_QQ
+    from orbital.poly_maps import convert_pol
+
     R = sage_PolynomialRing( sage_QQ, 'x,y,z', order='degrevlex' )  # lower degree equations first
-    x, y, z = R.gens()
-    poly = sage__eval( str( poly ), R.gens_dict() )
+    poly = convert_pol( poly, R )
 
     d = poly.total_degree()
     v = len( poly.variables() )
 
     exp_lst = pov_exp_lst( d, v + 1 )
 
+    # look up coefficients in the exponent/coefficient dictionary
+    # where the last exponent in "exp_lst" is for homogenization
+    dct = { tuple( exp ):cf for exp, cf in poly.dict().items() }
     coef_lst = []
     for exp in exp_lst:
-        coef_lst += [ poly.coefficient( {x:exp[0], y:exp[1], z:exp[2]} ) ]
+        coef_lst += [ dct.get( tuple( ( exp + [0, 0] )[:3] ), sage_QQ( 0 ) ) ]
 
     return d, coef_lst
 
@@ -119,7 +125,8 @@ def pov_nopow( poly ):
     Parameters
     ----------
     poly : string 
-        A string representing a polynomial in QQ[x,y,z].
+        A string representing a polynomial in QQ[x,y,z], 
+        or such a polynomial.
     
     Returns
     -------
@@ -132,17 +139,36 @@ def pov_nopow( poly ):
         "x^3*y^2*z+x^2*y" --> "x*x*x*y*y*z+x*x*y"
     '''
 
+    from orbital.sage_interface import sage_QQ
+    from orbital.poly_maps import convert_pol
+
     R = sage_PolynomialRing( sage_QQ, sage_var( 'x,y,z' ), order='degrevlex' )  # lower degree equations first
-    x, y, z = R.gens()
-    poly = sage__eval( str( poly ), R.gens_dict() )
+    poly = convert_pol( poly, R )
+
+    # build the string term by term from the exponents
+    s = ''
+    for cf, mon in zip( poly.coefficients(), poly.monomials() ):
+
+        m_lst = []
+        for var, e in zip( ['x', 'y', 'z'], mon.exponents()[0] ):
+            m_lst += e * [var]
+
+        if s == '':
+            s += '-' if cf < 0 else ''
+        else:
+            s += ' - ' if cf < 0 else ' + '
 
-    dct = {}
-    for i in range( 2, poly.total_degree() + 1 ):
-        dct.update( {'x^' + str( i ): ( i * 'x*' )[:-1] } )
-        dct.update( {'y^' + str( i ): ( i * 'y*' )[:-1] } )
-        dct.update( {'z^' + str( i ): ( i * 'z*' )[:-1] } )
+        if m_lst == []:
+            s += str( abs( cf ) )
+        elif abs( cf ) == 1:
+            s += '*'.join( m_lst )
+        else:
+            s += str( abs( cf ) ) + '*' + '*'.join( m_lst )
 
-    return reduce( lambda x, y: x.replace( y, dct[y] ), dct, str( poly ) )
+    if s == '':
+        s = '0'
+
+    return s
 
 
 def rgbt2pov( rgbt, gamma=2.2 ):
@@ -209,6 +235,9 @@ def get_pmz_value( pmz_lst, v0, v1, prec=50 ):
         where dv is very small. If that does not work, then we return None.
                
     '''
+    from orbital.sage_interface import sage_QQ
+    from orbital.class_orb_ring import OrbRing
+
     c0, s0, c1, s1, t0, t1 = OrbRing.coerce( 'c0,s0,c1,s1,t0,t1' )
 
     dct = {c0:sage_cos( v0 ), s0:sage_sin( v0 ), c1:sage_cos( v1 ), s1:sage_sin( v1 ), t0:v0, t1:v1}
@@ -233,6 +262,76 @@ def get_pmz_value( pmz_lst, v0, v1, prec=50 ):
     return [ XW, YW, ZW ]
 
 
+def get_pmz_grid( pmz_lst, v0_lst, v1_lst ):
+    '''
+    Evaluates a parametrization at all points of a grid.
+    
+    Parameters
+    ----------
+    pmz_lst : list<OrbRing.R> 
+        A list of 4 polynomials in QQ[c0,s0,c1,s1,t0,t1].
+    
+    v0_lst : list<sage_REALNUMBER>      
+        A list of real numbers in [0,2*pi).
+    
+    v1_lst : list<sage_REALNUMBER>       
+        A list of real numbers in [0,2*pi).
+    
+    Returns
+    -------
+    numpy.ndarray
+        An array P of floats with shape
+            ( len(v0_lst), len(v1_lst), 3 )
+        such that
+            P[i,j] = F( v0_lst[i], v1_lst[j] ) = [x,y,z].
+        Here F is as in "get_pmz_value()", but evaluated with 
+        floating point arithmetic for all grid points at once.
+        If the first polynomial W in "pmz_lst" is zero at 
+        a grid point, then the entries of P are NaN at this point.
+    '''
+    from orbital.class_orb_ring import OrbRing
+
+    v0_arr = numpy.array( [ float( v0 ) for v0 in v0_lst ] )
+    v1_arr = numpy.array( [ float( v1 ) for v1 in v1_lst ] )
+    V0, V1 = numpy.meshgrid( v0_arr, v1_arr, indexing = 'ij' )
+
+    val_dct = {}
+    val_dct['c0'] = numpy.cos( V0 )
+    val_dct['s0'] = numpy.sin( V0 )
+    val_dct['c1'] = numpy.cos( V1 )
+    val_dct['s1'] = numpy.sin( V1 )
+    val_dct['t0'] = V0
+    val_dct['t1'] = V1
+
+    # evaluate the monomials of each polynomial using
+    # its dictionary of exponents and coefficients
+    #
+    gen_lst = [ str( gen ) for gen in OrbRing.R.gens() ]
+    pow_dct = {}
+    val_lst = []
+    for pmz in pmz_lst:
+        val = numpy.zeros( V0.shape )
+        for exp, coef in OrbRing.R( pmz ).dict().items():
+            mon = numpy.full( V0.shape, float( coef ) )
+            for idx in exp.nonzero_positions():
+                key = ( gen_lst[idx], exp[idx] )
+                if key not in pow_dct:
+                    if key[0] not in val_dct:
+                        raise ValueError( 'Unexpected variable in parametrization: ', key[0] )
+                    pow_dct[key] = val_dct[key[0]] ** key[1]
+                mon = mon * pow_dct[key]
+            val = val + mon
+        val_lst += [val]
+
+    W, X, Y, Z = val_lst
+
+    # mask points where W==0 up to floating point errors
+    nrm = numpy.abs( W ) + numpy.abs( X ) + numpy.abs( Y ) + numpy.abs( Z )
+    W = numpy.where( numpy.abs( W ) <= 1e-12 * nrm, numpy.nan, W )
+
+    return numpy.stack( [X / W, Y / W, Z / W], axis = -1 )
+
+
 def get_curve_lst( pin, fam ):
     '''
     Parameters
@@ -285,26 +384,31 @@ def get_curve_lst( pin, fam ):
         OrbTools.p( 'Already computed ', fam )
         return pin.curve_lst_dct[fam]
 
+    from orbital.class_orb_ring import OrbRing
+
     pmz_lst, fam_id = pin.pmz_dct[fam]
     pmz_lst = OrbRing.coerce( pmz_lst )
 
-    # loop through lists of parameter values
+    # evaluate the parametrization at all parameter values
+    # so that point_arr[n] are the points of the n-th curve
+    step0 = pin.curve_dct[fam]['step0']
+    step1 = pin.curve_dct[fam]['step1']
+    if fam_id == 0:
+        point_arr = get_pmz_grid( pmz_lst, step0, step1 ).transpose( 1, 0, 2 )
+    elif fam_id == 1:
+        point_arr = get_pmz_grid( pmz_lst, step1, step0 )
+    else:
+        raise ValueError( 'Expect pin.pmz_dct[fam][1] in [0,1]: ', fam_id )
+
+    RF = sage_RealField( pin.curve_dct[fam]['prec'] )
     pin.curve_lst_dct[fam] = []
-    for v1 in pin.curve_dct[fam]['step1']:
+    for curve_arr in point_arr:
+
+        # add points to curve if map is defined
         curve = []
-        for v0 in pin.curve_dct[fam]['step0']:
-
-            if fam_id == 0:
-                point = get_pmz_value( pmz_lst, v0, v1, pin.curve_dct[fam]['prec'] )
-            elif fam_id == 1:
-                point = get_pmz_value( pmz_lst, v1, v0, pin.curve_dct[fam]['prec'] )
-            else:
-                raise ValueError( 'Expect pin.pmz_dct[fam][1] in [0,1]: ', fam_id )
-
-            # add points to curve if map is defined
-            if point != None:
-                point = [ coord * pin.scale for coord in point  ]
-                curve += [point]
+        for point in curve_arr:
+            if not numpy.isnan( point ).any():
+                curve += [[ RF( coord ) * pin.scale for coord in point ]]
 
         # need at least 3 points for cubic interpolation
         if len( curve ) >= 3:
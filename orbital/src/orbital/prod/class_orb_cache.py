@@ -0,0 +1,243 @@
+'''
+Use of this source code is governed by a MIT-style license that can be found in the LICENSE file.
+Created on Oct 18, 2026
+@author: Niels Lubbes
+'''
+
+import os
+import shutil
+import hashlib
+
+from orbital.sage_interface import sage_save
+from orbital.sage_interface import sage_load
+
+from orbital.class_orb_tools import OrbTools
+
+
+class OrbCache:
+    '''
+    A persistent cache for the outputs of the stages of
+    "orb_product.orb_product()".
+
+    Each OrbInput is assigned a key, which is the hash of
+    the matrices "input.pmat", "input.omat", "input.vmat",
+    the flags in "input.do" and the strategies in "input.alg",
+    since the output of a stage may depend on its strategy
+    (eg. the format of the Singular locus computed with Magma
+    or a probabilistic test). For each key there is a
+    directory
+        "<self.path><key>/"
+    which contains for each computed stage a file
+        "<stage>.sobj"
+    where <stage> is a key of "input.do" (eg. 'imp').
+
+    If the total size of the cache exceeds "self.max_size",
+    then the least recently used directories are removed.
+
+    Attributes
+    ----------
+    path : string
+        Location of the cache directory (ending with '/').
+
+    max_size : int
+        Maximal size of the cache in bytes.
+
+    num_hit : int
+        Number of times that a stage output was loaded from the cache.
+
+    num_miss : int
+        Number of times that a stage output was not in the cache.
+
+    size : int
+        The total size of the cache in bytes, which is computed
+        when the first output is stored and updated by ".set()".
+        Outputs stored by other processes are only taken into
+        account when the cache is walked by ".evict()".
+
+    Notes
+    -----
+    Outputs of the stages that use Maple or Magma are cached as
+    they are returned. Thus if these programs were not accessible,
+    then the cache should be cleared with ".clear()" afterwards.
+    '''
+
+    def __init__( self, path = None, max_size = 2 ** 30 ):
+        '''
+        Parameters
+        ----------
+        path : string
+            Location of cache directory. If None, then
+            "~/.cache/orbital/" is used.
+
+        max_size : int
+            Maximal size of the cache in bytes.
+        '''
+        if path == None:
+            path = os.path.join( os.path.expanduser( '~' ), '.cache', 'orbital' ) + '/'
+
+        self.path = path
+        self.max_size = max_size
+        self.num_hit = 0
+        self.num_miss = 0
+        self.size = None
+
+
+    @staticmethod
+    def get_key( input ):
+        '''
+        Parameters
+        ----------
+        input : OrbInput
+
+        Returns
+        -------
+        string
+            A hexadecimal hash of the matrices, flags and
+            strategies of "input".
+        '''
+        s = ''
+        s += str( list( input.pmat ) ) + '\n'
+        s += str( list( input.omat ) ) + '\n'
+        s += str( list( input.vmat ) ) + '\n'
+        s += str( sorted( input.do.items() ) ) + '\n'
+        s += str( sorted( input.alg.items() ) )
+
+        return hashlib.sha256( s.encode( 'utf-8' ) ).hexdigest()
+
+
+    def get( self, input, stage ):
+        '''
+        Parameters
+        ----------
+        input : OrbInput
+
+        stage : string
+            A key of "input.do".
+
+        Returns
+        -------
+        tuple
+            A 2-tuple ( <found>, <value> ) where <found> is True
+            if the output of "stage" for "input" is in the cache and
+            <value> is this output. Otherwise ( False, None ) is
+            returned.
+        '''
+        dir_name = self.path + OrbCache.get_key( input ) + '/'
+        file_name = dir_name + stage + '.sobj'
+
+        if not os.path.exists( file_name ):
+            self.num_miss += 1
+            return False, None
+
+        try:
+            val = sage_load( file_name )
+        except Exception as e:
+            OrbTools.p( 'Cannot load cached value:', file_name, e )
+            self.num_miss += 1
+            return False, None
+
+        os.utime( dir_name )  # mark as recently used
+        self.num_hit += 1
+
+        return True, val
+
+
+    def set( self, input, stage, val ):
+        '''
+        Stores "val" as the output of "stage" for "input" and
+        removes least recently used entries if the cache
+        becomes too large. The cache directory is only walked
+        if "self.size" is unknown or exceeds "self.max_size".
+
+        Parameters
+        ----------
+        input : OrbInput
+
+        stage : string
+            A key of "input.do".
+
+        val : object
+            An object that can be saved with "sage_save()".
+        '''
+        dir_name = self.path + OrbCache.get_key( input ) + '/'
+        file_name = dir_name + stage + '.sobj'
+        tmp_name = dir_name + stage + '.' + str( os.getpid() ) + '.sobj'
+
+        if not os.path.exists( dir_name ):
+            os.makedirs( dir_name, exist_ok = True )
+
+        old_size = 0
+        if os.path.exists( file_name ):
+            old_size = os.path.getsize( file_name )
+
+        # write to temporary file first so that concurrent
+        # processes never load a partially written file
+        sage_save( val, tmp_name )
+        os.replace( tmp_name, file_name )
+        os.utime( dir_name )
+
+        if self.size == None:
+            self.size = sum( [ size for ( tm, size, dir_name ) in self.get_size() ] )
+        else:
+            self.size += os.path.getsize( file_name ) - old_size
+
+        if self.size > self.max_size:
+            self.evict()
+
+
+    def get_size( self ):
+        '''
+        Returns
+        -------
+        list
+            A list of 3-tuples
+                [ ( <time>, <size>, <directory> ), ... ]
+            for each directory in the cache, where <time> is
+            the last time the directory was used and <size> is
+            its size in bytes. The list is ordered by <time>.
+        '''
+        if not os.path.exists( self.path ):
+            return []
+
+        out_lst = []
+        for key in os.listdir( self.path ):
+            dir_name = self.path + key + '/'
+            if not os.path.isdir( dir_name ):
+                continue
+            size = 0
+            for fname in os.listdir( dir_name ):
+                size += os.path.getsize( dir_name + fname )
+            out_lst += [( os.path.getmtime( dir_name ), size, dir_name )]
+
+        return sorted( out_lst )
+
+
+    def evict( self ):
+        '''
+        Removes least recently used directories from the cache
+        until its size is at most "self.max_size".
+        '''
+        size_lst = self.get_size()
+        total = sum( [ size for ( tm, size, dir_name ) in size_lst ] )
+        for tm, size, dir_name in size_lst:
+            if total <= self.max_size:
+                break
+            OrbTools.p( 'Removing from cache:', dir_name )
+            shutil.rmtree( dir_name, ignore_errors = True )
+            total -= size
+
+        self.size = total
+
+
+    def clear( self ):
+        '''
+        Removes all entries from the cache.
+        '''
+        for tm, size, dir_name in self.get_size():
+            shutil.rmtree( dir_name, ignore_errors = True )
+        self.size = 0
+
+
+    # human readable string representation of object
+    def __str__( self ):
+        return 'OrbCache<' + self.path + ', hits=' + str( self.num_hit ) + ', misses=' + str( self.num_miss ) + '>'
@@ -0,0 +1,94 @@
+'''
+Use of this source code is governed by a MIT-style license that can be found in the LICENSE file.
+Created on Oct 18, 2026
+@author: Niels Lubbes
+'''
+
+from orbital.prod.orb_canonical import get_canonical_key
+
+
+class OrbDedup:
+    '''
+    An index of the canonical keys of OrbInput objects, which
+    is used to skip inputs of a survey that are equivalent to
+    an input that was computed before or is queued
+    (see "orb_batch.orb_product_batch()").
+
+    Two inputs are equivalent if their keys "OrbDedup.get_key()"
+    are equal. In this case their orbital products are congruent
+    (see "orb_canonical.get_canonical_key()"), and both inputs
+    request the same attributes in "input.do". A random projection
+    (ie. "input.info_dct['pmat'][0]=='P1'") is treated as generic,
+    so that inputs that only differ in their random projections
+    are equivalent, although their projections are not congruent.
+
+    Attributes
+    ----------
+    key_dct : dict
+        A dictionary whose keys are outputs of "OrbDedup.get_key()"
+        and whose values are labels of the first input with this key.
+
+    num_dup : int
+        Number of inputs that were equivalent to a previous input.
+    '''
+
+    def __init__( self ):
+        self.key_dct = {}
+        self.num_dup = 0
+
+
+    @staticmethod
+    def get_key( input ):
+        '''
+        Parameters
+        ----------
+        input : OrbInput
+
+        Returns
+        -------
+        tuple
+            A key that consists of "orb_canonical.get_canonical_key()"
+            for the matrices of "input" and the flags in "input.do".
+            The projection "input.pmat" is considered to be generic
+            if it is random (ie. "input.info_dct['pmat'][0]=='P1'")
+            or if neither the parametrization nor the projection of
+            the orbital product is computed.
+        '''
+        pmat = input.pmat
+        if input.info_dct.get( 'pmat', ( None, ) )[0] == 'P1':
+            pmat = None
+        elif not input.do['pmz'] and not input.do['prj']:
+            pmat = None
+
+        return ( get_canonical_key( input.omat, input.vmat, pmat ), tuple( sorted( input.do.items() ) ) )
+
+
+    def add( self, input, label ):
+        '''
+        Parameters
+        ----------
+        input : OrbInput
+
+        label : object
+            A description of "input" that is not None,
+            for example "input.info_dct".
+
+        Returns
+        -------
+        object
+            If an equivalent input was added before, then its label
+            is returned. Otherwise "input" is added with label
+            "label" to the index and None is returned.
+        '''
+        key = OrbDedup.get_key( input )
+        if key in self.key_dct:
+            self.num_dup += 1
+            return self.key_dct[key]
+
+        self.key_dct[key] = label
+        return None
+
+
+    # human readable string representation of object
+    def __str__( self ):
+        return 'OrbDedup<keys=' + str( len( self.key_dct ) ) + ', duplicates=' + str( self.num_dup ) + '>'
@@ -67,9 +67,31 @@ class OrbInput:
             'prj' : If True, compute projection of S.
             'fct' : If True, compute components of projection of S (uses Maple).
             'gen' : If True, compute geometric genus of S (uses Maple).
-            'sng' : If True, compute singular locus of projection of S (uses Magma).
+            'sng' : If True, compute singular locus of projection of S (uses Magma or Singular).
             'tst' : If True, test parametrization/implicitization.   
         }
+
+    alg : dict
+        A dictionary with elimination strategies for the stages 'imp' 
+        and 'prj' of "orb_product.orb_product()". 
+        {
+            'imp' : Strategy for the implicit equation of S.
+            'prj' : Strategy for the projection of S.
+            'tst' : Either None for a probabilistic test of the 
+                    parametrization or 'exact' for a symbolic test 
+                    (see "orb_product.get_pmz_verify()").
+            'sng' : Either None for the singular locus with Magma
+                    (see "orb_product.get_sing_lst()") or 'singular'
+                    for Singular inside Sage
+                    (see "orb_product.get_sing_lst_singular()").
+        } 
+        A strategy for 'imp' and 'prj' is either None (use Sage's "elimination_ideal()"),
+        a key of "orb_elim.get_elim_alg_dct()", a list of such keys 
+        that are raced in separate processes (see "orb_elim.orb_elim_race()"),
+        'modular' for a multi-modular elimination 
+        (see "orb_modular.orb_modular_elim()"), or 'interp' for 
+        interpolation at rational points of the parametrization 
+        (see "orb_interp.get_imp_interp()" and "orb_interp.get_project_interp()").
     '''
 
 
@@ -90,6 +112,12 @@ class OrbInput:
         self.do['sng'] = True  # compute singular locus of projection of S
         self.do['tst'] = True  # test parametrization/implicitization
 
+        self.alg = {}
+        self.alg['imp'] = None  # elimination strategy for implicit equation of S
+        self.alg['prj'] = None  # elimination strategy for projection of S
+        self.alg['tst'] = None  # probabilistic test of parametrization
+        self.alg['sng'] = None  # singular locus with Magma
+
 
     def set_short_str( self, short_str ):
         '''
@@ -51,6 +51,12 @@ class OrbOutput:
         A list of polynomials in QQ[x0,...,x8] representing 
         the ideal of S. 
 
+    imp_ideal : sage_IDEAL
+        The ideal generated by "self.imp_lst" in a polynomial 
+        ring with only the variables x0,...,x8. Its Groebner basis
+        is computed once and reused for "self.emb", "self.deg", 
+        "self.dim" and "self.prj_pol" (see "orb_product.get_imp_ideal()").
+
     emb : int
         Integer representing the embedding dimension n of S in S^n
         so that S is not contained in a hyperplane section of S^n.
@@ -90,6 +96,19 @@ class OrbOutput:
         True if parametric and implicit surface agree
         and False if they are different. Set to None 
         if test was not performed.             
+
+    mod_dde : tuple
+        A 3-tuple of integers (<deg>,<emb>,<dim>), which are
+        the degree, embedding dimension and dimension of S 
+        as predicted by an elimination over a finite field.
+        Set to None if the prediction was not computed.
+
+    elim_dct : dict
+        A dictionary whose keys are 'imp' and/or 'prj', and values are 
+        the elimination strategies that computed "self.imp_lst" and 
+        "self.prj_pol" (see "orb_elim.get_elim_alg_dct()"). If several 
+        strategies were raced, then the value is the strategy that 
+        finished first. Stages that were loaded from a cache are omitted.
     '''
 
     # If True then __repr__ returns a minimal output
@@ -108,6 +127,7 @@ class OrbOutput:
         self.prj_pmz_lst = None
         self.bp_tree = None
         self.imp_lst = None
+        self.imp_ideal = None
         self.emb = None
         self.dim = None
         self.deg = None
@@ -117,6 +137,8 @@ class OrbOutput:
         self.gen = -1
         self.sng_lst = None
         self.pmz_test = None
+        self.mod_dde = None
+        self.elim_dct = {}
 
 
     def get_short_str( self ):
@@ -168,6 +190,10 @@ class OrbOutput:
             s += 'prj_pol{x0:0} = ' + str( sage_factor( self.prj_pol.subs( {OrbRing.coerce( 'x0' ):0} ) ) ) + '\n'
         s += 'xyz_pol       = ' + str( self.xyz_pol ) + '\n'
         s += 'pmz_test      = ' + str( self.pmz_test ) + '\n'
+        if self.mod_dde != None:
+            s += 'mod_dde       = ' + str( self.mod_dde ) + '\n'
+        if self.elim_dct != {}:
+            s += 'elim_dct      = ' + str( self.elim_dct ) + '\n'
 
         if self.fct_lst != None:
             s += 'fct_lst       = ' + str( len( self.fct_lst ) ) + ' factors\n'
@@ -0,0 +1,160 @@
+'''
+Use of this source code is governed by a MIT-style license that can be found in the LICENSE file.
+Created on Oct 18, 2026
+@author: Niels Lubbes
+
+
+The main functionality of this module is accessed via the method orb_product_batch()
+'''
+
+import os
+import time
+import multiprocessing
+
+from multiprocessing.connection import wait
+
+from orbital.class_orb_tools import OrbTools
+
+from orbital.prod.orb_product import orb_product
+
+
+def orb_product_job( input, conn, kwargs ):
+    '''
+    Called by "orb_product_batch()" inside a child process.
+
+    Parameters
+    ----------
+    input : OrbInput
+
+    conn : multiprocessing.connection.Connection
+        Write end of a pipe. We send a 2-tuple
+            ( <success>, <value> )
+        where <value> is an OrbOutput object if <success> is True
+        and a string describing the exception otherwise.
+
+    kwargs : dict
+        Keyword arguments for "orb_product()".
+    '''
+    try:
+        conn.send( ( True, orb_product( input, **kwargs ) ) )
+    except BaseException as e:
+        # exceptions raised by Sage cannot always be pickled
+        conn.send( ( False, type( e ).__name__ + ': ' + str( e ) ) )
+    conn.close()
+
+
+def orb_product_batch( input_lst, workers = None, timeout = None, dedup = None, **kwargs ):
+    '''
+    Computes "orb_product()" for each OrbInput in "input_lst"
+    where each computation runs in its own child process.
+
+    Parameters
+    ----------
+    input_lst : iterable<OrbInput>
+        A list (or generator) of OrbInput objects.
+
+    workers : int
+        Maximal number of child processes that run at the same time.
+        If None, then the number of CPUs is used.
+
+    timeout : float
+        Number of seconds after which a computation is aborted.
+        If None, then computations are never aborted.
+
+    dedup : OrbDedup
+        If not None, then an OrbInput is not computed if it is
+        equivalent to an input in the index "dedup" (see "OrbDedup.add()").
+        Otherwise the OrbInput is added to "dedup" before its
+        computation starts. The same index can be passed to
+        several calls in a survey.
+
+    kwargs : dict
+        Keyword arguments that are passed to "orb_product()".
+
+    Returns
+    -------
+    generator<tuple>
+        Yields 3-tuples
+            ( <idx>, <o>, <err> )
+        in the order in which the computations finish. Here <idx> is
+        the index of an OrbInput in "input_lst" and <o> is the
+        corresponding OrbOutput. If the computation was aborted or
+        raised an exception then <o> is None and <err> is a string
+        with the reason. If the OrbInput was skipped by "dedup", then
+        <o> is None and <err> is a string that starts with 'Equivalent'
+        and contains the label ("input.info_dct") of the equivalent input.
+        Otherwise <err> is None.
+
+    Notes
+    -----
+    The child processes are forked so that the OrbInput objects
+    do not need to be pickled. The OrbOutput objects are pickled
+    and send back through a pipe.
+    '''
+    ctx = multiprocessing.get_context( 'fork' )
+    if workers == None:
+        workers = os.cpu_count() or 1
+
+    job_itr = enumerate( input_lst )
+    run_dct = {}  # <read connection> : ( <idx>, <process>, <start time> )
+    while True:
+
+        # start new jobs while there are free workers
+        #
+        while len( run_dct ) < workers:
+            job = next( job_itr, None )
+            if job == None:
+                break
+            idx, input = job
+            if dedup != None:
+                label = dedup.add( input, input.info_dct )
+                if label != None:
+                    OrbTools.p( 'skipped job', idx, '(equivalent input)' )
+                    yield idx, None, 'Equivalent to ' + str( label )
+                    continue
+            rconn, wconn = ctx.Pipe( False )
+            proc = ctx.Process( target = orb_product_job, args = ( input, wconn, kwargs ) )
+            proc.daemon = True
+            proc.start()
+            wconn.close()
+            run_dct[rconn] = ( idx, proc, time.time() )
+            OrbTools.p( 'started job', idx, '(pid=' + str( proc.pid ) + ')' )
+
+        if run_dct == {}:
+            return
+
+        # wait until a job finishes or the first deadline passes
+        #
+        wait_time = None
+        if timeout != None:
+            first_start = min( [ start for ( idx, proc, start ) in run_dct.values() ] )
+            wait_time = max( 0, first_start + timeout - time.time() )
+
+        for conn in wait( list( run_dct.keys() ), wait_time ):
+            idx, proc, start = run_dct.pop( conn )
+            try:
+                success, val = conn.recv()
+            except EOFError:
+                proc.join()
+                success, val = False, 'Process exited with code ' + str( proc.exitcode )
+            conn.close()
+            proc.join()
+
+            OrbTools.p( 'finished job', idx, 'in', time.time() - start, 'seconds' )
+            if success:
+                yield idx, val, None
+            else:
+                yield idx, None, val
+
+        # abort jobs that passed their deadline
+        #
+        if timeout != None:
+            for conn in list( run_dct.keys() ):
+                idx, proc, start = run_dct[conn]
+                if time.time() - start >= timeout:
+                    run_dct.pop( conn )
+                    proc.terminate()
+                    proc.join()
+                    conn.close()
+                    OrbTools.p( 'aborted job', idx, 'after', timeout, 'seconds' )
+                    yield idx, None, 'Timeout after ' + str( timeout ) + ' seconds'
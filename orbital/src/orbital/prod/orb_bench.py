@@ -0,0 +1,334 @@
+'''
+Use of this source code is governed by a MIT-style license that can be found in the LICENSE file.
+Created on Oct 18, 2026
+@author: Niels Lubbes
+
+Benchmarks for the stages of "orb_product.orb_product()".
+'''
+
+import sys
+import json
+import time
+import platform
+import resource
+import tracemalloc
+
+from orbital.class_orb_tools import OrbTools
+
+from orbital.prod.class_orb_input import OrbInput
+from orbital.prod.class_orb_output import OrbOutput
+
+from orbital.prod.orb_product import get_pmz
+from orbital.prod.orb_product import get_orb_bp_tree
+from orbital.prod.orb_product import get_imp
+from orbital.prod.orb_product import get_deg_dim
+from orbital.prod.orb_product import get_project
+from orbital.prod.orb_product import get_pmz_verify
+
+from orbital.sage_interface import sage_set_random_seed
+
+
+def get_bench_dct():
+    '''
+    Returns
+    -------
+    dict
+        A dictionary whose keys are names of benchmarks and values
+        short strings of OrbInput objects (see "OrbInput.set_short_str()").
+        The inputs are taken from the use cases in "__main__.py",
+        the tests of "orb_product.py" and the povray images in "orbital.pov".
+    '''
+    dct = {}
+
+    # perseus cyclide (usecase_orb_product_investigate_example)
+    dct['perseus'] = "['@(4,3)=(deg,emb)', {'pmat': ('P0', 'I', 'I'), 'omat': ('T[1, 0, 0, 0, 0, 0, 0]', 'Orppp', 'T[-1, 0, 0, 0, 0, 0, 0]'), 'vmat': ('T[0, 1, 1, 0, 0, 0, 0]', 'Rrrrs[37, 0, 0, 0]', 'T[0, -1, -1, 0, 0, 0, 0]')}]"
+
+    # smooth sextic del Pezzo surface in S^5
+    dct['65_smooth'] = "['@(6,5)=(deg,emb)', {'pmat': ('P1', 'I', 'I'), 'omat': ('T[1, -1, 1, 1, -1, 0, 0]', 'Opsms', 'I'), 'vmat': ('T[1, 0, -1, 0, 0, 0, 0]', 'Rramr[340, 225, 264, 320]', 'T[-1, 0, 1, 0, 0, 0, 0]')}]"
+
+    # singular sextic del Pezzo surface in S^5
+    dct['65_sing'] = "['@(6,5)=(deg,emb)', {'pmat': ('P1', 'I', 'I'), 'omat': ('T[0, 0, 0, 1, 1, -1, -1]', 'Oprps', 'I'), 'vmat': ('T[0, -1, 0, -1, 0, 0, 0]', 'Rspps[148, 344, 284, 304]', 'T[0, 1, 0, 1, 0, 0, 0]')}]"
+
+    # weak del Pezzo surface in S^5 (pov_dp6_sing.py)
+    dct['dp6_sing'] = "['@(6,5)=(deg,emb)', {'pmat': ('M[[1, 0, 0, 0, 0, 0, 0, -1, -1], [0, 1, 0, 0, 0, 0, 0, 0, 0], [0, 0, 1, 0, 0, 0, 0, 0, 0], [0, 0, 0, 1, -1, 0, 0, 0, 0]]', 'I', 'I'), 'omat': ('I', 'Oprpr', 'I'), 'vmat': ('T[0, 1, 1, 0, 0, 0, 0]', 'Rrppr[37,0,0,90]', 'T[0, -1, -1, 0, 0, 0, 0]')}]"
+
+    return dct
+
+
+def get_stage_lst():
+    '''
+    Returns
+    -------
+    list<string>
+        The keys of "OrbInput.do" of the stages that are benchmarked
+        in the order in which they are computed.
+    '''
+    return ['pmz', 'bpt', 'imp', 'dde', 'prj', 'tst']
+
+
+def bench_call( fun, *arg_lst, trace = False ):
+    '''
+    Parameters
+    ----------
+    fun : function
+
+    *arg_lst
+        Arguments for "fun".
+
+    trace : bool
+        If True, then the memory allocations are traced
+        with "tracemalloc".
+
+    Returns
+    -------
+    tuple
+        A 2-tuple ( <val>, <dct> ) where <val> is the output of
+        "fun(*arg_lst)" and <dct> is a dictionary with keys
+
+            'wall'   : wall time in seconds,
+            'cpu'    : process time in seconds,
+            'peak'   : peak size in bytes of memory allocated by
+                       Python during the call (see "tracemalloc"),
+                       or None if "trace" is False,
+            'maxrss' : maximum resident set size of the process
+                       in kilobytes after the call.
+
+        Note that memory allocated by libraries such as Singular
+        is not traced by "tracemalloc", but is included in 'maxrss'.
+        Tracing slows down Python code considerably, so that the
+        times should only be used if "trace" is False.
+    '''
+    if trace:
+        tracemalloc.start()
+    cpu = time.process_time()
+    wall = time.perf_counter()
+
+    val = fun( *arg_lst )
+
+    wall = time.perf_counter() - wall
+    cpu = time.process_time() - cpu
+    peak = None
+    if trace:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    dct = {}
+    dct['wall'] = wall
+    dct['cpu'] = cpu
+    dct['peak'] = peak
+    dct['maxrss'] = resource.getrusage( resource.RUSAGE_SELF ).ru_maxrss
+
+    return val, dct
+
+
+def bench_input( input, stage_lst = None, trace = False ):
+    '''
+    Parameters
+    ----------
+    input : OrbInput
+
+    stage_lst : list<string>
+        A sublist of "get_stage_lst()". If None, then all stages
+        are benchmarked.
+
+    trace : bool
+        Passed to "bench_call()".
+
+    Returns
+    -------
+    dict
+        A dictionary whose keys are the stages in "stage_lst"
+        and values are as returned by "bench_call()".
+        The remaining stages are computed without benchmarking
+        if they are needed for a later stage.
+    '''
+    if stage_lst == None:
+        stage_lst = get_stage_lst()
+
+    need_dct = {}
+    need_dct['pmz'] = 'bpt' in stage_lst or 'tst' in stage_lst
+    need_dct['imp'] = 'dde' in stage_lst or 'prj' in stage_lst or 'tst' in stage_lst
+    need_dct['prj'] = 'tst' in stage_lst
+
+    o = OrbOutput( input )
+    out_dct = {}
+
+    def call( stage, fun, *arg_lst ):
+        if stage in stage_lst:
+            val, out_dct[stage] = bench_call( fun, *arg_lst, trace = trace )
+            OrbTools.p( stage, out_dct[stage] )
+            return val
+        return fun( *arg_lst )
+
+    if 'pmz' in stage_lst or need_dct['pmz']:
+        o.pmz_lst, o.prj_pmz_lst = call( 'pmz', get_pmz, input.pmat, input.omat, input.vmat )
+
+    if 'bpt' in stage_lst:
+        o.bp_tree = call( 'bpt', get_orb_bp_tree, o.pmz_lst )
+
+    if 'imp' in stage_lst or need_dct['imp']:
+        o.imp_lst = call( 'imp', get_imp, input.omat, input.vmat )
+
+    if 'dde' in stage_lst:
+        o.deg, o.dim = call( 'dde', get_deg_dim, o.imp_lst )
+
+    if 'prj' in stage_lst or need_dct['prj']:
+        o.prj_pol, o.xyz_pol = call( 'prj', get_project, o.imp_lst, input.pmat )
+
+    if 'tst' in stage_lst:
+        o.pmz_test = call( 'tst', get_pmz_verify, o )
+
+    return out_dct
+
+
+def get_bench_input( name, seed = 0 ):
+    '''
+    Parameters
+    ----------
+    name : string
+        A key of "get_bench_dct()".
+
+    seed : int
+        Seed for the random number generator, which is set before
+        the OrbInput is constructed so that random projections
+        (eg. 'P1') are the same for each call.
+
+    Returns
+    -------
+    OrbInput
+        The input of the benchmark "name".
+    '''
+    sage_set_random_seed( seed )
+    return OrbInput().set_short_str( get_bench_dct()[name] )
+
+
+def orb_bench( name_lst = None, stage_lst = None, repeat = 1, seed = 0, fname = None, memory = True ):
+    '''
+    Benchmarks the stages of "orb_product.orb_product()".
+
+    Parameters
+    ----------
+    name_lst : list<string>
+        A list of keys of "get_bench_dct()".
+        If None, then all benchmarks are run.
+
+    stage_lst : list<string>
+        A sublist of "get_stage_lst()".
+        If None, then all stages are benchmarked.
+
+    repeat : int
+        Number of times that each benchmark is run. For times
+        the minimum and for memory the maximum over all runs is taken.
+
+    seed : int
+        Seed for the random number generator (see "get_bench_input()").
+
+    fname : string
+        If not None, then the result is written as JSON to a file
+        with name "fname".
+
+    memory : bool
+        If True, then each benchmark is run once more while memory
+        allocations are traced, in order to measure the peak memory.
+        The times are always measured in runs without tracing.
+        If False, then the peak memory is None.
+
+    Returns
+    -------
+    dict
+        A dictionary
+            {
+              'info'  : <dict with info about the run>,
+              'bench' : { <name>: { <stage>: <dict>, ... }, ... }
+            }
+        where <dict> is as returned by "bench_call()".
+    '''
+    bench_dct = get_bench_dct()
+    if name_lst == None:
+        name_lst = sorted( bench_dct.keys() )
+
+    out_dct = {}
+    out_dct['info'] = {}
+    out_dct['info']['time'] = time.strftime( '%Y-%m-%d %H:%M:%S', time.gmtime() )
+    out_dct['info']['python'] = sys.version.split()[0]
+    out_dct['info']['platform'] = platform.platform()
+    out_dct['info']['repeat'] = repeat
+    out_dct['info']['seed'] = seed
+    out_dct['bench'] = {}
+
+    for name in name_lst:
+
+        OrbTools.p( 'Benchmark:', name )
+
+        run_lst = []
+        for rep in range( repeat ):
+            run_lst += [ bench_input( get_bench_input( name, seed ), stage_lst ) ]
+
+        trace_run = None
+        if memory:
+            trace_run = bench_input( get_bench_input( name, seed ), stage_lst, True )
+
+        out_dct['bench'][name] = {}
+        for stage in run_lst[0]:
+            dct = {}
+            for key in ['wall', 'cpu']:
+                dct[key] = min( [ run[stage][key] for run in run_lst ] )
+            dct['maxrss'] = max( [ run[stage]['maxrss'] for run in run_lst ] )
+            dct['peak'] = None
+            if trace_run != None:
+                dct['peak'] = trace_run[stage]['peak']
+                dct['maxrss'] = max( dct['maxrss'], trace_run[stage]['maxrss'] )
+            out_dct['bench'][name][stage] = dct
+
+    if fname != None:
+        OrbTools.p( 'Writing benchmark to:', fname )
+        with open( fname, 'w' ) as json_file:
+            json.dump( out_dct, json_file, indent = 2, sort_keys = True )
+
+    return out_dct
+
+
+def orb_bench_compare( old_fname, new_fname, key = 'wall' ):
+    '''
+    Parameters
+    ----------
+    old_fname : string
+        File name of a JSON file written by "orb_bench()".
+
+    new_fname : string
+        File name of a JSON file written by "orb_bench()".
+
+    key : string
+        Either 'wall', 'cpu', 'peak' or 'maxrss'.
+
+    Returns
+    -------
+    list
+        A list of 5-tuples
+            [ ( <name>, <stage>, <old>, <new>, <ratio> ), ... ]
+        for each benchmark and stage that occurs in both files,
+        where <ratio> is the quotient <new>/<old> of the values for "key".
+        Thus a ratio larger than 1 indicates a regression.
+        Values that are None (see "orb_bench()") are skipped.
+    '''
+    with open( old_fname, 'r' ) as json_file:
+        old_dct = json.load( json_file )['bench']
+    with open( new_fname, 'r' ) as json_file:
+        new_dct = json.load( json_file )['bench']
+
+    out_lst = []
+    for name in sorted( old_dct.keys() ):
+        if name not in new_dct:
+            continue
+        for stage in get_stage_lst():
+            if stage not in old_dct[name] or stage not in new_dct[name]:
+                continue
+            old = old_dct[name][stage][key]
+            new = new_dct[name][stage][key]
+            if old == None or new == None:
+                continue  # memory was not traced
+            ratio = float( new ) / old if old != 0 else float( 'inf' )
+            out_lst += [( name, stage, old, new, ratio )]
+            OrbTools.p( name, stage, old, new, ratio )
+
+    return out_lst
@@ -0,0 +1,196 @@
+'''
+Use of this source code is governed by a MIT-style license that can be found in the LICENSE file.
+Created on Oct 18, 2026
+@author: Niels Lubbes
+
+
+Canonical forms of the input ( omat, vmat, pmat ) of "orb_product.orb_product()"
+with respect to symmetries that send the orbital product to a congruent
+orbital product. The main
+functionality of this module is accessed via the method get_canonical_key().
+'''
+
+import itertools
+
+from orbital.class_orb_tools import OrbTools
+
+from orbital.class_orb_ring import OrbRing
+
+
+def get_comp_lst( omat ):
+    '''
+    Parameters
+    ----------
+    omat : sage_matrix
+        A 9x9 matrix.
+
+    Returns
+    -------
+    list<tuple<int>>
+        The connected components of the graph with vertices 0,...,8,
+        where i and j are connected if "omat[i,j]" or "omat[j,i]"
+        is nonzero. Each component is a sorted tuple of indices
+        and the components are sorted by their first index.
+        For example, the components of "get_omat( 'Orpmp' )" are:
+            (0,), (1,2), (3,), (4,), (5,), (6,), (7,), (8,)
+    '''
+    root_lst = list( range( 9 ) )
+
+    def get_root( i ):
+        while root_lst[i] != i:
+            i = root_lst[i]
+        return i
+
+    for i in range( 9 ):
+        for j in range( i + 1, 9 ):
+            if omat[i, j] != 0 or omat[j, i] != 0:
+                root_lst[get_root( j )] = get_root( i )
+
+    comp_dct = {}
+    for i in range( 9 ):
+        comp_dct.setdefault( get_root( i ), [] ).append( i )
+
+    return sorted( [ tuple( comp ) for comp in comp_dct.values() ] )
+
+
+def get_comp_key( o_lst, v_lst, comp, movable ):
+    '''
+    Parameters
+    ----------
+    o_lst : list<list<tuple<string>>>
+        The entries of a 9x9 matrix, where each entry is
+        a 2-tuple of strings of the entry and its negation.
+
+    v_lst : list<list>
+        The entries of a 9x3 matrix over QQ.
+
+    comp : tuple<int>
+        A component of "get_comp_lst()".
+
+    movable : bool
+        If True, then the coordinates of "comp" may be permuted
+        and their signs may be changed.
+
+    Returns
+    -------
+    tuple
+        A key for the block of "o_lst" with rows and columns in
+        "comp" together with the rows of "v_lst" in "comp".
+        If "movable" is True, then the key is the minimum over
+        all signed permutations of the coordinates in "comp" and
+        the key does not depend on the indices in "comp".
+    '''
+    if not movable:
+        return ( comp,
+                 tuple( [ o_lst[i][j][0] for i in comp for j in comp ] ),
+                 tuple( [ str( v_lst[i][k] ) for i in comp for k in range( 3 ) ] ) )
+
+    key_lst = []
+    for perm in itertools.permutations( comp ):
+        for sgn in itertools.product( [1, -1], repeat = len( comp ) ):
+            o_key = []
+            for k in range( len( comp ) ):
+                for l in range( len( comp ) ):
+                    o_key += [ o_lst[perm[k]][perm[l]][sgn[k] * sgn[l] == -1] ]
+            v_key = [ str( sgn[k] * v_lst[perm[k]][m] ) for k in range( len( comp ) ) for m in range( 3 ) ]
+            key_lst += [ ( len( comp ), tuple( o_key ), tuple( v_key ) ) ]
+
+    return min( key_lst )
+
+
+def get_canonical_key( omat, vmat, pmat = None ):
+    '''
+    Parameters
+    ----------
+    omat : sage_matrix
+        A 9x9 matrix over QQ[c0,s0] (see "OrbInput.omat").
+
+    vmat : sage_matrix
+        A 9x9 matrix over QQ (see "OrbInput.vmat").
+
+    pmat : sage_matrix
+        A 4x9 matrix over QQ (see "OrbInput.pmat") or None
+        if the projection is considered to be generic. For example,
+        "OrbDedup.get_key()" passes None for a random projection 'P1'.
+
+    Returns
+    -------
+    tuple
+        A key such that two inputs with the same key have congruent
+        orbital products, that is, the orbital products are equal up
+        to an isometry of S^7 and a reparametrization. In particular
+        their degree, embedding dimension and dimension are equal,
+        but their implicit equations may differ. The key is the
+        lexicographic minimum of the keys obtained by applying
+        the following symmetries:
+
+            * Reparametrizations of the 1-parameter subgroup, which
+              substitute (c0,s0) by (c0,-s0), (-c0,s0) or (-c0,-s0).
+              For example, the blocks 'r' and 's' of "get_omat()"
+              are interchanged by (-c0,-s0).
+
+            * Reparametrizations of the circle, which substitute (c1,s1)
+              by (c1,-s1), (s1,c1), etc. These change the signs and
+              order of the 2nd and 3rd column of "vmat".
+
+            * Scaling of "vmat" such that "vmat[0,0]" is 1
+              (if nonzero).
+
+            * Conjugation of "omat" by signed permutations of the
+              coordinates x1,...,x8, which are isometries of S^7. We
+              only permute components of "get_comp_lst( omat )"
+              of size at most two, such as the 2x2 blocks of
+              "get_omat()". Coordinates of "pmat" with a nonzero
+              column are not permuted, since their projection
+              would change.
+
+    Notes
+    -----
+    Only the first three columns of "vmat" are used, since
+    "vmat" is applied to the circle (1:c1:s1:0:0:0:0:0:0).
+    '''
+    c0, s0 = OrbRing.coerce( 'c0,s0' )
+
+    # coordinates that are not permuted
+    fix_set = set( [0] )
+    if pmat != None:
+        fix_set.update( [ j for j in range( 9 ) if not pmat.column( j ).is_zero() ] )
+
+    comp_lst = get_comp_lst( omat )
+    mov_lst = [ len( comp ) <= 2 and fix_set.isdisjoint( comp ) for comp in comp_lst ]
+
+    # only the circle (1:c1:s1:0:...:0) is used
+    v_lst = [ list( row[:3] ) for row in vmat.rows() ]
+    if v_lst[0][0] != 0:
+        v00 = v_lst[0][0]
+        v_lst = [ [ v / v00 for v in row ] for row in v_lst ]
+
+    o_ent_lst = [ [ OrbRing.R( ent ) for ent in row ] for row in omat.rows() ]
+
+    key_lst = []
+    for a0, a1 in itertools.product( [1, -1], repeat = 2 ):
+        dct = {c0:a0 * c0, s0:a1 * s0}
+        o_lst = []
+        for row in o_ent_lst:
+            o_lst += [ [ ( str( ent.subs( dct ) ), str( -ent.subs( dct ) ) ) for ent in row ] ]
+
+        for perm in [( 1, 2 ), ( 2, 1 )]:
+            for b1, b2 in itertools.product( [1, -1], repeat = 2 ):
+                w_lst = [ [row[0], b1 * row[perm[0]], b2 * row[perm[1]]] for row in v_lst ]
+
+                fix_key, mov_key = [], []
+                for comp, movable in zip( comp_lst, mov_lst ):
+                    if movable:
+                        mov_key += [ get_comp_key( o_lst, w_lst, comp, True ) ]
+                    else:
+                        fix_key += [ get_comp_key( o_lst, w_lst, comp, False ) ]
+                key_lst += [ ( tuple( fix_key ), tuple( sorted( mov_key ) ) ) ]
+
+    pmat_key = None
+    if pmat != None:
+        pmat_key = str( list( pmat ) )
+
+    key = ( pmat_key, ) + min( key_lst )
+    OrbTools.p( 'components =', comp_lst, ', movable =', mov_lst, lvl = 2 )
+
+    return key
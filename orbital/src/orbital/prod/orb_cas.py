@@ -0,0 +1,375 @@
+'''
+Use of this source code is governed by a MIT-style license that can be found in the LICENSE file.
+Created on Oct 18, 2026
+@author: Niels Lubbes
+
+
+Pools of long-lived sessions of an external computer algebra
+system (CAS) such as Maple or Magma. The main functionality of
+this module is accessed via the method get_cas_pool() and
+the class OrbCasPool.
+'''
+
+import os
+import queue
+import threading
+import concurrent.futures
+
+from orbital.class_orb_tools import OrbTools
+
+
+def get_cas_marker( name ):
+    '''
+    Parameters
+    ----------
+    name : string
+        Either 'maple' or 'magma'.
+
+    Returns
+    -------
+    tuple
+        A 2-tuple of strings ( <marker>, <command> ) where <command>
+        is a command for the CAS "name" that prints <marker>.
+        The marker separates the outputs of the commands in a
+        batched script (see "OrbCasPool.eval_lst()").
+    '''
+    marker = 'ORB_CAS_MARKER'
+    if name == 'maple':
+        return marker, 'lprint(`' + marker + '`);'
+    if name == 'magma':
+        return marker, 'print "' + marker + '";'
+    raise ValueError( 'Unknown CAS:', name )
+
+
+def get_cas_factory( name ):
+    '''
+    Parameters
+    ----------
+    name : string
+        Either 'maple' or 'magma'.
+
+    Returns
+    -------
+    function
+        A function without arguments that returns a new
+        session of the CAS "name". A session is an object
+        with methods "eval( <string> )" and "quit()".
+    '''
+    # Sage is only needed when sessions are started
+    from orbital.sage_interface import sage_Maple
+    from orbital.sage_interface import sage_Magma
+
+    if name == 'maple':
+        return sage_Maple
+    if name == 'magma':
+        return sage_Magma
+    raise ValueError( 'Unknown CAS:', name )
+
+
+class OrbCasStub( object ):
+    '''
+    A scripted local stand-in for a session of a CAS, which can
+    replace Maple or Magma in tests. For example:
+
+        pool = OrbCasPool( 'maple', factory = lambda: OrbCasStub( 'maple', fun ) )
+    '''
+
+    def __init__( self, name, fun ):
+        '''
+        Parameters
+        ----------
+        name : string
+            Either 'maple' or 'magma'.
+
+        fun : function
+            A function that takes a non-empty line of a script
+            as argument and returns the output as a string.
+        '''
+        self.name = name
+        self.fun = fun
+        self.quit_count = 0
+
+    def eval( self, code ):
+        '''
+        Parameters
+        ----------
+        code : string
+            A script with one command per line.
+
+        Returns
+        -------
+        string
+            The concatenation of the outputs of "self.fun" for each
+            line of "code". The lines that print the marker
+            (see "get_cas_marker()") are handled by the stand-in.
+        '''
+        marker, marker_cmd = get_cas_marker( self.name )
+        out_lst = []
+        for line in code.split( '\n' ):
+            line = line.strip()
+            if line == marker_cmd:
+                out_lst += [marker]
+            elif line != '':
+                out_lst += [ str( self.fun( line ) ) ]
+        return '\n'.join( out_lst )
+
+    def quit( self ):
+        self.quit_count += 1
+
+
+class OrbCasPool( object ):
+    '''
+    A pool of worker threads, where each worker owns a long-lived
+    session of a CAS. Jobs are taken from a common queue so that
+    at most "size" jobs are computed at the same time. A session
+    is started by its worker when the first job arrives and it
+    is restarted after a job failed or was aborted by a timeout.
+    '''
+
+    def __init__( self, name, size = 1, factory = None ):
+        '''
+        Parameters
+        ----------
+        name : string
+            Either 'maple' or 'magma'.
+
+        size : int
+            Number of worker sessions.
+
+        factory : function
+            A function without arguments that returns a new session.
+            If None, then "get_cas_factory( name )" is used.
+        '''
+        self.name = name
+        self.size = size
+        self.factory = factory
+        if self.factory == None:
+            self.factory = get_cas_factory( name )
+        self.pid = os.getpid()
+
+        self.job_queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.run_dct = {}  # <future> : <session>
+
+        self.thread_lst = []
+        for i in range( size ):
+            thread = threading.Thread( target = self.__work )
+            thread.daemon = True
+            thread.start()
+            self.thread_lst += [thread]
+
+    def __work( self ):
+        '''
+        The loop of a worker thread.
+        '''
+        session = None
+        while True:
+
+            job = self.job_queue.get()
+            if job == None:
+                break
+            fun, future = job
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            try:
+                if session == None:
+                    session = self.factory()
+                with self.lock:
+                    self.run_dct[future] = session
+                val, exc = fun( session ), None
+            except BaseException as e:
+                val, exc = None, e
+
+            with self.lock:
+                self.run_dct.pop( future, None )
+                aborted = future.done()
+
+            if ( aborted or exc != None ) and session != None:
+                # the state of the session is unknown
+                self.__quit( session )
+                session = None
+            if aborted:
+                continue
+
+            if exc != None:
+                future.set_exception( exc )
+            else:
+                future.set_result( val )
+
+        if session != None:
+            self.__quit( session )
+
+    def __quit( self, session ):
+        try:
+            session.quit()
+        except BaseException as e:
+            OrbTools.p( self.name, 'quit failed:', type( e ).__name__ )
+
+    def submit( self, fun ):
+        '''
+        Parameters
+        ----------
+        fun : function
+            A function that takes a session as argument.
+
+        Returns
+        -------
+        concurrent.futures.Future
+            The future of the output of "fun( <session> )", where
+            <session> is the session of the worker that takes the job.
+        '''
+        future = concurrent.futures.Future()
+        self.job_queue.put( ( fun, future ) )
+        return future
+
+    def result( self, future, timeout = None ):
+        '''
+        Parameters
+        ----------
+        future : concurrent.futures.Future
+            The output of "self.submit()".
+
+        timeout : float
+            Number of seconds. If None, then we wait until the job is done.
+
+        Returns
+        -------
+        object
+            The result of "future". If the job was not done
+            within "timeout" seconds, then the job is aborted by
+            quitting its session and a TimeoutError is raised.
+        '''
+        try:
+            return future.result( timeout )
+        except concurrent.futures.TimeoutError:
+            pass
+
+        if not future.cancel():
+            with self.lock:
+                session = self.run_dct.pop( future, None )
+                if session != None:
+                    future.set_exception( TimeoutError( 'Aborted after', timeout, 'seconds' ) )
+            if session != None:
+                self.__quit( session )
+
+        raise TimeoutError( self.name + ' job exceeded', timeout, 'seconds' )
+
+    def eval( self, code, timeout = None ):
+        '''
+        Parameters
+        ----------
+        code : string
+            A script for the CAS.
+
+        timeout : float
+
+        Returns
+        -------
+        string
+            The output of the CAS for "code" (see also "self.result()").
+        '''
+        return self.result( self.submit( lambda session: str( session.eval( code ) ) ), timeout )
+
+    def eval_lst( self, cmd_lst, timeout = None, batch_size = None ):
+        '''
+        Evaluates a list of commands in batches, where each batch
+        is send as a single script, and the outputs of the
+        commands in a batch are separated by printing a marker
+        (see "get_cas_marker()").
+
+        Parameters
+        ----------
+        cmd_lst : list<string>
+            A list of commands that fit on a single line.
+
+        timeout : float
+            Timeout in seconds for each batch.
+
+        batch_size : int
+            Maximal number of commands in each batch. If None, then
+            the commands are divided evenly over the workers.
+
+        Returns
+        -------
+        list<string>
+            A list of outputs of the commands in "cmd_lst". Errors are
+            raised as in "self.result()". A ValueError is raised if the
+            output of a batch cannot be split into the output of each
+            command.
+        '''
+        if cmd_lst == []:
+            return []
+        if batch_size == None:
+            batch_size = -( -len( cmd_lst ) // self.size )
+
+        marker, marker_cmd = get_cas_marker( self.name )
+        future_lst = []
+        for i in range( 0, len( cmd_lst ), batch_size ):
+            bat_lst = cmd_lst[i:i + batch_size]
+            code = '\n'.join( [ cmd + '\n' + marker_cmd for cmd in bat_lst ] )
+            future_lst += [ ( len( bat_lst ), self.submit( lambda session, code = code: str( session.eval( code ) ) ) ) ]
+
+        out_lst = []
+        for num, future in future_lst:
+            part_lst = self.result( future, timeout ).split( marker )
+            if len( part_lst ) != num + 1:
+                raise ValueError( 'Unexpected output of batch:', part_lst )
+            out_lst += [ part.strip() for part in part_lst[:-1] ]
+
+        OrbTools.p( self.name, 'commands =', len( cmd_lst ), ', batches =', len( future_lst ) )
+
+        return out_lst
+
+    def close( self ):
+        '''
+        Stops the workers and quits their sessions after the
+        jobs in the queue are done.
+        '''
+        for thread in self.thread_lst:
+            self.job_queue.put( None )
+        self.thread_lst = []
+
+
+pool_dct = {}  # <name> : <OrbCasPool>
+
+
+def get_cas_pool( name ):
+    '''
+    Parameters
+    ----------
+    name : string
+        Either 'maple' or 'magma'.
+
+    Returns
+    -------
+    OrbCasPool
+        The pool of sessions for the CAS "name" of the current
+        process. By default the pool has a single session.
+        A forked child process (eg. a job of "orb_batch.orb_product_batch()")
+        starts its own pool, since threads are not inherited.
+    '''
+    pool = pool_dct.get( name, None )
+    if pool == None or pool.pid != os.getpid():
+        pool = pool_dct[name] = OrbCasPool( name )
+    return pool
+
+
+def set_cas_pool( name, pool ):
+    '''
+    Parameters
+    ----------
+    name : string
+        Either 'maple' or 'magma'.
+
+    pool : OrbCasPool
+        A pool that replaces the current pool of the CAS "name",
+        for example with more sessions or with stand-ins
+        (see "OrbCasStub"). If None, then the default pool
+        is started when it is needed again.
+    '''
+    old_pool = pool_dct.pop( name, None )
+    if old_pool != None and old_pool.pid == os.getpid():
+        old_pool.close()
+    if pool != None:
+        pool_dct[name] = pool
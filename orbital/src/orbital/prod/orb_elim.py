@@ -0,0 +1,230 @@
+'''
+Use of this source code is governed by a MIT-style license that can be found in the LICENSE file.
+Created on Oct 18, 2026
+@author: Niels Lubbes
+
+
+The main functionality of this module is accessed via the methods
+orb_elim() and orb_elim_race()
+'''
+
+import time
+import multiprocessing
+
+from multiprocessing.connection import wait
+
+from orbital.class_orb_tools import OrbTools
+
+from orbital.class_orb_ring import OrbRing
+
+from orbital.poly_maps import convert_pol
+
+from orbital.sage_interface import sage_singular_function
+
+
+def get_elim_alg_dct():
+    '''
+    Returns
+    -------
+    dict
+        A dictionary whose keys are names of elimination strategies
+        and values are 2-tuples
+            ( <algorithm>, <order> )
+        where <algorithm> is passed to "groebner_basis()" and
+        <order> is the monomial order of the block of variables
+        that are eliminated. The remaining variables are ordered
+        with 'degrevlex'. The strategy 'eliminate' uses the
+        method "elimination_ideal()" of Sage instead and its
+        value is ( None, None ). The strategy 'modstd' calls the
+        Singular procedure "modStd()" of the library 'modstd.lib',
+        which computes the Groebner basis over QQ from Groebner
+        bases modulo several primes. It is only available for
+        polynomial rings over QQ.
+    '''
+    dct = {}
+    dct['eliminate'] = ( None, None )
+    dct['std'] = ( 'libsingular:std', 'degrevlex' )
+    dct['slimgb'] = ( 'libsingular:slimgb', 'degrevlex' )
+    dct['std_lex'] = ( 'libsingular:std', 'lex' )
+    dct['modstd'] = ( 'modStd', 'degrevlex' )
+    return dct
+
+
+def orb_elim( g_lst, e_lst, alg = 'eliminate' ):
+    '''
+    Parameters
+    ----------
+    g_lst : list<sage_POLY>
+        A list of generators of an ideal in a polynomial ring.
+
+    e_lst : list<sage_POLY>
+        A list of variables of this polynomial ring.
+
+    alg : string
+        A key of "get_elim_alg_dct()".
+
+    Returns
+    -------
+    list<sage_POLY>
+        A list of generators of the elimination ideal of the
+        ideal generated by "g_lst" with respect to the variables
+        in "e_lst". The generators are elements of the parent
+        of the polynomials in "g_lst".
+    '''
+    R = g_lst[0].parent()
+    if alg == 'eliminate':
+        return list( R.ideal( g_lst ).elimination_ideal( e_lst ).gens() )
+
+    # ring with a block order such that the variables in "e_lst" are larger
+    algorithm, e_order = get_elim_alg_dct()[alg]
+    e_str_lst = [ str( e ) for e in e_lst ]
+    r_str_lst = [ str( v ) for v in R.gens() if str( v ) not in e_str_lst ]
+    order = e_order + '(' + str( len( e_str_lst ) ) + ')'
+    if r_str_lst != []:
+        order += ',degrevlex(' + str( len( r_str_lst ) ) + ')'
+    Rb = OrbRing.get_ring( ','.join( e_str_lst + r_str_lst ), R.base_ring(), order )
+
+    # the elements of a Groebner basis that do not depend on "e_lst"
+    # form a Groebner basis for the elimination ideal
+    if algorithm == 'modStd':
+        modStd = sage_singular_function( 'modStd', 'modstd.lib' )
+        gb_lst = list( modStd( Rb.ideal( convert_pol( g_lst, Rb ) ) ).gens() )
+    else:
+        gb_lst = Rb.ideal( convert_pol( g_lst, Rb ) ).groebner_basis( algorithm )
+    e_set = set( Rb.gens()[:len( e_str_lst )] )
+    el_lst = [ gb for gb in gb_lst if e_set.isdisjoint( gb.variables() ) ]
+
+    return convert_pol( el_lst, R )
+
+
+def orb_elim_job( g_lst, e_lst, alg, conn ):
+    '''
+    Called by "orb_elim_race()" inside a child process.
+
+    Parameters
+    ----------
+    g_lst : list<sage_POLY>
+
+    e_lst : list<sage_POLY>
+
+    alg : string
+
+    conn : multiprocessing.connection.Connection
+        Write end of a pipe. We send a 2-tuple
+            ( <success>, <value> )
+        where <value> is a list of strings of the output
+        of "orb_elim( g_lst, e_lst, alg )" if <success> is True
+        and a string describing the exception otherwise.
+    '''
+    try:
+        conn.send( ( True, [ str( el ) for el in orb_elim( g_lst, e_lst, alg ) ] ) )
+    except BaseException as e:
+        conn.send( ( False, type( e ).__name__ + ': ' + str( e ) ) )
+    conn.close()
+
+
+def orb_elim_race( g_lst, e_lst, alg_lst = None, timeout = None ):
+    '''
+    Computes "orb_elim()" for several strategies at the same time,
+    where each strategy runs in its own child process. The output
+    of the first strategy that finishes is returned, and the
+    remaining child processes are terminated.
+
+    Parameters
+    ----------
+    g_lst : list<sage_POLY>
+        A list of generators of an ideal in a polynomial ring.
+
+    e_lst : list<sage_POLY>
+        A list of variables of this polynomial ring.
+
+    alg_lst : list<string>
+        A list of keys of "get_elim_alg_dct()".
+        If None, then all strategies are raced.
+
+    timeout : float
+        Number of seconds after which all computations are aborted.
+        If None, then computations are never aborted.
+
+    Returns
+    -------
+    tuple
+        A 2-tuple ( <el_lst>, <alg> ) where <el_lst> is the output
+        of "orb_elim( g_lst, e_lst, <alg> )" and <alg> is the
+        strategy that finished first. A ValueError is raised if
+        all strategies failed or if the timeout passed.
+
+    Notes
+    -----
+    The child processes are forked so that the polynomials
+    do not need to be pickled. The output is send back as strings.
+    A daemonic process, such as a job of "orb_batch.orb_product_batch()",
+    cannot have child processes. In this case the strategies are
+    computed one after another in the current process and the first
+    strategy that succeeds is returned, without timeout.
+    '''
+    if alg_lst == None:
+        alg_lst = list( get_elim_alg_dct().keys() )
+
+    if multiprocessing.current_process().daemon:
+        err_lst = []
+        for alg in alg_lst:
+            try:
+                return orb_elim( g_lst, e_lst, alg ), alg
+            except Exception as e:
+                err_lst += [ alg + ': ' + type( e ).__name__ + ': ' + str( e ) ]
+        raise ValueError( 'No elimination strategy succeeded:', err_lst )
+
+    ctx = multiprocessing.get_context( 'fork' )
+    start = time.time()
+    run_dct = {}  # <read connection> : ( <alg>, <process> )
+    for alg in alg_lst:
+        rconn, wconn = ctx.Pipe( False )
+        proc = ctx.Process( target = orb_elim_job, args = ( g_lst, e_lst, alg, wconn ) )
+        proc.daemon = True
+        proc.start()
+        wconn.close()
+        run_dct[rconn] = ( alg, proc )
+
+    win = None
+    err_lst = []
+    while win == None and run_dct != {}:
+
+        wait_time = None
+        if timeout != None:
+            wait_time = max( 0, start + timeout - time.time() )
+
+        conn_lst = wait( list( run_dct.keys() ), wait_time )
+        if conn_lst == []:
+            err_lst += [ 'Timeout after ' + str( timeout ) + ' seconds' ]
+            break
+
+        for conn in conn_lst:
+            alg, proc = run_dct.pop( conn )
+            try:
+                success, val = conn.recv()
+            except EOFError:
+                proc.join()
+                success, val = False, 'Process exited with code ' + str( proc.exitcode )
+            conn.close()
+            proc.join()
+
+            if success and win == None:
+                win = ( val, alg )
+            elif not success:
+                err_lst += [ alg + ': ' + val ]
+
+    # terminate the remaining strategies
+    for conn, ( alg, proc ) in run_dct.items():
+        proc.terminate()
+        proc.join()
+        conn.close()
+
+    if win == None:
+        raise ValueError( 'No elimination strategy succeeded:', err_lst )
+
+    R = g_lst[0].parent()
+    el_lst, alg = convert_pol( win[0], R ), win[1]
+    OrbTools.p( 'Elimination strategy', alg, 'finished first after', time.time() - start, 'seconds' )
+
+    return el_lst, alg
@@ -0,0 +1,575 @@
+'''
+Use of this source code is governed by a MIT-style license that can be found in the LICENSE file.
+Created on Oct 18, 2026
+@author: Niels Lubbes
+
+
+Implicitization by interpolation: the equations of an orbital product
+are computed as the kernel of a matrix of monomials evaluated at
+rational points of the parametrization. The main functionality of
+this module is accessed via the methods get_imp_interp() and
+get_project_interp().
+'''
+
+import random
+import itertools
+
+from orbital.class_orb_tools import OrbTools
+
+from orbital.class_orb_ring import OrbRing
+
+from orbital.poly_maps import convert_pol
+
+from orbital.cossin.cos_sin import get_pt_index
+
+from orbital.prod.orb_matrices import get_pmat
+
+from orbital.prod.orb_modular import get_crt
+from orbital.prod.orb_modular import get_rat_recon
+
+from orbital.sage_interface import sage_QQ
+from orbital.sage_interface import sage_ZZ
+from orbital.sage_interface import sage_GF
+from orbital.sage_interface import sage_next_prime
+from orbital.sage_interface import sage_lcm
+from orbital.sage_interface import sage_matrix
+from orbital.sage_interface import sage_vector
+from orbital.sage_interface import sage_var
+from orbital.sage_interface import sage_VectorSpace
+
+
+torus_cs_lst = []  # used by "get_torus_pt_lst()"
+
+
+def get_torus_pt_lst( num, seed = 0 ):
+    '''
+    Parameters
+    ----------
+    num : int
+        Number of points.
+
+    seed : int
+        Seed for the pseudo random choice of the points.
+
+    Returns
+    -------
+    list
+        A list of "num" different 4-tuples ( c0, s0, c1, s1 )
+        of rational numbers such that c0^2+s0^2=c1^2+s1^2=1.
+        The points are pairs of the different rational points
+        on the unit circle of "cos_sin.get_pt_index()", which
+        are kept in the module variable "torus_cs_lst".
+        A ValueError is raised if "num" is larger than the number
+        of such pairs.
+    '''
+    if torus_cs_lst == []:
+        cs_set = set( [] )
+        for p0, p1, p2 in get_pt_index()[1]:
+            cs = ( sage_QQ( p0 ) / p2, sage_QQ( p1 ) / p2 )
+            if cs not in cs_set:
+                cs_set.add( cs )
+                torus_cs_lst.append( cs )
+    cs_lst = torus_cs_lst
+    n = len( cs_lst )
+
+    if num > n * n:
+        raise ValueError( 'Not enough rational points on the torus:', num, n * n )
+
+    idx_lst = random.Random( seed ).sample( range( n * n ), num )
+
+    return [ cs_lst[idx // n] + cs_lst[idx % n] for idx in idx_lst ]
+
+
+def get_mon_lst( n, d ):
+    '''
+    Parameters
+    ----------
+    n : int
+        Number of variables.
+
+    d : int
+        Degree.
+
+    Returns
+    -------
+    list<tuple>
+        A list of exponent tuples of length "n" of all
+        monomials of degree "d" in "n" variables.
+    '''
+    mon_lst = []
+    for idx_tup in itertools.combinations_with_replacement( range( n ), d ):
+        exp = n * [0]
+        for idx in idx_tup:
+            exp[idx] += 1
+        mon_lst += [ tuple( exp ) ]
+    return mon_lst
+
+
+def get_interp_kernel( val_lst, mon_lst, prime = 2 ** 29, max_prime_count = 256 ):
+    '''
+    Parameters
+    ----------
+    val_lst : list<list<int>>
+        A list of points with integer coordinates.
+
+    mon_lst : list<tuple>
+        A list of exponent tuples as returned by "get_mon_lst()".
+
+    prime : int
+        The primes that are used are larger than "prime".
+
+    max_prime_count : int
+        A ValueError is raised if the kernel has not been
+        verified after this number of primes.
+
+    Returns
+    -------
+    sage_matrix
+        A matrix over QQ in reduced echelon form whose rows form a basis
+        for the coefficient vectors of the forms with monomials "mon_lst"
+        that vanish at each point in "val_lst".
+
+    Notes
+    -----
+    The kernel is computed modulo several primes and lifted with the
+    Chinese remainder theorem and rational reconstruction as in
+    "orb_modular.orb_modular_elim()". Primes for which the pivots of
+    the kernel differ from the pivots that occur for most primes are
+    unlucky and are ignored. We stop as soon as the reconstruction does
+    not change after adding a prime and is verified to be contained in
+    the kernel over QQ. Since the dimension of the kernel modulo a prime
+    is at least the dimension of the kernel over QQ, the verified
+    reconstruction is the kernel over QQ.
+    '''
+    row_lst = []
+    for val in val_lst:
+        # table of powers of each coordinate
+        d = sum( mon_lst[0] )
+        pow_lst = [ [ v ** e for e in range( d + 1 ) ] for v in val ]
+        row = []
+        for exp in mon_lst:
+            ev = 1
+            for i in range( len( exp ) ):
+                if exp[i] != 0:
+                    ev *= pow_lst[i][exp[i]]
+            row += [ev]
+        row_lst += [row]
+    mat = sage_matrix( sage_ZZ, row_lst )
+
+    crt_dct = {}  # <pivots> : [ <modulus>, <crt_dct>, <prev_dct> ]
+    count = 0
+    while count < max_prime_count:
+
+        prime = int( sage_next_prime( prime ) )
+        count += 1
+
+        ker = mat.change_ring( sage_GF( prime ) ).right_kernel_matrix( basis = 'echelon' )
+        if ker.nrows() == 0:
+            # the kernel over QQ is contained in the kernel modulo "prime"
+            return sage_matrix( sage_QQ, 0, len( mon_lst ) )
+
+        key = ( ker.nrows(), tuple( ker.pivots() ) )
+        ker_dct = dict( [ ( ij, int( cf ) ) for ij, cf in ker.dict().items() ] )
+        if key not in crt_dct:
+            crt_dct[key] = [prime, ker_dct, None]
+        else:
+            m, crt, prev = crt_dct[key]
+            for ij in set( crt.keys() ) | set( ker_dct.keys() ):
+                crt[ij] = get_crt( crt.get( ij, 0 ), m, ker_dct.get( ij, 0 ), prime )
+            crt_dct[key][0] = m * prime
+
+        # the pivots that occur for most primes
+        key = max( crt_dct.keys(), key = lambda key: crt_dct[key][0] )
+        m, crt, prev = crt_dct[key]
+
+        # rational reconstruction
+        rec = {}
+        for ij, cf in crt.items():
+            if cf != 0:
+                rec[ij] = get_rat_recon( cf, m )
+        if None in rec.values():
+            rec = None
+        crt_dct[key][2] = rec
+        if rec == None or rec != prev:
+            continue
+
+        ker = sage_matrix( sage_QQ, key[0], len( mon_lst ),
+                           dict( [ ( ij, sage_QQ( num ) / den ) for ij, ( num, den ) in rec.items() ] ) )
+        OrbTools.p( 'primes =', count, ', log2(modulus) =', m.bit_length() )
+        if ( mat * ker.transpose() ).is_zero():
+            return ker
+
+        OrbTools.p( 'Verification failed after', count, 'primes' )
+
+    raise ValueError( 'Multi-modular kernel did not stabilize after', count, 'primes' )
+
+
+def get_interp_val_lst( pmz_lst, num, seed = 0 ):
+    '''
+    Parameters
+    ----------
+    pmz_lst : list<OrbRing.R>
+        A list of polynomials in QQ[c0,s0,c1,s1].
+
+    num : int
+        Number of points.
+
+    seed : int
+
+    Returns
+    -------
+    list<list<int>>
+        A list of "num" evaluations of "pmz_lst" at rational points
+        of the torus (see "get_torus_pt_lst()"). Each evaluation
+        is a list of integers, since we clear denominators by
+        scaling the homogeneous coordinates.
+    '''
+    Rc = OrbRing.get_ring( 'c0,s0,c1,s1' )
+    pmz_lst = [ Rc( pmz ) for pmz in pmz_lst ]
+
+    val_lst = []
+    for pt in get_torus_pt_lst( num, seed ):
+        val = [ pmz( *pt ) for pmz in pmz_lst ]
+        den = sage_lcm( [ sage_QQ( v ).denominator() for v in val ] )
+        val_lst += [ [ int( v * den ) for v in val ] ]
+
+    return val_lst
+
+
+def get_interp_verify( pmz_lst, pol_lst ):
+    '''
+    Parameters
+    ----------
+    pmz_lst : list<OrbRing.R>
+        A list of polynomials in QQ[c0,s0,c1,s1].
+
+    pol_lst : list<sage_POLY>
+        A list of polynomials in len("pmz_lst") variables.
+
+    Returns
+    -------
+    bool
+        True if each polynomial in "pol_lst" composed with
+        "pmz_lst" is zero on the torus c0^2+s0^2=c1^2+s1^2=1.
+    '''
+    Rc = OrbRing.get_ring( 'c0,s0,c1,s1' )
+    c0, s0, c1, s1 = Rc.gens()
+    pmz_lst = [ Rc( pmz ) for pmz in pmz_lst ]
+    for pol in pol_lst:
+        comp = pol.parent().hom( pmz_lst, Rc )( pol )
+        if comp.reduce( [c0 * c0 + s0 * s0 - 1, c1 * c1 + s1 * s1 - 1] ) != 0:
+            return False
+    return True
+
+
+def get_interp_dim( pmz_lst, seed = 0 ):
+    '''
+    Parameters
+    ----------
+    pmz_lst : list<OrbRing.R>
+        A list of polynomials in QQ[c0,s0,c1,s1], which define
+        a map from the torus S^1xS^1 to projective space.
+
+    seed : int
+
+    Returns
+    -------
+    int
+        The dimension of the image of "pmz_lst". This is one less than
+        the rank of the vector "pmz_lst" together with its derivatives
+        along the two circles of the torus, evaluated at a point of
+        the torus (see "get_torus_pt_lst()"). We take the maximal rank
+        for several points, so that the dimension is correct with high
+        probability.
+    '''
+    Rc = OrbRing.get_ring( 'c0,s0,c1,s1' )
+    c0, s0, c1, s1 = Rc.gens()
+    pmz_lst = [ Rc( pmz ) for pmz in pmz_lst ]
+    d0_lst = [ -s0 * pmz.derivative( c0 ) + c0 * pmz.derivative( s0 ) for pmz in pmz_lst ]
+    d1_lst = [ -s1 * pmz.derivative( c1 ) + c1 * pmz.derivative( s1 ) for pmz in pmz_lst ]
+
+    rank = 0
+    for pt in get_torus_pt_lst( 3, seed ):
+        mat = sage_matrix( sage_QQ, [ [ f( *pt ) for f in f_lst ] for f_lst in [pmz_lst, d0_lst, d1_lst] ] )
+        rank = max( rank, mat.rank() )
+
+    return rank - 1
+
+
+def get_interp_deg_bound( pmz_lst ):
+    '''
+    Parameters
+    ----------
+    pmz_lst : list<OrbRing.R>
+        A list of polynomials in QQ[c0,s0,c1,s1], which define
+        a map from the torus S^1xS^1 to projective space.
+
+    Returns
+    -------
+    int
+        An upper bound for the degree of the image of "pmz_lst".
+        If the polynomials are of degree at most a in (c0,s0) and
+        of degree at most b in (c1,s1), then the map factors via
+        P^1xP^1 with forms of bidegree (2a,2b), since each circle
+        is parametrized by conics. Thus the degree of the image
+        is at most the self-intersection 8ab of this bidegree.
+    '''
+    Rc = OrbRing.get_ring( 'c0,s0,c1,s1' )
+    a, b = 1, 1
+    for pmz in pmz_lst:
+        for exp in Rc( pmz ).exponents():
+            a = max( a, exp[0] + exp[1] )
+            b = max( b, exp[2] + exp[3] )
+
+    return 8 * a * b
+
+
+def get_interp_deg_dim( gen_lst, prime = 2 ** 31 - 1 ):
+    '''
+    Parameters
+    ----------
+    gen_lst : list<sage_POLY>
+        A list of homogeneous polynomials with integral coefficients.
+
+    prime : int
+        A prime number.
+
+    Returns
+    -------
+    tuple
+        A 2-tuple of integers ( <deg>, <dim> ) with the degree and
+        dimension of the projective variety defined by "gen_lst"
+        modulo "prime". With high probability these are equal to
+        the degree and dimension over QQ.
+    '''
+    R = gen_lst[0].parent()
+    Rp = OrbRing.get_ring( ','.join( [ str( x ) for x in R.gens() ] ), sage_GF( prime ) )
+    hpol = Rp.ideal( convert_pol( gen_lst, Rp ) ).hilbert_polynomial()
+
+    dim = hpol.degree()
+    deg = hpol
+    for i in range( dim ):
+        deg = deg.diff()
+
+    return deg, dim
+
+
+def get_interp_lst( pmz_lst, x_str, max_deg, first = False, seed = 0, dim = None ):
+    '''
+    Parameters
+    ----------
+    pmz_lst : list<OrbRing.R>
+        A list of n+1 polynomials in QQ[c0,s0,c1,s1], which define
+        a map from the torus S^1xS^1 to projective n-space P^n.
+
+    x_str : string
+        A string of n+1 comma separated variable names for P^n.
+
+    max_deg : int
+        Maximal degree of the forms.
+
+    first : bool
+        If True, then we stop at the first degree that admits a
+        form that vanishes on the image.
+
+    seed : int
+
+    dim : int
+        The dimension of the image (see "get_interp_dim()") or None.
+        If not None, then we stop at the first degree d such that
+        the forms of degree at most d define a variety of dimension
+        "dim" and degree at most d (see "get_interp_deg_dim()").
+        Since these forms vanish on the image, the degree of the
+        image is then at most d as well.
+
+    Returns
+    -------
+    list<sage_POLY>
+        A list of forms in QQ[x_str] of degree at most "max_deg" that
+        generate, degree by degree, the forms that vanish on the
+        image of "pmz_lst". Forms that are multiples of forms of lower
+        degree are omitted. A ValueError is raised if the forms do not
+        vanish on the image, which may happen if the sampled points
+        are not in general position.
+
+    Notes
+    -----
+    The linear forms are computed first. For higher degrees we only
+    use monomials in the variables that are not pivots of the linear
+    forms in reduced echelon form, since each form is modulo the
+    linear forms equal to a form in these variables.
+    '''
+    Rx = OrbRing.get_ring( x_str )
+    n = len( pmz_lst )
+    x_lst = list( Rx.gens() )
+
+    val_lst = None
+    gen_lst = []
+    free_lst = list( range( n ) )  # indices of non-pivot variables
+    prv_lst = []  # basis for forms of previous degree in free variables
+    for d in range( 1, max_deg + 1 ):
+
+        mon_lst = get_mon_lst( len( free_lst ), d )
+        num = len( mon_lst ) + len( mon_lst ) // 10 + 10
+        if val_lst == None or len( val_lst ) < num:
+            val_lst = get_interp_val_lst( pmz_lst, num, seed )
+        fval_lst = [ [ val[i] for i in free_lst ] for val in val_lst[:num] ]
+
+        ker = get_interp_kernel( fval_lst, mon_lst )
+        OrbTools.p( 'degree =', d, ', monomials =', len( mon_lst ), ', kernel =', ker.nrows() )
+
+        def get_pol( row ):
+            pol = 0
+            for i in range( len( mon_lst ) ):
+                if row[i] != 0:
+                    mon = 1
+                    for j in range( len( free_lst ) ):
+                        mon *= x_lst[free_lst[j]] ** mon_lst[i][j]
+                    pol += row[i] * mon
+            return pol * pol.denominator()
+
+        ker_lst = [ get_pol( row ) for row in ker.echelon_form().rows() ]
+
+        if d == 1:
+            # the pivots of the linear forms are not used for higher degrees
+            gen_lst += ker_lst
+            piv_lst = ker.echelon_form().pivots()
+            free_lst = [ i for i in range( n ) if i not in piv_lst ]
+            prv_lst = []
+        else:
+            # omit forms that are multiples of forms of lower degree
+            mon_idx = dict( [ ( mon_lst[i], i ) for i in range( len( mon_lst ) ) ] )
+            def get_vec( pol ):
+                vec = len( mon_lst ) * [0]
+                for exp, cf in pol.dict().items():
+                    vec[mon_idx[tuple( [ exp[i] for i in free_lst ] )]] = cf
+                return sage_vector( sage_QQ, vec )
+
+            V = sage_VectorSpace( sage_QQ, len( mon_lst ) )
+            space = V.subspace( [ get_vec( x_lst[i] * prv ) for i in free_lst for prv in prv_lst ] )
+            for pol in ker_lst:
+                vec = get_vec( pol )
+                if vec not in space:
+                    gen_lst += [pol]
+                    space = V.subspace( space.basis() + [vec] )
+            prv_lst = ker_lst
+
+        if first and gen_lst != []:
+            break
+
+        if dim != None and d >= 2 and gen_lst != []:
+            deg_J, dim_J = get_interp_deg_dim( gen_lst )
+            OrbTools.p( 'degree =', d, ', (deg, dim) of forms =', ( deg_J, dim_J ) )
+            if dim_J == dim and deg_J <= d:
+                break
+
+    if not get_interp_verify( pmz_lst, gen_lst ):
+        raise ValueError( 'Interpolation failed, the sampled points are not in general position:', seed )
+
+    return gen_lst
+
+
+def get_imp_interp( omat, vmat, max_deg = None ):
+    '''
+    Parameters
+    ----------
+    omat : sage_matrix
+        A 9x9 invertible matrix with entries in QQ[c0,s0].
+
+    vmat : sage_matrix
+        A 9x9 invertible matrix with entries in QQ.
+
+    max_deg : int
+        Maximal degree of the generators. If None, then the
+        bound "get_interp_deg_bound()" for the degree of the
+        orbital product is used.
+
+    Returns
+    -------
+    list<OrbRing.R>
+        A list of elements in QQ[x0,...,x8] that generate the
+        ideal of the orbital product (see "orb_product.get_imp()").
+        The generators are computed by interpolation instead of
+        elimination. We stop at the first degree d such that
+        the generators of degree at most d define a variety of
+        the same dimension as the orbital product and of degree
+        at most d (see "get_interp_lst()"). Here we assume that
+        the ideal is generated by forms of degree at most the
+        degree of the orbital product.
+    '''
+    c1, s1 = OrbRing.coerce( 'c1,s1' )
+    pmz_lst = list( omat * vmat * sage_vector( [1, c1, s1, 0, 0, 0, 0, 0, 0] ) )
+
+    if max_deg == None:
+        max_deg = get_interp_deg_bound( pmz_lst )
+    dim = get_interp_dim( pmz_lst )
+
+    gen_lst = get_interp_lst( pmz_lst, 'x0,x1,x2,x3,x4,x5,x6,x7,x8', max_deg, dim = dim )
+
+    return [ OrbRing.R( gen ) for gen in gen_lst ]
+
+
+def get_project_interp( pmz_lst, pmat, max_deg = 32 ):
+    '''
+    Parameters
+    ----------
+    pmz_lst : list<OrbRing.R>
+        A list of 9 polynomials in QQ[c0,s0,c1,s1] (see "OrbOutput.pmz_lst").
+
+    pmat : sage_matrix
+        A 4x9 matrix defined over the rationals QQ.
+
+    max_deg : int
+        Maximal degree of the implicit equation.
+
+    Returns
+    -------
+    tuple
+        A 2-tuple of polynomials as returned by "orb_product.get_project()":
+        * a homogeneous polynomial F in QQ[x0,x1,x2,x3].
+        * F(1,x,y,z) in QQ[x,y,z] (affine polynomial)
+        The polynomial F is computed by interpolation of the
+        projection of "pmz_lst" by "pmat". As for "orb_product.get_project()",
+        a new random projection is used if the projection is not a
+        surface, and -1 is returned after 1000 tries. The polynomial
+        F is normalized such that its leading coefficient is positive
+        and its coefficients are coprime integers.
+    '''
+    tries = 0
+    projected = False
+    while not projected:
+
+        prj_lst = list( pmat * sage_vector( pmz_lst ) )
+        try:
+            gen_lst = get_interp_lst( prj_lst, 'x0,x1,x2,x3', max_deg, True, tries )
+        except ValueError as e:
+            OrbTools.p( e )
+            gen_lst = []
+
+        tries += 1
+        if len( gen_lst ) != 1 or gen_lst[0].degree() == 1 or len( gen_lst[0].variables() ) < 4:
+
+            pmat = get_pmat( True )
+
+            if tries % 100 == 0:
+                OrbTools.p( 'tries =', tries, gen_lst )
+
+            if tries >= 1000:
+                return -1
+        else:
+            projected = True
+
+    # normalize such that the leading coefficient is positive
+    # and the coefficients are coprime integers
+    fx = OrbRing.R( gen_lst[0] )
+    fx = fx / fx.lc()
+    fx = fx * fx.denominator()
+
+    x0, x1, x2, x3 = OrbRing.coerce( 'x0,x1,x2,x3' )
+    x, y, z = sage_var( 'x,y,z' )
+    fxyz = fx.subs( {x0:1, x1:x, x2:y, x3:z} )
+
+    OrbTools.p( fx, lvl = 2 )
+    OrbTools.p( fxyz, lvl = 2 )
+
+    return fx, fxyz
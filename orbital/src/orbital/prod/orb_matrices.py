@@ -4,6 +4,8 @@ Created on Aug 8, 2016
 @author: Niels Lubbes
 '''
 
+import functools
+
 from orbital.class_orb_ring import OrbRing
 
 from orbital.sage_interface import sage_matrix
@@ -76,26 +78,93 @@ def get_mat( A_str, B_str, C_str ):
              "A_str[0] == 'M' " : "A = sage_matrix(<list of a matrix>)".
           
           Similarly, we obtain matrices B and C.          
-          We return the matrix A*B*C.
+          We return the matrix A*B*C, which is immutable.
+          The matrices A, B and C are obtained with "get_mat_comp()"
+          and thus only computed once for each string.
+    '''
+
+    mat = get_mat_comp( A_str ) * get_mat_comp( B_str ) * get_mat_comp( C_str )
+    mat.set_immutable()
+
+    return mat
+
+
+def get_mat_comp( M_str ):
+    '''
+    Parameters
+    ----------
+    M_str : string
+        A string with format as "A_str" in the docs of "get_mat()".
+
+    Returns
+    -------
+    sage_matrix
+        An immutable matrix A as defined in the docs of "get_mat()".
+        The matrices for the strings 'E' and 'P1' are random and
+        computed at each call. Other matrices are cached by
+        "M_str", so that strings that are reused, for example
+        by "OrbInput.set()" in a survey, are only parsed once.
+    '''
+    if M_str in ['E', 'P1']:
+        mat = get_mat_comp_uncached( M_str )
+        mat.set_immutable()
+        return mat
+
+    return get_mat_comp_cached( M_str, OrbRing.num_field )
+
+
+@functools.lru_cache( maxsize = 1024 )
+def get_mat_comp_cached( M_str, num_field ):
+    '''
+    Parameters
+    ----------
+    M_str : string
+        See "get_mat_comp()".
+
+    num_field : sage_RING
+        The value of "OrbRing.num_field", which is part
+        of the key of the cache.
+
+    Returns
+    -------
+    sage_matrix
+        The immutable matrix "get_mat_comp_uncached( M_str )".
+        The least recently used matrices are removed from the
+        cache if it contains more than 1024 matrices.
+        Use "get_mat_comp_cached.cache_clear()" to empty the cache.
     '''
+    mat = get_mat_comp_uncached( M_str )
+    mat.set_immutable()
+    return mat
 
-    M_lst = []
-    for M_str in [A_str, B_str, C_str]:
 
-        if M_str[0] == 'O': M_lst += [get_omat( M_str )]
-        elif M_str[0] == 'T': M_lst += [get_tmat( M_str )]
-        elif M_str[0] == 'E': M_lst += [get_emat( M_str )]
-        elif M_str[0] == 'X': M_lst += [get_xmat( M_str )]
-        elif M_str == 'tT': M_lst += [get_tmat( 'tT' )]
-        elif M_str[0] == 'R': M_lst += [get_rmat( M_str )]
-        elif M_str == 'I': M_lst += [sage_identity_matrix( OrbRing.num_field, 9, 9 )]
-        elif M_str == 'P1': M_lst += [get_pmat( True )]
-        elif M_str == 'P0': M_lst += [get_pmat( False )]
-        elif M_str[0] == 'M':
-            mat_lst = OrbRing.coerce( M_str[1:] )
-            M_lst += [sage_matrix( mat_lst )]
+def get_mat_comp_uncached( M_str ):
+    '''
+    Parameters
+    ----------
+    M_str : string
+        See "get_mat_comp()".
 
-    return M_lst[0] * M_lst[1] * M_lst[2]
+    Returns
+    -------
+    sage_matrix
+        A new matrix A as defined in the docs of "get_mat()".
+        A ValueError is raised if "M_str" has an unknown format.
+    '''
+    if M_str[0] == 'O': return get_omat( M_str )
+    elif M_str[0] == 'T': return get_tmat( M_str )
+    elif M_str[0] == 'E': return get_emat( M_str )
+    elif M_str[0] == 'X': return get_xmat( M_str )
+    elif M_str == 'tT': return get_tmat( 'tT' )
+    elif M_str[0] == 'R': return get_rmat( M_str )
+    elif M_str == 'I': return sage_identity_matrix( OrbRing.num_field, 9, 9 )
+    elif M_str == 'P1': return get_pmat( True )
+    elif M_str == 'P0': return get_pmat( False )
+    elif M_str[0] == 'M':
+        mat_lst = OrbRing.coerce( M_str[1:] )
+        return sage_matrix( mat_lst )
+
+    raise ValueError( 'Incorrect matrix string: ', M_str )
 
 
 def get_tmat( t_str=None ):
@@ -124,45 +193,35 @@ def get_tmat( t_str=None ):
         Thus the translations along a circle.
     '''
 
-    t = OrbRing.coerce( '[t1,t2,t3,t4,t5,t6,t7]' )
-
-    # construct a translation matrix with undetermined
-    # translations in t1,...,t7
-    a = ( sage_QQ( 1 ) / 2 ) * sum( [ ti ** 2 for ti in t] )
-    mat = []
-    mat += [[ 1 + a ] + list( t ) + [-a]]
-    for i in range( 0, 7 ):
-        mat += [[t[i]] + sage_identity_matrix( OrbRing.R, 7 ).row( i ).list() + [-t[i]]]
-    mat += [[ a ] + list( t ) + [1 - a]]
-
     if t_str == None:
-        # return matrix with indeterminates
-        return  sage_matrix( OrbRing.R, mat )
+        # translations with indeterminates t1,...,t7
+        q = OrbRing.coerce( '[t1,t2,t3,t4,t5,t6,t7]' )
+        ring = OrbRing.R
 
     elif t_str == 'tT':
         # translations along a circle
         c0, s0 = OrbRing.coerce( 'c0,s0' )
         q = [c0, s0, 0, 0, 0, 0, 0]
+        ring = OrbRing.R
 
     else:
-        # Substitute coordinates [#,#,#,#,#,#,#]
-        # for the t0,...,t7 variables.
+        # coordinates [#,#,#,#,#,#,#]
         q = sage__eval( t_str[1:] )
         if len( q ) != 7:
             raise ValueError( 'Expect 7 translation coordinates: ', t_str )
+        ring = OrbRing.num_field
 
-    # substitute q for t
-    smat = []
-    for row in mat:
-        srow = []
-        for col in row:
-            srow += [ col.subs( {t[i]:q[i] for i in range( 7 )} )]
-        smat += [srow]
+    # construct the translation matrix directly from q,
+    # instead of substituting q into the entries of the
+    # translation matrix with indeterminates
+    a = ( sage_QQ( 1 ) / 2 ) * sum( [ qi ** 2 for qi in q] )
+    mat = []
+    mat += [[ 1 + a ] + list( q ) + [-a]]
+    for i in range( 0, 7 ):
+        mat += [[q[i]] + [ int( i == j ) for j in range( 7 ) ] + [-q[i]]]
+    mat += [[ a ] + list( q ) + [1 - a]]
 
-    if t_str == 'tT':
-        return sage_matrix( OrbRing.R, smat )
-    else:
-        return sage_matrix( OrbRing.num_field, smat )
+    return sage_matrix( ring, mat )
 
 
 def get_omat( o_str ):
@@ -236,6 +295,8 @@ def get_rmat( r_str ):
         where: 
             *-symbol is a place holder for a character in ['r','s','m','p','a']                                                                   
             %-symbol denotes an integer in [0,360]
+                     or a real number, which is approximated 
+                     by "cos_sin.get_cs_approx()".
         
     Returns
     -------
@@ -406,7 +467,7 @@ def get_xmat( r_str ):
     #
     a_lst = [r_lst[0], 0, 0, 0]
     mat1 = get_rmat( 'Rrppp' + str( a_lst ) )
-    OrbTools.p( 'mat1 =\n' + str( get_omat( 'Orppp' ) ) )
+    OrbTools.p( 'mat1 =\n', lambda: get_omat( 'Orppp' ) )
 
     # mat2
     #
@@ -416,7 +477,7 @@ def get_xmat( r_str ):
     m_tup = ( 'E' + str( eI_lst ), 'Rrppp' + str( a_lst ), 'E' + str( e_lst ) )
     mat2 = get_mat( *m_tup )
     m_tup = ( 'E' + str( eI_lst ), 'Orppp', 'E' + str( e_lst ) )
-    OrbTools.p( 'mat2 =\n' + str( get_mat( *m_tup ) ) )
+    OrbTools.p( 'mat2 =\n', lambda: get_mat( *m_tup ) )
 
     # mat3
     #
@@ -426,7 +487,7 @@ def get_xmat( r_str ):
     m_tup = ( 'E' + str( eI_lst ), 'Rprpp' + str( a_lst ), 'E' + str( e_lst ) )
     mat3 = get_mat( *m_tup )
     m_tup = ( 'E' + str( eI_lst ), 'Oprpp', 'E' + str( e_lst ) )
-    OrbTools.p( 'mat3 =\n' + str( get_mat( *m_tup ) ) )
+    OrbTools.p( 'mat3 =\n', lambda: get_mat( *m_tup ) )
 
     return mat3 * mat2 * mat1
 
@@ -0,0 +1,357 @@
+'''
+Use of this source code is governed by a MIT-style license that can be found in the LICENSE file.
+Created on Oct 18, 2026
+@author: Niels Lubbes
+
+
+Multi-modular computation of elimination ideals over QQ.
+The main functionality of this module is accessed via the method orb_modular_elim()
+'''
+
+import os
+import math
+import multiprocessing
+
+from orbital.class_orb_tools import OrbTools
+
+from orbital.poly_maps import convert_pol
+
+from orbital.prod.orb_elim import orb_elim
+
+from orbital.sage_interface import sage_GF
+from orbital.sage_interface import sage_QQ
+from orbital.sage_interface import sage_next_prime
+
+
+def get_crt( a, m, b, n ):
+    '''
+    Parameters
+    ----------
+    a : int
+    m : int
+    b : int
+    n : int
+        The moduli "m" and "n" are coprime.
+
+    Returns
+    -------
+    int
+        The integer x with 0<=x<m*n such that x=a mod m and x=b mod n.
+    '''
+    return ( a + m * ( ( ( b - a ) * pow( m, -1, n ) ) % n ) ) % ( m * n )
+
+
+def get_rat_recon( a, m ):
+    '''
+    Parameters
+    ----------
+    a : int
+
+    m : int
+        A positive integer.
+
+    Returns
+    -------
+    tuple
+        A 2-tuple of integers ( <num>, <den> ) such that
+        <num>=<den>*a mod m, <den> is positive, the numerator and
+        denominator are coprime and their absolute values
+        are at most sqrt(m/2). If no such tuple exists,
+        then None is returned.
+    '''
+    bnd = math.isqrt( m // 2 )
+    r0, r1 = m, a % m
+    s0, s1 = 0, 1
+    while r1 > bnd:
+        q = r0 // r1
+        r0, r1 = r1, r0 - q * r1
+        s0, s1 = s1, s0 - q * s1
+
+    if s1 == 0 or abs( s1 ) > bnd or math.gcd( r1, s1 ) != 1:
+        return None
+    if s1 < 0:
+        r1, s1 = -r1, -s1
+
+    return r1, s1
+
+
+def get_mod_elim( g_lst, e_lst, prime ):
+    '''
+    Parameters
+    ----------
+    g_lst : list<sage_POLY>
+        A list of generators of an ideal in a polynomial ring over QQ.
+
+    e_lst : list<sage_POLY>
+        A list of variables of this polynomial ring.
+
+    prime : int
+        A prime number.
+
+    Returns
+    -------
+    tuple
+        A 2-tuple ( <lm_key>, <dct_lst> ), where <dct_lst> is a list of
+        dictionaries that represent the reduced Groebner basis of the
+        elimination ideal over GF(prime). The keys of each dictionary
+        are exponent tuples and its values are integer coefficients
+        in the range [0,prime). The polynomials are monic and ordered by
+        leading monomial, which are given by the tuple <lm_key>.
+        If "prime" divides a denominator of a coefficient in
+        "g_lst", then None is returned.
+    '''
+    Rp = g_lst[0].parent().change_ring( sage_GF( prime ) )
+    try:
+        gp_lst = convert_pol( g_lst, Rp )
+    except ZeroDivisionError:
+        return None
+
+    el_lst = orb_elim( gp_lst, convert_pol( e_lst, Rp ), 'std' )
+    gb_lst = sorted( Rp.ideal( el_lst ).groebner_basis(), key = lambda gb: gb.lm() )
+
+    lm_key = tuple( [ tuple( gb.exponents()[0] ) for gb in gb_lst ] )
+    dct_lst = []
+    for gb in gb_lst:
+        gb = gb / gb.lc()
+        dct_lst += [ dict( [ ( tuple( exp ), int( cf ) ) for exp, cf in gb.dict().items() ] ) ]
+
+    return lm_key, dct_lst
+
+
+def get_mod_elim_lst( g_lst, e_lst, prime_lst ):
+    '''
+    Parameters
+    ----------
+    g_lst : list<sage_POLY>
+
+    e_lst : list<sage_POLY>
+
+    prime_lst : list<int>
+        A list of prime numbers.
+
+    Returns
+    -------
+    list
+        The list of outputs of "get_mod_elim( g_lst, e_lst, <prime> )" for
+        each <prime> in "prime_lst". Each output is computed in its own
+        forked child process. If a child process fails, then its output
+        is None. If the current process is daemonic (eg. a job 
+        of "orb_batch.orb_product_batch()"), then it cannot have 
+        child processes and the outputs are computed one after another.
+    '''
+    if len( prime_lst ) == 1 or multiprocessing.current_process().daemon:
+        return [ get_mod_elim( g_lst, e_lst, prime ) for prime in prime_lst ]
+
+    ctx = multiprocessing.get_context( 'fork' )
+    job_lst = []
+    for prime in prime_lst:
+        rconn, wconn = ctx.Pipe( False )
+
+        def job( prime = prime, conn = wconn ):
+            try:
+                conn.send( get_mod_elim( g_lst, e_lst, prime ) )
+            except BaseException as e:
+                OrbTools.p( 'prime =', prime, type( e ).__name__ + ': ' + str( e ) )
+                conn.send( None )
+            conn.close()
+
+        proc = ctx.Process( target = job )
+        proc.daemon = True
+        proc.start()
+        wconn.close()
+        job_lst += [( rconn, proc )]
+
+    out_lst = []
+    for conn, proc in job_lst:
+        try:
+            out_lst += [ conn.recv() ]
+        except EOFError:
+            out_lst += [ None ]
+        conn.close()
+        proc.join()
+
+    return out_lst
+
+
+def get_lift_verify( g_lst, e_lst, el_lst, gb_lst, prime ):
+    '''
+    Parameters
+    ----------
+    g_lst : list<sage_POLY>
+        A list of generators of an ideal I in a polynomial ring over QQ.
+
+    e_lst : list<sage_POLY>
+        A list of variables of this polynomial ring.
+
+    el_lst : list<sage_POLY>
+        A list of polynomials in this polynomial ring, which are
+        candidate generators of the elimination ideal E of I with
+        respect to "e_lst".
+
+    gb_lst : list<sage_POLY>
+        A Groebner basis of I.
+
+    prime : int
+        A prime number, which should not have been used for
+        the reconstruction of "el_lst".
+
+    Returns
+    -------
+    bool
+        True if the ideal J generated by "el_lst" is equal
+        to E with high probability. We verify both inclusions:
+
+            * J is contained in E, since each polynomial in "el_lst"
+              reduces to zero with respect to "gb_lst".
+
+            * E is contained in J, since "el_lst" is a Groebner basis
+              over QQ with the same leading monomials as the reduced
+              Groebner basis of the elimination ideal modulo "prime"
+              (see "get_mod_elim()"). Thus J and the modular image
+              of E have the same Hilbert function, which bounds the
+              Hilbert function of E. If J is contained in E, then J=E.
+
+        The second inclusion fails if "el_lst" misses generators of E,
+        unless "prime" is unlucky.
+    '''
+    if not all( [ el.reduce( gb_lst ) == 0 for el in el_lst ] ):
+        OrbTools.p( 'Lifted generators are not contained in the ideal' )
+        return False
+
+    out = get_mod_elim( g_lst, e_lst, prime )
+    if out == None:
+        return False
+
+    lm_key = tuple( [ tuple( el.exponents()[0] ) for el in sorted( el_lst, key = lambda el: el.lm() ) ] )
+    if out[0] != lm_key:
+        OrbTools.p( 'Leading monomials differ modulo', prime, ':', lm_key, out[0] )
+        return False
+
+    if not el_lst[0].parent().ideal( el_lst ).basis_is_groebner():
+        OrbTools.p( 'Lifted generators are not a Groebner basis' )
+        return False
+
+    return True
+
+
+def orb_modular_elim( g_lst, e_lst, prime = 2 ** 29, workers = None, max_prime_count = 256, verify = True ):
+    '''
+    Computes the elimination ideal over QQ by computing reduced Groebner
+    bases of elimination ideals modulo several primes in parallel. The
+    coefficients are lifted with the Chinese remainder theorem and
+    rational reconstruction. We stop as soon as the reconstruction does
+    not change after adding a further batch of primes.
+
+    Parameters
+    ----------
+    g_lst : list<sage_POLY>
+        A list of generators of an ideal in a polynomial ring over QQ.
+
+    e_lst : list<sage_POLY>
+        A list of variables of this polynomial ring.
+
+    prime : int
+        The primes that are used are larger than "prime".
+
+    workers : int
+        The number of primes in each batch, which are computed in
+        parallel. If None, then the number of CPUs is used.
+
+    max_prime_count : int
+        A ValueError is raised if the reconstruction has not
+        been verified after this number of primes.
+
+    verify : bool
+        If True, then we verify that the lifted generators generate the
+        elimination ideal over QQ (see "get_lift_verify()"). For this we
+        need a Groebner basis of the ideal generated by "g_lst" in the
+        order of the polynomial ring, which is typically much cheaper
+        than an elimination, and a modular elimination for a further
+        prime.
+
+    Returns
+    -------
+    list<sage_POLY>
+        A list of generators of the elimination ideal of the ideal
+        generated by "g_lst" with respect to the variables in "e_lst".
+        The generators are elements of the parent of the polynomials
+        in "g_lst" and have integer coefficients.
+
+    Notes
+    -----
+    Primes for which the leading monomials of the Groebner basis differ
+    from the leading monomials that occur for most primes are unlucky
+    and are ignored.
+    '''
+    R = g_lst[0].parent()
+    if workers == None:
+        workers = os.cpu_count() or 1
+
+    crt_dct = {}  # <lm_key> : [ <modulus>, <dct_lst>, <prev_lst> ]
+    gb_lst = None
+    count = 0
+    while count < max_prime_count:
+
+        # compute the next batch of primes in parallel
+        prime_lst = []
+        for i in range( workers ):
+            prime = int( sage_next_prime( prime ) )
+            prime_lst += [prime]
+        count += len( prime_lst )
+
+        for p, out in zip( prime_lst, get_mod_elim_lst( g_lst, e_lst, prime_lst ) ):
+            if out == None:
+                OrbTools.p( 'Skipping prime', p )
+                continue
+            lm_key, dct_lst = out
+            if lm_key not in crt_dct:
+                crt_dct[lm_key] = [p, dct_lst, None]
+                continue
+            m, crt_lst, prev_lst = crt_dct[lm_key]
+            for crt, dct in zip( crt_lst, dct_lst ):
+                for exp in set( crt.keys() ) | set( dct.keys() ):
+                    crt[exp] = get_crt( crt.get( exp, 0 ), m, dct.get( exp, 0 ), p )
+            crt_dct[lm_key][0] = m * p
+
+        # the leading monomials that occur for most primes
+        if crt_dct == {}:
+            continue
+        lm_key = max( crt_dct.keys(), key = lambda key: crt_dct[key][0] )
+        m, crt_lst, prev_lst = crt_dct[lm_key]
+
+        # rational reconstruction
+        rec_lst = []
+        for crt in crt_lst:
+            rec = {}
+            for exp, cf in crt.items():
+                if cf != 0:
+                    rec[exp] = get_rat_recon( cf, m )
+            if None in rec.values():
+                rec_lst = None
+                break
+            rec_lst += [rec]
+
+        OrbTools.p( 'primes =', count, ', log2(modulus) =', m.bit_length(), ', reconstructed =', rec_lst != None )
+        crt_dct[lm_key][2] = rec_lst
+        if rec_lst == None or rec_lst != prev_lst:
+            continue
+
+        # reconstruction stabilized
+        el_lst = []
+        for rec in rec_lst:
+            el = R( dict( [ ( exp, sage_QQ( num ) / den ) for exp, ( num, den ) in rec.items() ] ) )
+            el_lst += [ el * el.denominator() ]
+
+        if not verify:
+            return el_lst
+
+        if gb_lst == None:
+            gb_lst = R.ideal( g_lst ).groebner_basis()
+        prime = int( sage_next_prime( prime ) )
+        count += 1
+        if get_lift_verify( g_lst, e_lst, el_lst, gb_lst, prime ):
+            return el_lst
+
+        OrbTools.p( 'Verification failed after', count, 'primes' )
+
+    raise ValueError( 'Multi-modular elimination did not stabilize after', count, 'primes' )
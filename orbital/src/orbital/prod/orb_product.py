@@ -7,7 +7,16 @@ Created on Jul 8, 2016
 The main functionality of this module is accessed via the method orb_product()
 '''
 
+import os
+import math
+import random
 import warnings
+import json
+import time
+import resource
+import multiprocessing
+
+from multiprocessing.connection import wait
 
 from orbital.class_orb_tools import OrbTools
 
@@ -16,25 +25,68 @@ from orbital.prod.class_orb_output import OrbOutput
 
 from orbital.class_orb_ring import OrbRing
 
+from orbital.poly_maps import convert_pol
+
 from orbital.prod.orb_matrices import get_pmat
 
+from orbital.prod.orb_elim import orb_elim
+from orbital.prod.orb_elim import orb_elim_race
+
+from orbital.prod.orb_modular import orb_modular_elim
+
+from orbital.prod.orb_interp import get_imp_interp
+from orbital.prod.orb_interp import get_project_interp
+
+from orbital.prod.orb_cas import get_cas_pool
+from orbital.prod.orb_cas import get_cas_marker
+
 from orbital.sage_interface import sage_PolynomialRing
 from orbital.sage_interface import sage_QQ
 from orbital.sage_interface import sage_GF
 from orbital.sage_interface import sage_var
-from orbital.sage_interface import sage__eval
 from orbital.sage_interface import sage_matrix
 from orbital.sage_interface import sage_vector
 from orbital.sage_interface import sage_ideal
-from orbital.sage_interface import sage_maple
-from orbital.sage_interface import sage_magma
 from orbital.sage_interface import sage_diff
 from orbital.sage_interface import sage_gcd
+from orbital.sage_interface import sage_next_prime
 
 from linear_series.class_linear_series import LinearSeries
 from linear_series.class_poly_ring import PolyRing
 
 
+def get_imp_ideal( imp_lst ):
+    '''
+    Parameters
+    ----------
+    imp_lst : list<OrbRing.R>
+        A list of homogeneous polynomials in QQ[x0,...,x8], 
+        or in GF(p)[x0,...,x8] (see "get_imp_mod()"). 
+        
+    Returns
+    -------
+    sage_IDEAL
+        The ideal generated by "imp_lst" in the polynomial ring 
+        with only the variables x0,...,x8 and order 'degrevlex'
+        (see "OrbRing.get_ring()"). If "imp_lst" is already such
+        an ideal, then it is returned as is.
+
+    Notes
+    -----
+    Sage computes the Groebner basis of an ideal at most once, 
+    since the output of "groebner_basis()" is cached by the ideal 
+    object. Therefore the ideal is shared by "get_emb_dim()", 
+    "get_deg_dim()" and "get_project()" (see "OrbOutput.imp_ideal").
+    '''
+    if not isinstance( imp_lst, ( list, tuple ) ):
+        return imp_lst
+
+    base = imp_lst[0].parent().base_ring()
+    Rx = OrbRing.get_ring( 'x0,x1,x2,x3,x4,x5,x6,x7,x8', base )
+
+    return Rx.ideal( convert_pol( imp_lst, Rx ) )
+
+
 def get_emb_dim( imp_lst ):
     '''
     Computes the embedding dimension.
@@ -44,6 +96,8 @@ def get_emb_dim( imp_lst ):
     imp_lst : list<OrbRing.R>
         A list of homogeneous polynomials in QQ[x0,...,x8]
         representing a variety S in the projective 7-sphere S^7.
+        Alternatively, the ideal of S as returned by "get_imp_ideal()",
+        in which case the linear forms in its Groebner basis are counted.
     
     Returns
     -------
@@ -51,6 +105,9 @@ def get_emb_dim( imp_lst ):
         The minimal number n so that S is contained in S^n.
         Thus so that S is not contained in a hyperplane section of S^n.    
     '''
+    if not isinstance( imp_lst, ( list, tuple ) ):
+        imp_lst = imp_lst.groebner_basis()
+
     dim = 7
     for imp in imp_lst:
         if imp.total_degree() == 1:
@@ -65,6 +122,9 @@ def get_deg_dim( imp_lst ):
     imp_lst : list<OrbRing.R>
         A list of homogenous polynomials in QQ[x0,...,x8]
         representing a variety S in projective 8-space P^8.
+        The polynomials may also be defined over a finite
+        field GF(p) (see "get_imp_mod()"). Alternatively, 
+        the ideal of S as returned by "get_imp_ideal()".
     
     Returns
     -------
@@ -73,8 +133,7 @@ def get_deg_dim( imp_lst ):
         the degree and the dimension of the variety S.
     '''
     # consider ideal in ring of the right dimension.
-    R = sage_PolynomialRing( sage_QQ, sage_var( 'y0,y1,y2,y3,y4,y5,y6,y7,y8' ), order = 'degrevlex' )
-    I = R.ideal( sage__eval( str( imp_lst ).replace( 'x', 'y' ), R.gens_dict() ) )
+    I = get_imp_ideal( imp_lst )
 
     # compute Hilbert polynomial: (deg/dim!)*t^dim + ...
     hpol = I.hilbert_polynomial()
@@ -90,15 +149,239 @@ def get_deg_dim( imp_lst ):
     return deg, dim
 
 
-def get_project( pol_lst, pmat ):
+def get_elim( g_lst, e_lst, alg = None, stage = None, win_dct = None ):
+    '''
+    Parameters
+    ----------
+    g_lst : list<sage_POLY>
+        A list of generators of an ideal in a polynomial ring.
+
+    e_lst : list<sage_POLY>
+        A list of variables of this polynomial ring.
+
+    alg : object
+        If None, then Sage's "elimination_ideal()" is used.
+        If a string, then it is a key of "orb_elim.get_elim_alg_dct()".
+        If a list of such keys, then these strategies are raced 
+        against each other (see "orb_elim.orb_elim_race()").
+        If 'modular', then the elimination ideal is lifted from 
+        elimination ideals over finite fields 
+        (see "orb_modular.orb_modular_elim()").
+
+    stage : string
+        A key of "OrbInput.do".
+
+    win_dct : dict
+        If not None, then "win_dct[stage]" is set to the
+        strategy that was used for the elimination.
+
+    Returns
+    -------
+    list<sage_POLY>
+        Generators of the elimination ideal, in the same ring 
+        as the polynomials in "g_lst".
+    '''
+    if alg == None:
+        alg = 'eliminate'
+
+    if isinstance( alg, ( list, tuple ) ):
+        el_lst, alg = orb_elim_race( g_lst, e_lst, alg )
+    elif alg == 'modular':
+        el_lst = orb_modular_elim( g_lst, e_lst )
+    else:
+        el_lst = orb_elim( g_lst, e_lst, alg )
+
+    if win_dct != None:
+        win_dct[stage] = alg
+
+    return el_lst
+
+
+def get_project_gen_lst( gb_lst, pmat ):
+    '''
+    Parameters
+    ----------
+    gb_lst : list<sage_POLY>
+        A list of polynomials in x0,...,x8 (see "get_imp_ideal()").
+
+    pmat : sage_matrix    
+        A 4x9 matrix of rank 4.    
+
+    Returns
+    -------
+    tuple
+        A 2-tuple ( <g_lst>, <e_lst> ) where eliminating the variables 
+        in <e_lst> from the ideal generated by <g_lst> results in the
+        ideal of the image of the projection defined by "pmat", in 
+        the variables x0,x1,x2,x3. Here <g_lst> is "gb_lst" after 
+        a linear coordinate change x |-> A^{-1}*x, where A is 
+        the 9x9 matrix obtained by appending unit rows to "pmat".
+        Thus we eliminate 5 variables instead of adding 9 variables
+        for the linear equations of the projection.
+    '''
+    Rx = gb_lst[0].parent()
+    x = Rx.gens()
+
+    # append unit rows for the non-pivot columns so that A is invertible
+    pmat = sage_matrix( Rx.base_ring(), list( pmat ) )
+    piv_lst = pmat.pivots()
+    A = sage_matrix( list( pmat ) + [ [ int( i == j ) for j in range( 9 )] for i in range( 9 ) if i not in piv_lst ] )
+    hom = Rx.hom( list( A.inverse() * sage_vector( x ) ), Rx )
+
+    return [ hom( gb ) for gb in gb_lst ], list( x[4:] )
+
+
+def get_project_mod( pol_lst, pmat, prime = 32003 ):
+    '''
+    Parameters
+    ----------
+    pol_lst : list<OrbRing.R> 
+        A list of homogeneous polynomials in QQ[x0,...,x8],
+        or an ideal as returned by "get_imp_ideal()".
+    
+    pmat : sage_matrix    
+        A 4x9 matrix defined over the rationals QQ.    
+
+    prime : int
+        A prime number.
+
+    Returns
+    -------
+    bool
+        True if the image of the projection defined by "pmat" is 
+        over the finite field GF(p) defined by a single polynomial 
+        in 4 variables, where p is the smallest prime >= "prime" that 
+        does not divide a denominator of "pol_lst" or "pmat". 
+        For almost all primes this is the case if and only if 
+        it is the case over QQ (see "get_project()"). 
+    '''
+    gb_lst = list( get_imp_ideal( pol_lst ).groebner_basis() )
+    while True:
+        try:
+            Rx = OrbRing.get_ring( 'x0,x1,x2,x3,x4,x5,x6,x7,x8', sage_GF( prime ) )
+            g_lst, e_lst = get_project_gen_lst( convert_pol( gb_lst, Rx ), pmat )
+            break
+        except ZeroDivisionError:
+            prime = sage_next_prime( prime )
+
+    p_lst = orb_elim( g_lst, e_lst, 'std' )
+
+    return len( p_lst ) == 1 and len( p_lst[0].variables() ) == 4
+
+
+def get_project_screen( pol_lst, pmat, max_tries = 1000, workers = None ):
+    '''
+    Parameters
+    ----------
+    pol_lst : list<OrbRing.R> 
+        A list of homogeneous polynomials in QQ[x0,...,x8],
+        or an ideal as returned by "get_imp_ideal()".
+    
+    pmat : sage_matrix    
+        A 4x9 matrix defined over the rationals QQ.    
+
+    max_tries : int
+        Maximal number of projection matrices that are screened.
+
+    workers : int
+        Number of random projection matrices that are screened 
+        in parallel in forked child processes. 
+        If None, then the number of CPUs is used.
+
+    Returns
+    -------
+    tuple
+        A 2-tuple ( <pmat>, <tries> ) where <pmat> is either "pmat" or 
+        a random projection matrix (see "orb_matrices.get_pmat()") 
+        for which "get_project_mod()" is True, and <tries> is the 
+        number of matrices that were screened. The first random matrix 
+        that passes the screening is returned and the screening of the 
+        other matrices is aborted. If no matrix passed the screening 
+        after "max_tries" tries, then <pmat> is None.
+    '''
+    if get_project_mod( pol_lst, pmat ):
+        return pmat, 1
+
+    if workers == None:
+        workers = os.cpu_count() or 1
+
+    ctx = multiprocessing.get_context( 'fork' )
+    tries = 1
+    while tries < max_tries:
+
+        pmat_lst = [ get_pmat( True ) for i in range( min( workers, max_tries - tries ) ) ]
+        tries += len( pmat_lst )
+
+        # a daemonic process, such as a job of "orb_batch.orb_product_batch()", 
+        # cannot have child processes 
+        if multiprocessing.current_process().daemon:
+            for cand in pmat_lst:
+                if get_project_mod( pol_lst, cand ):
+                    return cand, tries
+            continue
+
+        run_dct = {}  # <read connection> : ( <pmat>, <process> )
+        for cand in pmat_lst:
+            rconn, wconn = ctx.Pipe( False )
+
+            def job( cand = cand, conn = wconn ):
+                try:
+                    conn.send( get_project_mod( pol_lst, cand ) )
+                except BaseException:
+                    conn.send( False )
+                conn.close()
+
+            proc = ctx.Process( target = job )
+            proc.daemon = True
+            proc.start()
+            wconn.close()
+            run_dct[rconn] = ( cand, proc )
+
+        win = None
+        while win == None and run_dct != {}:
+            for conn in wait( list( run_dct.keys() ) ):
+                cand, proc = run_dct.pop( conn )
+                try:
+                    passed = conn.recv()
+                except EOFError:
+                    passed = False
+                conn.close()
+                proc.join()
+                if passed and win == None:
+                    win = cand
+
+        for conn, ( cand, proc ) in run_dct.items():
+            proc.terminate()
+            proc.join()
+            conn.close()
+
+        if win != None:
+            return win, tries
+
+        if tries % 100 < workers:
+            OrbTools.p( 'tries =', tries )
+
+    return None, tries
+
+
+def get_project( pol_lst, pmat, alg = None, win_dct = None ):
     '''
     Parameters
     ----------
     pol_lst : list<OrbRing.R> 
-        A list of homogeneous polynomials in QQ[x0,...,x8].
+        A list of homogeneous polynomials in QQ[x0,...,x8],
+        or an ideal as returned by "get_imp_ideal()" so that its
+        Groebner basis is reused.
     
     pmat : sage_matrix    
         A matrix defined over the rationals QQ.    
+
+    alg : object
+        Elimination strategy (see "get_elim()").
+
+    win_dct : dict
+        If not None, then "win_dct['prj']" is set to the 
+        elimination strategy that was used (see "get_elim()").
     
     Returns
     -------
@@ -108,27 +391,26 @@ def get_project( pol_lst, pmat ):
         * F(1,x,y,z) in QQ[x,y,z] (affine polynomial)
     '''
 
-    Ry = sage_PolynomialRing( sage_GF( 2 ), sage_var( 'y0,y1,y2,y3,y4,y5,y6,y7,y8' ), order = 'degrevlex' )
-    v = OrbRing.coerce( '[v0,v1,v2,v3,v4,v5,v6,v7,v8]' )
-    x = OrbRing.coerce( '[x0,x1,x2,x3,x4,x5,x6,x7,x8]' )
-    vx_dct = {v[i]:x[i] for i in range( 9 )}
-
-    OrbTools.p( "\n" + str( pmat ) )
+    # Groebner basis in the ring with only the variables x0,...,x8
+    imp_ideal = get_imp_ideal( pol_lst )
+    gb_lst = list( imp_ideal.groebner_basis() )
 
     tries = 0
     projected = False
     while not projected:
 
-        # obtain the linear equations of the projection map
-        pmat = sage_matrix( OrbRing.R, list( pmat ) )
-        leq_lst = list( pmat * sage_vector( x ) )
-
-        # compute the image of this projection map
-        proj_lst = [ v[i] - leq_lst[i] for i in range( len( leq_lst ) ) ]
-        p_lst = sage_ideal( pol_lst + proj_lst ).elimination_ideal( x ).gens()
-
-        # obtain a polynomial in x0,...,x8
-        p_lst = [p.subs( vx_dct ) for p in p_lst]
+        # reject degenerate projections over a finite field before
+        # the elimination over QQ
+        pmat, screened = get_project_screen( imp_ideal, pmat, 1000 - tries )
+        tries += screened - 1
+        if pmat == None:
+            return -1
+        OrbTools.p( "\n", pmat )
+
+        # compute the image of this projection map in x0,x1,x2,x3
+        g_lst, e_lst = get_project_gen_lst( gb_lst, pmat )
+        p_lst = get_elim( g_lst, e_lst, alg, 'prj', win_dct )
+        p_lst = [ OrbRing.R( p ) for p in p_lst ]
         fx = p_lst[0]
 
         tries += 1
@@ -139,25 +421,92 @@ def get_project( pol_lst, pmat ):
             if tries % 100 == 0:
                 OrbTools.p( 'tries =', tries, p_lst )
 
-            if tries == 1000:
+            if tries >= 1000:
                 return -1
         else:
             projected = True
 
-    w0, w1, w2, w3 = fx.variables()
-    fx = fx.subs( {w0:x[0], w1:x[1], w2:x[2], w3:x[3]} )
+    # normalize such that the leading coefficient is positive
+    # and the coefficients are coprime integers
+    fx = fx / fx.lc()
+    fx = fx * fx.denominator()
 
     x0, x1, x2, x3 = OrbRing.coerce( 'x0,x1,x2,x3' )
     x, y, z = sage_var( 'x,y,z' )
     fxyz = fx.subs( {x0:1, x1:x, x2:y, x3:z} )
 
-    OrbTools.p( fx )
-    OrbTools.p( fxyz )
+    OrbTools.p( fx, lvl = 2 )
+    OrbTools.p( fxyz, lvl = 2 )
 
     return fx, fxyz
 
 
-def get_factor_lst( pol ):
+def get_factor_parse( out ):
+    '''
+    Parameters
+    ----------
+    out : string
+        The output of the Maple command "lprint(evala(AFactors(<pol>)));".
+
+    Returns
+    -------
+    list
+        A list of factors [ (<factor>,<multiplicity>),... ]
+        as returned by "get_factor_lst()".
+    '''
+    if out.startswith( 'Error' ):
+        OrbTools.p( out )
+        return []
+
+    fct_lst = out.split( ',' )
+
+    OrbTools.p( fct_lst, lvl = 2 )
+
+    cf = fct_lst[0].replace( '[', '' ).replace( ']', '' ).strip()
+    new_lst = []
+    for i in range( 1, len( fct_lst ), 2 ):
+        fact = fct_lst[i].replace( '[', '' ).replace( ']', '' ).strip()
+        mult = fct_lst[i + 1].replace( '[', '' ).replace( ']', '' ).strip()
+        new_lst += [( fact, mult )]
+
+    OrbTools.p( cf )
+    OrbTools.p( len( new_lst ), new_lst, lvl = 2 )
+
+    return new_lst
+
+
+def get_factor_lst_lst( pol_lst, timeout = None ):
+    '''
+    The polynomials are factored in batches by the 
+    sessions of "orb_cas.get_cas_pool( 'maple' )".
+    
+    Parameters
+    ----------
+    pol_lst : list<OrbRing.R>  
+        A list of polynomials.
+        
+    timeout : float
+        Timeout in seconds for each batch.
+    
+    Returns
+    -------
+    list
+        A list of outputs of "get_factor_lst()" for each 
+        polynomial in "pol_lst". If Maple is not accessible 
+        or the timeout passed, then each output is the 
+        empty-list [].
+    '''
+    cmd_lst = [ 'lprint(evala(AFactors(' + str( pol ) + ')));' for pol in pol_lst ]
+    try:
+        out_lst = get_cas_pool( 'maple' ).eval_lst( cmd_lst, timeout )
+    except Exception as e:
+        OrbTools.p( type( e ).__name__ + ': ' + str( e ) )
+        return [ [] for pol in pol_lst ]
+
+    return [ get_factor_parse( out ) for out in out_lst ]
+
+
+def get_factor_lst( pol, timeout = None ):
     '''
     The method requires that the maple-command 
     is in "os.environ['PATH']".
@@ -167,6 +516,9 @@ def get_factor_lst( pol ):
     ----------
     pol : OrbRing.R  
         A polynomial.
+        
+    timeout : float
+        Timeout in seconds.
     
     Returns
     -------
@@ -176,30 +528,65 @@ def get_factor_lst( pol ):
         If Maple is not accessible, then
         returns the empty-list [] 
     '''
-    try:
-        sage_maple.eval( 'fct := evala(AFactors(' + str( pol ) + '));' )
-    except:
-        return []
+    return get_factor_lst_lst( [pol], timeout )[0]
 
-    fct_lst = sage_maple.eval( 'lprint(fct);' )
-    fct_lst = str( fct_lst ).split( ',' )
 
-    OrbTools.p( fct_lst )
+def get_genus_lst( pol_lst, plane = 'x1+2*x2+17*x3+11*x0', timeout = None ):
+    '''
+    The genera are computed in batches by the sessions 
+    of "orb_cas.get_cas_pool( 'maple' )".
+    
+    Parameters
+    ----------
+    pol_lst : list<OrbRing.R>
+        A list of polynomials in QQ[x0,x1,x2,x3].
+    
+    plane : string 
+        A String of a linear polynomial in QQ[x0,x1,x2,x3].
+        
+    timeout : float
+        Timeout in seconds for each batch.
+        
+    Returns
+    -------
+    list<int>
+        A list of outputs of "get_genus()" for each 
+        polynomial in "pol_lst". 
+    '''
+    # obtain an equation for the curve defined
+    # intersecting a plane with the zero-set of pol.
+    plane = OrbRing.coerce( plane )
+    x3 = OrbRing.coerce( 'x3' )
+    cmd_lst = []
+    for pol in pol_lst:
+        OrbTools.p( pol )
+        K = sage_ideal( pol, plane ).groebner_basis()
+        P = K[0]
+        if P.total_degree() <= 1:
+            P = K[1]
+        P = P.subs( {x3:1} )
+        cmd_lst += [ 'lprint(algcurves[genus](' + str( P ) + ',x1,x2));' ]
+
+    # compute geometric genus with Maple.
+    try:
+        out_lst = get_cas_pool( 'maple' ).eval_lst( cmd_lst, timeout )
+    except Exception as e:
+        OrbTools.p( type( e ).__name__ + ': ' + str( e ) )
+        return len( pol_lst ) * [-3]
 
-    cf = fct_lst[0].replace( '[', '' ).replace( ']', '' ).strip()
-    new_lst = []
-    for i in range( 1, len( fct_lst ), 2 ):
-        fact = fct_lst[i].replace( '[', '' ).replace( ']', '' ).strip()
-        mult = fct_lst[i + 1].replace( '[', '' ).replace( ']', '' ).strip()
-        new_lst += [( fact, mult )]
+    OrbTools.p( out_lst, lvl = 2 )
 
-    OrbTools.p( cf )
-    OrbTools.p( len( new_lst ), new_lst )
+    gen_lst = []
+    for gen in out_lst:
+        try:
+            gen_lst += [ int( gen ) ]
+        except ValueError:
+            gen_lst += [-2]
 
-    return new_lst
+    return gen_lst
 
 
-def get_genus( pol, plane = 'x1+2*x2+17*x3+11*x0' ):
+def get_genus( pol, plane = 'x1+2*x2+17*x3+11*x0', timeout = None ):
     '''
     The method requires that the maple-command 
     is in "os.environ['PATH']". 
@@ -213,6 +600,9 @@ def get_genus( pol, plane = 'x1+2*x2+17*x3+11*x0' ):
     plane : string 
         A String of a linear polynomial in QQ[x0,x1,x2,x3].
         
+    timeout : float
+        Timeout in seconds.
+        
     Returns
     -------
     int
@@ -223,35 +613,10 @@ def get_genus( pol, plane = 'x1+2*x2+17*x3+11*x0' ):
         then -2 is returned. 
         If Maple is not installed then -3 is returned.
     '''
-    OrbTools.p( pol )
-
-    # obtain an equation for the curve defined
-    # intersecting a plane with the zero-set of pol.
-    plane = OrbRing.coerce( plane )
-    K = sage_ideal( pol, plane ).groebner_basis()
-    P = K[0]
-    if P.total_degree() <= 1:
-        P = K[1]
-    P = P.subs( {OrbRing.coerce( 'x3' ):1} )
-
-    # compute geometric genus with Maple.
-    try:
-        sage_maple.eval( 'with(algcurves);' )
-    except:
-        return -3
-
-    sage_maple.eval( 'P := ' + str( P ) + ';' )
-    gen = sage_maple.eval( 'genus(P,x1,x2);' )
-
-    OrbTools.p( gen )
-
-    try:
-        return int( gen )
-    except ValueError:
-        return -2
+    return get_genus_lst( [pol], plane, timeout )[0]
 
 
-def get_sing_lst( pol, probable = True ):
+def get_sing_lst( pol, probable = True, timeout = None ):
     '''
     The method requires that the magma-command 
     is in "os.environ['PATH']".    
@@ -266,6 +631,9 @@ def get_sing_lst( pol, probable = True ):
         If True, performs a non-deterministic version of a 
         radical decomposition algorithm, which is faster.
         The correctness of output is not guaranteed in this case.
+        
+    timeout : float
+        Timeout in seconds.        
     
     Returns
     -------
@@ -277,11 +645,19 @@ def get_sing_lst( pol, probable = True ):
         and <H> is the Hilbert polynomial of this ideal.
         If Magma is not accessible, then the empty-list [] is returned.
         
+    Notes
+    -----
+    The components are computed by a single script, which is
+    evaluated by a session of "orb_cas.get_cas_pool( 'magma' )".
+    The bases of the components are separated by markers
+    (see "orb_cas.get_cas_marker()").
     '''
     x0, x1, x2, x3 = OrbRing.coerce( 'x0,x1,x2,x3' )
     df_str = str( [sage_diff( pol, x0 ), sage_diff( pol, x1 ), sage_diff( pol, x2 ), sage_diff( pol, x3 )] )[1:-1]
 
-    OrbTools.p( df_str )
+    OrbTools.p( df_str, lvl = 2 )
+
+    marker, marker_cmd = get_cas_marker( 'magma' )
 
     mi = ''
     mi += 'P<x0,x1,x2,x3> := PolynomialRing(RationalField(), 4);\n'
@@ -291,29 +667,122 @@ def get_sing_lst( pol, probable = True ):
         mi += 'MD := ProbableRadicalDecomposition( MI );\n'
     else:
         mi += 'MD := RadicalDecomposition( MI );\n'
-    mi += '#MD;\n'
+    mi += 'for i in [1..#MD] do print Basis(MD[i]); ' + marker_cmd + ' end for;\n'
 
     try:
-        mo1 = int( sage_magma.eval( mi ) )
-    except:
+        comp_lst = get_cas_pool( 'magma' ).eval( mi, timeout ).split( marker )[:-1]
+    except Exception as e:
+        OrbTools.p( type( e ).__name__ + ': ' + str( e ) )
         return []
 
     sing_lst = []
-    Ry = sage_PolynomialRing( OrbRing.num_field, sage_var( 'y0,y1,y2,y3' ), order = 'degrevlex' )
-    for idx in range( mo1 ):
+    Ry = OrbRing.get_ring( 'y0,y1,y2,y3' )
+    for idx in range( len( comp_lst ) ):
 
-        comp = str( sage_magma.eval( 'Basis(MD[' + str( idx + 1 ) + ']);\n' ) )
-        comp = comp.replace( '\n', '' )
+        comp = comp_lst[idx].strip().replace( '\n', '' )
 
         # compute hilbert polynomial of component in singular locus
-        compy = sage__eval( comp.replace( 'x', 'y' ), Ry.gens_dict() )
+        compy = convert_pol( comp.replace( 'x', 'y' ), Ry )
         idy = Ry.ideal( compy )
         hpol = idy.hilbert_polynomial()
 
         sing_lst += [( comp, hpol )]
         OrbTools.p( idx, sing_lst[-1] )
 
-    OrbTools.p( sing_lst )
+    OrbTools.p( sing_lst, lvl = 2 )
+
+    return sing_lst
+
+
+def get_hilbert_lst( comp_lst ):
+    '''
+    Parameters
+    ----------
+    comp_lst : list<sage_IDEAL>
+        A list of homogeneous ideals.
+    
+    Returns
+    -------
+    list
+        A list of the Hilbert polynomials in QQ[t] of the
+        ideals in "comp_lst". Each Hilbert polynomial is 
+        computed in its own forked child process. If the current 
+        process is daemonic (eg. a job of "orb_batch.orb_product_batch()"), 
+        then it cannot have child processes and the Hilbert 
+        polynomials are computed one after another.
+    '''
+    if len( comp_lst ) <= 1 or multiprocessing.current_process().daemon:
+        return [ comp.hilbert_polynomial() for comp in comp_lst ]
+
+    ctx = multiprocessing.get_context( 'fork' )
+    job_lst = []
+    for comp in comp_lst:
+        rconn, wconn = ctx.Pipe( False )
+
+        def job( comp = comp, conn = wconn ):
+            try:
+                conn.send( str( comp.hilbert_polynomial() ) )
+            except BaseException as e:
+                conn.send( type( e ).__name__ + ': ' + str( e ) )
+            conn.close()
+
+        proc = ctx.Process( target = job )
+        proc.daemon = True
+        proc.start()
+        wconn.close()
+        job_lst += [( rconn, proc )]
+
+    Rt = sage_PolynomialRing( sage_QQ, 't' )
+    hpol_lst = []
+    for comp, ( conn, proc ) in zip( comp_lst, job_lst ):
+        try:
+            hpol_lst += [ Rt( conn.recv() ) ]
+        except BaseException as e:
+            # compute in this process if the child process failed
+            OrbTools.p( type( e ).__name__ + ': ' + str( e ) )
+            hpol_lst += [ comp.hilbert_polynomial() ]
+        conn.close()
+        proc.join()
+
+    return hpol_lst
+
+
+def get_sing_lst_singular( pol ):
+    '''
+    In-process alternative for "get_sing_lst()" using Singular
+    via Sage, which does not require Magma.
+    
+    Parameters
+    ----------
+    pol : OrbRing.R       
+        A homogeneous polynomial in QQ[x0,x1,x2,x3].
+    
+    Returns
+    -------
+    list
+        A list [ (<I>, <H>), ... ] as returned by "get_sing_lst()".
+        The components <I> are the minimal associated primes of 
+        the ideal of partial derivatives of "pol", which are computed 
+        with Singular's "minAssGTZ". Each <I> is the string of 
+        the reduced Groebner basis of the component in the format 
+        of Magma, and its Hilbert polynomial <H> is computed 
+        in parallel (see "get_hilbert_lst()").
+    '''
+    Rx = OrbRing.get_ring( 'x0,x1,x2,x3' )
+    pol = Rx( pol )
+    df_ideal = Rx.ideal( [ pol.derivative( x ) for x in Rx.gens() ] )
+
+    comp_lst = df_ideal.minimal_associated_primes( algorithm = 'gtz' )
+    hpol_lst = get_hilbert_lst( comp_lst )
+
+    sing_lst = []
+    for comp, hpol in zip( comp_lst, hpol_lst ):
+        # leading monomials in decreasing lexicographic order as Magma
+        gb_lst = sorted( comp.groebner_basis(), key = lambda gb: tuple( gb.lm().exponents()[0] ), reverse = True )
+        sing_lst += [( '[' + ','.join( [ str( gb ) for gb in gb_lst ] ) + ']', hpol )]
+        OrbTools.p( len( sing_lst ) - 1, sing_lst[-1] )
+
+    OrbTools.p( sing_lst, lvl = 2 )
 
     return sing_lst
 
@@ -359,8 +828,19 @@ def get_pmz( pmat, omat, vmat ):
     B = { x | -x0^2+x1^2+x2^2==0 } and S^7 = { x | -x0^2+x1^2+...+x8^2==0 }.             
     '''
     c1, s1 = OrbRing.coerce( 'c1,s1' )
+
+    # compute in a ring with only the variables that occur
+    Rc = OrbRing.get_var_ring( omat.list() + vmat.list() + [c1, s1] )
+    omat = omat.change_ring( Rc )
+    vmat = vmat.change_ring( Rc )
+    pmat = pmat.change_ring( Rc )
+    c1, s1 = Rc( c1 ), Rc( s1 )
+
     pmz_lst = list( omat * vmat * sage_vector( [1, c1, s1, 0, 0, 0, 0, 0, 0] ) )
-    prj_pmz_lst = list( pmat * omat * vmat * sage_vector( [1, c1, s1, 0, 0, 0, 0, 0, 0] ) )
+    prj_pmz_lst = list( pmat * sage_vector( pmz_lst ) )
+
+    pmz_lst = [ OrbRing.R( pmz ) for pmz in pmz_lst ]
+    prj_pmz_lst = [ OrbRing.R( pmz ) for pmz in prj_pmz_lst ]
 
     return pmz_lst, prj_pmz_lst
 
@@ -409,7 +889,7 @@ def get_orb_bp_tree( pmz_lst ):
     gcd1 = sage_gcd( ps_lst )
     ps_lst = [ OrbRing.coerce( ps / gcd1 ) for ps in ps_lst ]
     OrbTools.p( 'gcd =', gcd1 )
-    OrbTools.p( 'ps_lst =', ps_lst )
+    OrbTools.p( 'ps_lst =', ps_lst, lvl = 2 )
 
     # Verify whether "ps_lst" represents a map P^1xP^1--->S^n
     # where "n==len(ps_lst)".
@@ -434,36 +914,35 @@ def get_orb_bp_tree( pmz_lst ):
     #
     ls = LinearSeries( xyvw_lst, PolyRing( 'x,y,v,w', True ) )
     bp_tree = ls.get_bp_tree()
-    OrbTools.p( ls )
-    OrbTools.p( bp_tree )
+    OrbTools.p( ls, lvl = 2 )
+    OrbTools.p( bp_tree, lvl = 2 )
 
     return bp_tree
 
 
-def get_imp( omat, vmat ):
+def get_imp_gen_lst( omat, vmat, base = None ):
     '''
     Parameters
     ----------
     omat : sage_matrix 
         A 9x9 invertible matrix with entries in QQ[c0,s0]. 
-        This matrix represents a projective curve 
-        in the automorphism group of the projective 7-sphere.
-        Thus "omat" represents a 1-parameter subgroup in Aut(S^7).
                     
     vmat : sage_matrix  
         A 9x9 invertible matrix with entries in QQ. 
-        This matrix represents an element in Aut(S^7),
-        which transforms a standard circle.    
+
+    base : sage_RING
+        Base ring of the generators. If None, then "OrbRing.num_field" 
+        is used.
 
     Returns
     -------
-    list<OrbRing.R>
-        A list of elements in QQ[x0,...,x8].
-        This list represent the generators of the ideal corresponding to 
-        the variety, which is obtained by applying a 1-parameter subgroup to
-        a circle C. Here C is the "vmat"-transform of 
-        the standard circle B in S^7 where        
-        B = { x | -x0^2+x1^2+x2^2==0 } and S^7 = { x | -x0^2+x1^2+...+x8^2==0 }.   
+    tuple
+        A 2-tuple ( <g_lst>, <e_lst> ) where <g_lst> is a list of 
+        generators of an ideal such that eliminating the variables 
+        in the list <e_lst> results in the ideal of the orbital 
+        product (see "get_imp()"). The generators are defined in 
+        a polynomial ring over "base" with only the variables 
+        that occur in the generators (see "OrbRing.get_var_ring()").
     '''
 
     # declare list of coordinate variables
@@ -487,18 +966,211 @@ def get_imp( omat, vmat ):
     g_lst += OrbRing.coerce( '[-x0^2+x1^2+x2^2+x3^2+x4^2+x5^2+x6^2+x7^2+x8^2]' )
     g_lst += OrbRing.coerce( '[s0^2+c0^2-1]' )
 
+    # only the variables that occur in the generators
+    Rg = OrbRing.get_var_ring( g_lst + v_lst + c_lst, base )
+
+    return [ Rg( g ) for g in g_lst ], [ Rg( e ) for e in v_lst + c_lst ]
+
+
+def get_imp( omat, vmat, alg = None, win_dct = None ):
+    '''
+    Parameters
+    ----------
+    omat : sage_matrix 
+        A 9x9 invertible matrix with entries in QQ[c0,s0]. 
+        This matrix represents a projective curve 
+        in the automorphism group of the projective 7-sphere.
+        Thus "omat" represents a 1-parameter subgroup in Aut(S^7).
+                    
+    vmat : sage_matrix  
+        A 9x9 invertible matrix with entries in QQ. 
+        This matrix represents an element in Aut(S^7),
+        which transforms a standard circle.    
+
+    alg : object
+        Elimination strategy (see "get_elim()"). If 'interp', then
+        the generators are computed by interpolation
+        (see "orb_interp.get_imp_interp()").
+
+    win_dct : dict
+        If not None, then "win_dct['imp']" is set to the 
+        elimination strategy that was used (see "get_elim()").
+
+    Returns
+    -------
+    list<OrbRing.R>
+        A list of elements in QQ[x0,...,x8].
+        This list represent the generators of the ideal corresponding to 
+        the variety, which is obtained by applying a 1-parameter subgroup to
+        a circle C. Here C is the "vmat"-transform of 
+        the standard circle B in S^7 where        
+        B = { x | -x0^2+x1^2+x2^2==0 } and S^7 = { x | -x0^2+x1^2+...+x8^2==0 }.   
+    '''
+    if alg == 'interp':
+        if win_dct != None:
+            win_dct['imp'] = alg
+        return get_imp_interp( omat, vmat )
+
+    g_lst, e_lst = get_imp_gen_lst( omat, vmat )
+
     # compute the resulting variety by elimination
-    g_ideal = OrbRing.R.ideal( g_lst )
-    imp_lst = list( g_ideal.elimination_ideal( v_lst + c_lst ).gens() )
+    imp_lst = [ OrbRing.R( imp ) for imp in get_elim( g_lst, e_lst, alg, 'imp', win_dct ) ]
+
+    return imp_lst
+
+
+def get_imp_mod( omat, vmat, prime = 32003 ):
+    '''
+    Parameters
+    ----------
+    omat : sage_matrix 
+        A 9x9 invertible matrix with entries in QQ[c0,s0]. 
+                    
+    vmat : sage_matrix  
+        A 9x9 invertible matrix with entries in QQ. 
+
+    prime : int
+        A prime number.
+
+    Returns
+    -------
+    list
+        A list of polynomials in GF(p)[x0,...,x8], which is the 
+        output of "get_imp()" computed over the finite field GF(p)
+        instead of QQ. Here p is the smallest prime >= "prime" that 
+        does not divide a denominator of the generators of the ideal.
+        For almost all primes the degree, dimension and embedding 
+        dimension of the modular variety are equal to the rational
+        ones, and the elimination is much faster.
+    '''
+    while True:
+        try:
+            g_lst, e_lst = get_imp_gen_lst( omat, vmat, sage_GF( prime ) )
+            break
+        except ZeroDivisionError:
+            prime = sage_next_prime( prime )
+
+    g_ideal = g_lst[0].parent().ideal( g_lst )
+    imp_lst = list( g_ideal.elimination_ideal( e_lst ).gens() )
+
+    OrbTools.p( 'prime =', prime, ', imp_lst =', imp_lst, lvl = 2 )
 
     return imp_lst
 
 
-def get_pmz_verify( o ):
+def get_mod_dde( omat, vmat ):
+    '''
+    Parameters
+    ----------
+    omat : sage_matrix 
+        A 9x9 invertible matrix with entries in QQ[c0,s0]. 
+                    
+    vmat : sage_matrix  
+        A 9x9 invertible matrix with entries in QQ. 
+    
+    Returns
+    -------
+    tuple
+        A 3-tuple of integers ( <deg>, <emb>, <dim> ), which 
+        is a prediction for the degree, embedding dimension and 
+        dimension of the orbital product (see "get_imp_mod()").
+    '''
+    imp_lst = get_imp_mod( omat, vmat )
+    deg, dim = get_deg_dim( imp_lst )
+    emb = get_emb_dim( imp_lst )
+
+    return deg, emb, dim
+
+
+def get_pmz_verify_mod( pol, pmz_lst, err_bnd = 2 ** -64, prime = 2 ** 61 - 1, seed = None ):
+    '''
+    Probabilistic test whether a polynomial vanishes on a parametrized
+    surface, by evaluation at random points of the torus over GF(p).
+
+    Parameters
+    ----------
+    pol : sage_POLY
+        A homogeneous polynomial in QQ[x0,x1,x2,x3].
+
+    pmz_lst : list<sage_POLY>
+        A list of 4 polynomials in QQ[c0,s0,c1,s1].
+
+    err_bnd : float
+        Upper bound for the probability that True is returned 
+        although "pol" composed with "pmz_lst" does not vanish
+        on the torus c0^2+s0^2=c1^2+s1^2=1. 
+
+    prime : int
+        We compute modulo the smallest prime p >= "prime" that does 
+        not divide a denominator of the coefficients.
+
+    seed : int
+        Seed for the random points. If None, then the seed is random.
+
+    Returns
+    -------
+    bool
+        False if "pol" composed with "pmz_lst" is certainly nonzero 
+        on the torus, and True if it is zero with probability at 
+        least 1-"err_bnd".
+
+    Notes
+    -----
+    We substitute c=(1-t^2)/(1+t^2) and s=2t/(1+t^2) for each circle. 
+    After clearing denominators the composition becomes a polynomial 
+    in (t0,t1) of degree D <= 4*deg(pol)*deg(pmz_lst), which is zero 
+    if and only if the composition vanishes on the torus. By the 
+    Schwartz-Zippel lemma a nonzero such polynomial vanishes at a random 
+    point of GF(p)^2 with probability at most D/p, so we evaluate 
+    at k random points such that (D/p)^k <= "err_bnd". The rare event 
+    that all coefficients are divisible by p is not covered by this bound.
+    '''
+    Rx = OrbRing.get_ring( 'x0,x1,x2,x3' )
+    Rc = OrbRing.get_ring( 'c0,s0,c1,s1' )
+    while True:
+        try:
+            F = sage_GF( prime )
+            f = convert_pol( Rx( pol ), Rx.change_ring( F ) )
+            p_lst = convert_pol( [ Rc( pmz ) for pmz in pmz_lst ], Rc.change_ring( F ) )
+            break
+        except ZeroDivisionError:
+            prime = sage_next_prime( prime )
+
+    D = 4 * max( 1, f.total_degree() ) * max( [1] + [ pmz.total_degree() for pmz in p_lst ] )
+    num = max( 1, int( math.ceil( math.log( err_bnd ) / math.log( float( D ) / prime ) ) ) )
+    OrbTools.p( 'prime =', prime, ', degree bound =', D, ', points =', num )
+
+    rnd = random.Random( seed )
+    count = 0
+    while count < num:
+        t0, t1 = F( rnd.randrange( prime ) ), F( rnd.randrange( prime ) )
+        d0, d1 = 1 + t0 * t0, 1 + t1 * t1
+        if d0 == 0 or d1 == 0:
+            continue
+        pt = ( ( 1 - t0 * t0 ) / d0, 2 * t0 / d0, ( 1 - t1 * t1 ) / d1, 2 * t1 / d1 )
+        if f( *[ pmz( *pt ) for pmz in p_lst ] ) != 0:
+            return False
+        count += 1
+
+    return True
+
+
+def get_pmz_verify( o, exact = None, err_bnd = 2 ** -64 ):
     '''
     Parameters
     ----------
         o : OrbOutput
+
+        exact : bool
+            If True, then the parametrization is substituted into the 
+            implicit equation symbolically, which is slow for surfaces 
+            of high degree. If False, then we use the probabilistic
+            test "get_pmz_verify_mod()". If None, then the test is
+            exact if and only if "o.input.alg['tst']=='exact'".
+
+        err_bnd : float
+            Upper bound for the probability that the probabilistic
+            test returns "True" incorrectly.
     
     Returns
     -------
@@ -518,11 +1190,19 @@ def get_pmz_verify( o ):
         return False
 
     OrbTools.p( 'Testing parametrization...' )
-    c0, s0, c1, s1 = OrbRing.coerce( 'c0,s0,c1,s1' )
-    x0, x1, x2, x3 = OrbRing.coerce( 'x0,x1,x2,x3' )
-    f = o.prj_pol
-    p = o.prj_pmz_lst
-    fp = o.prj_pol.subs( {x0:p[0], x1:p[1], x2:p[2], x3:p[3]} )
+
+    if exact == None:
+        exact = o.input.alg.get( 'tst', None ) == 'exact'
+    if not exact:
+        return get_pmz_verify_mod( o.prj_pol, o.prj_pmz_lst, err_bnd )
+
+    # compute in rings with only the variables that occur
+    Rx = OrbRing.get_ring( 'x0,x1,x2,x3' )
+    Rc = OrbRing.get_ring( 'c0,s0,c1,s1' )
+    c0, s0, c1, s1 = Rc.gens()
+    f = Rx( o.prj_pol )
+    p = [ Rc( pmz ) for pmz in o.prj_pmz_lst ]
+    fp = Rx.hom( p, Rc )( f )
     test = fp.reduce( [c0 * c0 + s0 * s0 - 1, c1 * c1 + s1 * s1 - 1] )
     OrbTools.p( test )
     if test != 0:
@@ -531,12 +1211,158 @@ def get_pmz_verify( o ):
     return True
 
 
-def orb_product( input ):
+def get_pol_stats( val ):
+    '''
+    Parameters
+    ----------
+    val : object
+        A polynomial, or a (nested) list or tuple that contains 
+        polynomials. Other objects are ignored.
+
+    Returns
+    -------
+    tuple
+        A 3-tuple ( <num>, <deg>, <trm> ) of integers, where
+        <num> is the number of polynomials in "val", 
+        <deg> is the maximal total degree of these polynomials and
+        <trm> is the total number of their terms.
+        Polynomials are elements of polynomial rings, 
+        so that symbolic expressions are not counted.        
+    '''
+    if isinstance( val, ( list, tuple ) ):
+        num, deg, trm = 0, 0, 0
+        for item in val:
+            n, d, t = get_pol_stats( item )
+            num, deg, trm = num + n, max( deg, d ), trm + t
+        return num, deg, trm
+
+    if not hasattr( val, 'number_of_terms' ) or not hasattr( val, 'degree' ):
+        return 0, 0, 0
+
+    return 1, max( 0, int( val.degree() ) ), int( val.number_of_terms() )
+
+
+def get_metrics_writer( fname ):
+    '''
+    Parameters
+    ----------
+    fname : string
+        Name of a file.
+
+    Returns
+    -------
+    function
+        A function that can be used as the "metrics" argument 
+        of "orb_product()". Each record is appended 
+        to the file "fname" as a line in JSON format.
+    '''
+    def write( rec ):
+        with open( fname, 'a' ) as json_file:
+            json_file.write( json.dumps( rec, sort_keys = True ) + '\n' )
+    return write
+
+
+def get_stage( input, cache, stage, fun, *arg_lst, metrics = None ):
+    '''
+    Parameters
+    ----------
+    input : OrbInput
+
+    cache : OrbCache
+        If None, then "fun" is always called.
+
+    stage : string
+        A key of "input.do".
+
+    fun : function
+        A function that computes the output of "stage".
+
+    *arg_lst
+        Arguments for "fun".
+
+    metrics : function
+        If not None, then "metrics" is called with a dictionary 
+        that describes the computation of "stage" as argument: 
+            {
+              'stage'   : "stage",
+              'input'   : string of "input.info_dct",
+              'cached'  : True if the output was loaded from "cache",
+              'wall'    : wall time in seconds,
+              'cpu'     : process time in seconds,
+              'maxrss'  : maximum resident set size of the process 
+                          in kilobytes after the computation,
+              'num_pol' : number of polynomials in the output, 
+                          (eg. the size of the Groebner basis "imp_lst"),
+              'max_deg' : maximal degree of these polynomials,
+              'num_trm' : total number of terms of these polynomials.  
+            }
+        See also "get_pol_stats()" and "get_metrics_writer()".
+
+    Returns
+    -------
+    object
+        The output of "stage", which is loaded from
+        "cache" if it was computed before and
+        otherwise "fun(*arg_lst)" is returned
+        and stored in "cache".
+    '''
+    if metrics != None:
+        wall = time.perf_counter()
+        cpu = time.process_time()
+
+    found = False
+    if cache == None:
+        val = fun( *arg_lst )
+    else:
+        found, val = cache.get( input, stage )
+        if found:
+            OrbTools.p( 'Loaded from cache:', stage )
+        else:
+            val = fun( *arg_lst )
+            cache.set( input, stage, val )
+
+    if metrics != None:
+        rec = {}
+        rec['stage'] = stage
+        rec['input'] = str( input.info_dct )
+        rec['cached'] = found
+        rec['wall'] = time.perf_counter() - wall
+        rec['cpu'] = time.process_time() - cpu
+        rec['maxrss'] = resource.getrusage( resource.RUSAGE_SELF ).ru_maxrss
+        rec['num_pol'], rec['max_deg'], rec['num_trm'] = get_pol_stats( val )
+        OrbTools.p( rec, lvl = 2 )
+        metrics( rec )
+
+    return val
+
+
+def orb_product( input, cache = None, mod_filter = None, metrics = None ):
     '''    
     Parameters
     ----------
     input : OrbInput
         A 1-parameter subgroup in Aut(S^7) and a circle in S^7.    
+
+    cache : OrbCache
+        If not None, then the output of each stage is 
+        loaded from "cache" if it was computed before, 
+        and stored in "cache" otherwise.
+
+    mod_filter : function
+        If not None, then "mod_filter" is a function that takes 
+        3 integers ( <deg>, <emb>, <dim> ) as arguments 
+        and returns a boolean. Before any other computation, these 
+        invariants are predicted by eliminating over a finite field 
+        (see "get_mod_dde()") and assigned to "o.mod_dde".
+        If "mod_filter" returns False, then the remaining attributes
+        of the output "o" are not computed.
+
+    metrics : function
+        If not None, then "metrics" is called after each stage 
+        with a dictionary of timings and polynomial statistics 
+        as argument (see "get_stage()"). For example, 
+        "get_metrics_writer(<fname>)" writes these dictionaries 
+        as JSON lines to a file.
         
     Returns
     -------
@@ -552,44 +1378,53 @@ def orb_product( input ):
 
     o = OrbOutput( input )
 
+    if mod_filter != None:
+        o.mod_dde = get_stage( input, cache, 'mod', get_mod_dde, input.omat, input.vmat, metrics = metrics )
+        if not mod_filter( *o.mod_dde ):
+            OrbTools.p( 'Filtered out by modular invariants (deg, emb, dim) =', o.mod_dde )
+            return o
+
     if input.do['pmz']:
-        o.pmz_lst, o.prj_pmz_lst = get_pmz( input.pmat, input.omat, input.vmat )
+        o.pmz_lst, o.prj_pmz_lst = get_stage( input, cache, 'pmz', get_pmz, input.pmat, input.omat, input.vmat, metrics = metrics )
 
     if input.do['bpt']:
-        o.bp_tree = get_orb_bp_tree( o.pmz_lst )
+        o.bp_tree = get_stage( input, cache, 'bpt', get_orb_bp_tree, o.pmz_lst, metrics = metrics )
 
     if input.do['imp']:
-        o.imp_lst = get_imp( input.omat, input.vmat )
+        o.imp_lst = get_stage( input, cache, 'imp', get_imp, input.omat, input.vmat, input.alg['imp'], o.elim_dct, metrics = metrics )
+        o.imp_ideal = get_imp_ideal( o.imp_lst )
     else:
         return o  # cannot obtain remaining attributes without "o.imp_lst"
 
     # Compute remaining attributes
     #
     if input.do['dde']:
-        o.emb = get_emb_dim( o.imp_lst )
-        o.deg, o.dim = get_deg_dim( o.imp_lst )
+        o.emb = get_emb_dim( o.imp_ideal )
+        o.deg, o.dim = get_stage( input, cache, 'dde', get_deg_dim, o.imp_ideal, metrics = metrics )
 
-    if input.do['prj']:
-        o.prj_pol, o.xyz_pol = get_project( o.imp_lst, input.pmat )
+    if input.do['prj'] and input.alg['prj'] == 'interp':
+        if o.pmz_lst == None:
+            o.pmz_lst, o.prj_pmz_lst = get_pmz( input.pmat, input.omat, input.vmat )
+        o.prj_pol, o.xyz_pol = get_stage( input, cache, 'prj', get_project_interp, o.pmz_lst, input.pmat, metrics = metrics )
+        o.elim_dct['prj'] = 'interp'
+
+    elif input.do['prj']:
+        o.prj_pol, o.xyz_pol = get_stage( input, cache, 'prj', get_project, o.imp_ideal, input.pmat, input.alg['prj'], o.elim_dct, metrics = metrics )
 
     if input.do['fct']:
-        o.fct_lst = get_factor_lst( o.prj_pol )
+        o.fct_lst = get_stage( input, cache, 'fct', get_factor_lst, o.prj_pol, metrics = metrics )
 
     if input.do['gen']:
-        o.gen = get_genus( o.prj_pol )
+        o.gen = get_stage( input, cache, 'gen', get_genus, o.prj_pol, metrics = metrics )
 
-    if input.do['sng']:
-        o.sng_lst = get_sing_lst( o.prj_pol )
+    if input.do['sng'] and input.alg['sng'] == 'singular':
+        o.sng_lst = get_stage( input, cache, 'sng', get_sing_lst_singular, o.prj_pol, metrics = metrics )
+    elif input.do['sng']:
+        o.sng_lst = get_stage( input, cache, 'sng', get_sing_lst, o.prj_pol, metrics = metrics )
 
     # Test whether parametrization agrees with implicitization.
     #
     if input.do['tst']:
-        o.pmz_test = get_pmz_verify( o )
+        o.pmz_test = get_stage( input, cache, 'tst', get_pmz_verify, o, metrics = metrics )
 
     return o
-
-
-
-
-
-
@@ -36,36 +36,75 @@ sage_RING:
     
 sage_REALNUMBER:
     sage.rings.real_mpfr.RealNumber
+    
+Importing Sage takes several seconds. Therefore 
+"sage.all" is only imported when an interface 
+method is called or an interface variable is 
+accessed for the first time. In particular, 
+modules that only import interface methods
+(eg. "orbital.povray.povray") do not import Sage.
 '''
 
-from sage.all import *
+def sage_all():
+    '''
+    Returns
+    -------
+    module
+        The module "sage.all". It is imported on first use.
+    '''
+    import sage.all
+    return sage.all
+
+
+lazy_dct = {}  # <interface variable> : <name in sage.all>
+
+
+def __getattr__( name ):
+    '''
+    Called when the interface variable "name" is 
+    accessed for the first time (see PEP 562). 
+    The variable is looked up in "sage.all" and
+    is stored in this module.
+    '''
+    if name not in lazy_dct:
+        raise AttributeError( 'module ' + repr( __name__ ) + ' has no attribute ' + repr( name ) )
+    val = getattr( sage_all(), lazy_dct[name] )
+    globals()[name] = val
+    return val
+
 
 #################################################
 # sage.interfaces                               #
 #################################################
 
 # from sage.interfaces import maple
-sage_maple = maple
+lazy_dct['sage_maple'] = 'maple'
 
 # from sage.interfaces import magma
-sage_magma = magma
+lazy_dct['sage_magma'] = 'magma'
+
+# from sage.interfaces.maple import Maple
+lazy_dct['sage_Maple'] = 'Maple'
+
+# from sage.interfaces.magma import Magma
+lazy_dct['sage_Magma'] = 'Magma'
 
 #################################################
 # sage.structure                                #
 #################################################
 
 # from sage.structure.proof.proof import proof
-sage_proof = proof
+lazy_dct['sage_proof'] = 'proof'
 
 
 # from sage.structure.sage_object import save
 def sage_save( *args, **kwargs ):
-    return save( *args, **kwargs )
+    return sage_all().save( *args, **kwargs )
 
 
 # from sage.structure.sage_object import load
 def sage_load( *args, **kwargs ):
-    return load( *args, **kwargs )
+    return sage_all().load( *args, **kwargs )
 
 #################################################
 # sage.misc                                     #
@@ -74,22 +113,46 @@ def sage_load( *args, **kwargs ):
 
 # from sage.misc.sage_eval import sage_eval
 def sage__eval( *args, **kwargs ):
-    return sage_eval( *args, **kwargs )
+    return sage_all().sage_eval( *args, **kwargs )
 
 
 # from sage.misc import set_verbose
 def sage_set_verbose( *args, **kwargs ):
-    return set_verbose( *args, **kwargs )
+    return sage_all().set_verbose( *args, **kwargs )
 
 
 # from sage.misc.functional import n
 def sage_n( *args, **kwargs ):
-    return n( *args, **kwargs )
+    return sage_all().n( *args, **kwargs )
 
 
 # from sage.misc.flatten import flatten
 def sage_flatten( *args, **kwargs ):
-    return flatten( *args, **kwargs )
+    return sage_all().flatten( *args, **kwargs )
+
+
+# from sage.misc.randstate import set_random_seed
+def sage_set_random_seed( *args, **kwargs ):
+    return sage_all().set_random_seed( *args, **kwargs )
+
+#################################################
+# sage.libs                                     #
+#################################################
+
+
+# from sage.libs.singular.function import singular_function, lib
+def sage_singular_function( name, lib = None ):
+    '''
+    Returns the Singular function "name" as a Python function.
+    If "lib" is not None, then the Singular library "lib"
+    (eg. 'modstd.lib') is loaded first.
+    '''
+    sage_all()
+    from sage.libs.singular.function import singular_function
+    from sage.libs.singular.function import lib as singular_lib
+    if lib != None:
+        singular_lib( lib )
+    return singular_function( name )
 
 #################################################
 # sage.functions                                #
@@ -98,22 +161,22 @@ def sage_flatten( *args, **kwargs ):
 
 # from sage.functions.trig import cos
 def sage_cos( *args, **kwargs ):
-    return cos( *args, **kwargs )
+    return sage_all().cos( *args, **kwargs )
 
 
 # from sage.functions.trig import sin
 def sage_sin( *args, **kwargs ):
-    return sin( *args, **kwargs )
+    return sage_all().sin( *args, **kwargs )
 
 
 # from sage.functions.trig import arctan
 def sage_arctan( *args, **kwargs ):
-    return arctan( *args, **kwargs )
+    return sage_all().arctan( *args, **kwargs )
 
 
 # from sage.functions.other import sqrt
 def sage_sqrt( *args, **kwargs ):
-    return sqrt( *args, **kwargs )
+    return sage_all().sqrt( *args, **kwargs )
 
 #################################################
 # sage.symbolic                                 #
@@ -121,15 +184,15 @@ def sage_sqrt( *args, **kwargs ):
 
 
 # from sage.symbolic.ring import SR
-sage_SR = SR
+lazy_dct['sage_SR'] = 'SR'
 
 # from sage.symbolic.constants import pi
-sage_pi = pi
+lazy_dct['sage_pi'] = 'pi'
 
 
 # from sage.symbolic.relation import solve
 def sage_solve( *args, **kwargs ):
-    return solve( *args, **kwargs )
+    return sage_all().solve( *args, **kwargs )
 
 #################################################
 # sage.rings                                    #
@@ -137,42 +200,42 @@ def sage_solve( *args, **kwargs ):
 
 
 # from sage.rings.integer_ring import ZZ
-sage_ZZ = ZZ
+lazy_dct['sage_ZZ'] = 'ZZ'
 
 # from sage.rings.rational_field import QQ
-sage_QQ = QQ
+lazy_dct['sage_QQ'] = 'QQ'
 
 # from sage.rings.finite_rings import GF
-sage_GF = GF
+lazy_dct['sage_GF'] = 'GF'
 
 # import sage.rings.invariant_theory
-sage_invariant_theory = invariant_theory
+lazy_dct['sage_invariant_theory'] = 'invariant_theory'
 
 
 # from sage.rings.fraction_field import FractionField
 def sage_FractionField( *args, **kwargs ):
-    return FractionField( *args, **kwargs )
+    return sage_all().FractionField( *args, **kwargs )
 
 
 # from sage.rings.polynomial.polynomial_ring_constructor import PolynomialRing
 # http://doc.sagemath.org/html/en/reference/polynomial_rings/sage/rings/polynomial/polynomial_ring_constructor.html
 def sage_PolynomialRing( *args, **kwargs ):
-    return PolynomialRing( *args, **kwargs )
+    return sage_all().PolynomialRing( *args, **kwargs )
 
 
 # from sage.rings.number_field.number_field import NumberField
 def sage_NumberField( *args, **kwargs ):
-    return NumberField( *args, **kwargs )
+    return sage_all().NumberField( *args, **kwargs )
 
 
 # from sage.rings.ideal import Ideal
 def sage_ideal( *args, **kwargs ):
-    return ideal( *args, **kwargs )
+    return sage_all().ideal( *args, **kwargs )
 
 
 # from sage.rings.real_mpfr import RealField
 def sage_RealField( *args, **kwargs ):
-    return RealField( *args, **kwargs )
+    return sage_all().RealField( *args, **kwargs )
 
 #################################################
 # sage.modules                             #
@@ -181,7 +244,7 @@ def sage_RealField( *args, **kwargs ):
 
 # from sage.modules import VectorSpace
 def sage_VectorSpace( *args, **kwargs ):
-    return VectorSpace( *args, **kwargs )
+    return sage_all().VectorSpace( *args, **kwargs )
 
 #################################################
 # sage.matrix                                   #
@@ -190,27 +253,27 @@ def sage_VectorSpace( *args, **kwargs ):
 
 # from sage.matrix.constructor import matrix
 def sage_matrix( *args, **kwargs ):
-    return matrix( *args, **kwargs )
+    return sage_all().matrix( *args, **kwargs )
 
 
 # from sage.matrix.constructor import identity_matrix
 def sage_identity_matrix( *args, **kwargs ):
-    return identity_matrix( *args, **kwargs )
+    return sage_all().identity_matrix( *args, **kwargs )
 
 
 # from sage.matrix.constructor import diagonal_matrix
 def sage_diagonal_matrix( *args, **kwargs ):
-    return diagonal_matrix( *args, **kwargs )
+    return sage_all().diagonal_matrix( *args, **kwargs )
 
 
 # from sage.matrix.constructor import vector
 def sage_vector( *args, **kwargs ):
-    return vector( *args, **kwargs )
+    return sage_all().vector( *args, **kwargs )
 
 
 # from sage.matrix import MatrixSpace
 def sage_MatrixSpace( *args, **kwargs ):
-    return MatrixSpace( *args, **kwargs )
+    return sage_all().MatrixSpace( *args, **kwargs )
 
 #################################################
 # sage.arith                                    #
@@ -219,17 +282,22 @@ def sage_MatrixSpace( *args, **kwargs ):
 
 # from sage.arith.misc import factor
 def sage_factor( *args, **kwargs ):
-    return factor( *args, **kwargs )
+    return sage_all().factor( *args, **kwargs )
 
 
 # from sage.arith.misc import gcd
 def sage_gcd( *args, **kwargs ):
-    return gcd( *args, **kwargs )
+    return sage_all().gcd( *args, **kwargs )
 
 
 # from sage.arith.misc import lcm
 def sage_lcm( *args, **kwargs ):
-    return lcm( *args, **kwargs )
+    return sage_all().lcm( *args, **kwargs )
+
+
+# from sage.arith.misc import next_prime
+def sage_next_prime( *args, **kwargs ):
+    return sage_all().next_prime( *args, **kwargs )
 
 #################################################
 # sage.calculus                                 #
@@ -238,17 +306,17 @@ def sage_lcm( *args, **kwargs ):
 
 # from sage.calculus.functional import diff
 def sage_diff( *args, **kwargs ):
-    return diff( *args, **kwargs )
+    return sage_all().diff( *args, **kwargs )
 
 
 # from sage.calculus.functional import expand
 def sage_expand( *args, **kwargs ):
-    return expand( *args, **kwargs )
+    return sage_all().expand( *args, **kwargs )
 
 
 # from sage.calculus.var import var
 def sage_var( *args, **kwargs ):
-    return var( *args, **kwargs )
+    return sage_all().var( *args, **kwargs )
 
 #################################################
 # sage.combinat                                 #
@@ -257,37 +325,37 @@ def sage_var( *args, **kwargs ):
 
 # from sage.combinat.composition import Compositions
 def sage_Compositions( *args, **kwargs ):
-    return Compositions( *args, **kwargs )
+    return sage_all().Compositions( *args, **kwargs )
 
 
 # from sage.combinat.combination import Combinations
 def sage_Combinations( *args, **kwargs ):
-    return Combinations( *args, **kwargs )
+    return sage_all().Combinations( *args, **kwargs )
 
 
 # from sage.combinat.partitions import Partitions
 def sage_Partitions( *args, **kwargs ):
-    return Partitions( *args, **kwargs )
+    return sage_all().Partitions( *args, **kwargs )
 
 
 # from sage.combinat.permutation import Permutations
 def sage_Permutations( *args, **kwargs ):
-    return Permutations( *args, **kwargs )
+    return sage_all().Permutations( *args, **kwargs )
 
 
 # from sage.combinat.permutation import Permutation
 def sage_Permutation( *args, **kwargs ):
-    return Permutation( *args, **kwargs )
+    return sage_all().Permutation( *args, **kwargs )
 
 
 # from sage.subset import Subsets
 def sage_Subsets( *args, **kwargs ):
-    return Subsets( *args, **kwargs )
+    return sage_all().Subsets( *args, **kwargs )
 
 
 # from sage.combinat.root_system.root_system import RootSystem
 def sage_RootSystem( *args, **kwargs ):
-    return RootSystem( *args, **kwargs )
+    return sage_all().RootSystem( *args, **kwargs )
 
 #################################################
 # sage.graphs                                   #
@@ -296,7 +364,7 @@ def sage_RootSystem( *args, **kwargs ):
 
 # from sage.graphs.graph import Graph
 def sage_Graph( *args, **kwargs ):
-    return Graph( *args, **kwargs )
+    return sage_all().Graph( *args, **kwargs )
 
 #################################################
 # sage.plot                                     #
@@ -305,25 +373,25 @@ def sage_Graph( *args, **kwargs ):
 
 # from sage.plot.graphics import Graphics
 def sage_Graphics( *args, **kwargs ):
-    return Graphics( *args, **kwargs )
+    return sage_all().Graphics( *args, **kwargs )
 
 
 # from sage.plot.plot3d.parametric_plot3d import parametric_plot3d
 def sage_parametric_plot3d( *args, **kwargs ):
-    return parametric_plot3d( *args, **kwargs )
+    return sage_all().parametric_plot3d( *args, **kwargs )
 
 
 # from sage.plot.plot3d.implicit_plot3d import implicit_plot3d
 def sage_implicit_plot3d( *args, **kwargs ):
-    return implicit_plot3d( *args, **kwargs )
+    return sage_all().implicit_plot3d( *args, **kwargs )
 
 
 # from sage.plot.plot3d.shapes2 import point3d
 def sage_point3d( *args, **kwargs ):
-    return point3d( *args, **kwargs )
+    return sage_all().point3d( *args, **kwargs )
 
 
 # from sage.plot.plot3d.color import Color
 def sage_Color( *args, **kwargs ):
-    return Color( *args, **kwargs )
+    return sage_all().Color( *args, **kwargs )
 
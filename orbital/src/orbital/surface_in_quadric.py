@@ -22,6 +22,8 @@ from orbital.class_orb_tools import OrbTools
 
 from orbital.class_orb_ring import OrbRing
 
+from orbital.poly_maps import convert_pol
+
 from linear_series.class_linear_series import LinearSeries
 
 
@@ -46,7 +48,7 @@ def get_S1xS1_pmz( xyvw_pmz_lst ):
 
     R = sage_PolynomialRing( sage_QQ, 'x,y,v,w' )
     x, y, v, w = R.gens()
-    xyvw_pmz_lst = sage__eval( str( xyvw_pmz_lst ), R.gens_dict() )
+    xyvw_pmz_lst = convert_pol( xyvw_pmz_lst, R )
     c0, s0, c1, s1 = OrbRing.coerce( 'c0,s0,c1,s1' )
     sub_dct = {x:1 - s0, y:c0, v:1 - s1, w:c1 }
     pmz_lst = [ OrbRing.coerce( xyvw_pmz.subs( sub_dct ) ) for xyvw_pmz in xyvw_pmz_lst]
@@ -71,7 +73,7 @@ def get_deg_surf( imp_lst, emb_dim ):
     '''
 
     ring = sage_PolynomialRing( sage_QQ, [ 'x' + str( i ) for i in range( emb_dim + 1 )] )
-    imp_lst = sage__eval( str( imp_lst ), ring.gens_dict() )
+    imp_lst = convert_pol( imp_lst, ring )
     hpol = ring.ideal( imp_lst ).hilbert_polynomial()
 
     return hpol.diff().diff()
@@ -352,7 +354,7 @@ def get_surf( ls, sig, coef_lst=None, prv_Q=None ):
 
     OrbTools.p( 'Q        =', list( Q ) )
     OrbTools.p( 'pmz_lst  =', pmz_lst )
-    OrbTools.p( 'imp_lst  =', imp_lst )
+    OrbTools.p( 'imp_lst  =', imp_lst, lvl = 2 )
     OrbTools.p( 'c_lst    =', c_lst )
     OrbTools.p( 'M_pol    =', M_pol )
 
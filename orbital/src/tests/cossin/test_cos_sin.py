@@ -4,6 +4,8 @@ Created on Jan 22, 2018
 @author: Niels Lubbes
 '''
 
+import math
+
 from orbital.sage_interface import sage_pi
 from orbital.sage_interface import sage_QQ
 from orbital.sage_interface import sage_n
@@ -12,6 +14,14 @@ from orbital.sage_interface import sage_sin
 
 
 from orbital.cossin.cos_sin import get_cs
+from orbital.cossin.cos_sin import get_pt_dct
+from orbital.cossin.cos_sin import get_pt_txt_dct
+from orbital.cossin.cos_sin import get_pt_index
+from orbital.cossin.cos_sin import get_sb_simplest
+from orbital.cossin.cos_sin import get_cs_approx
+from orbital.cossin.cos_sin import get_cs_lst
+
+from fractions import Fraction
 
 
 class TestCosSin( object ):
@@ -32,6 +42,63 @@ class TestCosSin( object ):
 
             assert dc < 0.0086 and ds < 0.0086
 
+    def test__get_pt_dct( self ):
+
+        pt_dct = get_pt_dct()
+        assert pt_dct is get_pt_dct()
+        assert sorted( pt_dct.keys() ) == list( range( 1, 90 ) )
+        for angle, ( a, b, c ) in pt_dct.items():
+            assert a ** 2 + b ** 2 == c ** 2
+            assert round( math.degrees( math.atan2( b, a ) ) ) == angle
+
+        # the shipped binary table agrees with the text file
+        assert get_pt_txt_dct() == pt_dct
+
+    def test__get_pt_index( self ):
+
+        angle_lst, pt_lst = get_pt_index()
+        assert angle_lst == sorted( angle_lst )
+        assert angle_lst[0] == 0 and pt_lst[0] == [1, 0, 1]
+        for angle, ( a, b, c ) in zip( angle_lst, pt_lst ):
+            assert a ** 2 + b ** 2 == c ** 2
+            assert abs( math.degrees( math.atan2( b, a ) ) % 360 - angle ) < 1e-9
+
+    def test__get_sb_simplest( self ):
+
+        assert get_sb_simplest( Fraction( 1, 3 ), Fraction( 1, 2 ) ) == Fraction( 1, 2 )
+        assert get_sb_simplest( Fraction( 3, 10 ), Fraction( 4, 10 ) ) == Fraction( 1, 3 )
+        assert get_sb_simplest( Fraction( 5, 2 ), Fraction( 7, 2 ) ) == 3
+        assert get_sb_simplest( Fraction( 355, 113 ), Fraction( 355, 113 ) ) == Fraction( 355, 113 )
+        x = Fraction( math.pi )
+        assert get_sb_simplest( x - Fraction( 1, 10 ** 6 ), x + Fraction( 1, 10 ** 6 ) ) == Fraction( 355, 113 )
+
+    def test__get_cs_approx( self ):
+
+        for angle in [0.1, 37.5, 123.456, 200.0001, 271.3, 359.99]:
+            for tol in [1, 1e-3, 1e-9, None]:
+                c, s = get_cs_approx( angle, tol )
+                print( angle, tol, ( c, s ) )
+                assert c ** 2 + s ** 2 == 1
+                d = abs( math.degrees( math.atan2( s, c ) ) % 360 - angle )
+                d = min( d, 360 - d )
+                assert d <= ( 1.0 if tol == None else tol * ( 1 + 1e-6 ) )
+
+        assert get_cs_approx( 37.5, 1 ) == ( sage_QQ( 4 ) / 5, sage_QQ( 3 ) / 5 )
+        assert get_cs_approx( 90.0001 ) == ( 0, 1 )
+        assert get_cs_approx( 37.5, 1e-3, 10 ** 6 )[0].denominator() <= 10 ** 6
+        try:
+            get_cs_approx( 37.5, 1e-9, 1000 )
+            assert False
+        except ValueError:
+            pass
+
+    def test__get_cs_lst( self ):
+
+        angle_lst = [0, 37, 37.5, 37.5, 270, 300.25]
+        cs_lst = get_cs_lst( angle_lst )
+        assert cs_lst == [ get_cs( angle ) for angle in angle_lst ]
+        assert cs_lst[1] == get_cs( 37 )
+        assert cs_lst[2] == get_cs_approx( 37.5 )
 
 
 
@@ -39,4 +106,9 @@ class TestCosSin( object ):
 if __name__ == '__main__':
 
     TestCosSin().test__get_cs()
+    TestCosSin().test__get_pt_dct()
+    TestCosSin().test__get_pt_index()
+    TestCosSin().test__get_sb_simplest()
+    TestCosSin().test__get_cs_approx()
+    TestCosSin().test__get_cs_lst()
     pass
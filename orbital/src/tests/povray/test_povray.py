@@ -3,18 +3,40 @@ Use of this source code is governed by a MIT-style license that can be found in
 Created on Nov 23, 2017
 @author: Niels Lubbes
 '''
+import os
+import sys
+import subprocess
+
 from orbital.sage_interface import sage_var
 from orbital.sage_interface import sage_pi
 from orbital.sage_interface import sage_QQ
 
 from orbital.povray.class_pov_input import PovInput
 
+from orbital.povray import povray
+
 from orbital.povray.povray import create_pov
 
+from orbital.povray.povray import create_pov_curves
+
+from orbital.povray.povray import pov_render_lst
+
+from orbital.povray.povray import pov_write_inc
+
 from orbital.povray.povray_aux import get_time_str
 
 from orbital.povray.povray_aux import rgbt2pov
 
+from orbital.povray.povray_aux import get_pmz_value
+
+from orbital.povray.povray_aux import get_pmz_grid
+
+from orbital.povray.povray_aux import pov_coef_lst
+
+from orbital.povray.povray_aux import pov_nopow
+
+from orbital.class_orb_ring import OrbRing
+
 
 class TestPovray( object ):
 
@@ -29,6 +51,190 @@ class TestPovray( object ):
         print( col )
         assert str( col ) == '(0.9913928435929399, 0.8912620368134188, 0.5234431552143247, 0.0)'
 
+    def test__pov_coef_lst( self ):
+
+        x, y, z = sage_var( 'x,y,z' )
+        poly = x ** 2 - 3 * y * z + sage_QQ( 1 ) / 2
+
+        assert pov_coef_lst( poly ) == pov_coef_lst( str( poly ) )
+        d, coef_lst = pov_coef_lst( poly )
+        assert d == 2
+        assert coef_lst == [1, 0, 0, 0, 0, -3, 0, 0, 0, sage_QQ( 1 ) / 2]
+
+    def test__pov_nopow( self ):
+
+        out = pov_nopow( 'x^3*y^2*z - 2*x^2*y + 1' )
+        print( out )
+        assert out == 'x*x*x*y*y*z - 2*x*x*y + 1'
+
+        out = pov_nopow( '-x^2 + 3' )
+        assert out == '-x*x + 3'
+
+    def test__get_pmz_grid( self ):
+
+        pmz_lst = OrbRing.coerce( '[s0 + 1, ( c0 + 2 ) * c1, ( c0 + 2 ) * s1, s0]' )
+        v0_lst = [ ( sage_QQ( i ) / 180 ) * sage_pi for i in range( 0, 360, 45 )]
+        v1_lst = [ ( sage_QQ( i ) / 180 ) * sage_pi for i in range( 0, 360, 60 )]
+
+        grid = get_pmz_grid( pmz_lst, v0_lst, v1_lst )
+        print( grid )
+        assert grid.shape == ( len( v0_lst ), len( v1_lst ), 3 )
+
+        for i in range( len( v0_lst ) ):
+            for j in range( len( v1_lst ) ):
+                point = get_pmz_value( pmz_lst, v0_lst[i], v1_lst[j] )
+                if point == None:
+                    assert all( [ coord != coord for coord in grid[i, j] ] )  # NaN
+                else:
+                    for k in range( 3 ):
+                        assert abs( point[k] - grid[i, j, k] ) < 1e-10
+
+    def test__create_pov_curves( self ):
+
+        c0, s0, c1, s1 = sage_var( 'c0,s0,c1,s1' )
+        pmz_AB_lst = [1, ( c0 + 2 ) * c1, ( c0 + 2 ) * s1, s0]
+        v0_lst = [ ( sage_QQ( i ) / 180 ) * sage_pi for i in range( 0, 360, 90 )]
+        v1_lst = [ ( sage_QQ( i ) / 180 ) * sage_pi for i in range( 0, 360, 120 )]
+
+        pin = PovInput()
+        pin.path = './' + get_time_str() + '_TEST_POVRAY_REMOVE_ME/'
+        pin.pmz_dct['A'] = ( pmz_AB_lst, 0 )
+        pin.curve_dct['A'] = {'step0':v0_lst, 'step1': v1_lst, 'prec':10, 'width':0.08}
+
+        s = create_pov_curves( pin, 'A', 5 )
+        print( s )
+        inc_name = pin.curve_inc_dct['A'][1]
+        assert '#include "' + inc_name + '"' in s
+        assert s.count( 'object { CURVE_A_' ) == 5
+        assert 'object { CURVE_A_0 texture { TEXT_A } }' in s
+
+        with open( inc_name, 'r' ) as inc_file:
+            inc = inc_file.read()
+        print( inc )
+        assert inc.count( 'sphere_sweep' ) == 3
+        assert '#declare CURVE_A_2 = sphere_sweep' in inc
+        assert '    8,\n' in inc  # each curve is traversed twice
+
+        # curves are not modified when scene is created again
+        create_pov_curves( pin, 'A' )
+        assert [ len( curve ) for curve in pin.curve_lst_dct['A'] ] == [4, 4, 4]
+        assert pin.curve_inc_dct['A'][1] == inc_name
+
+        # include file is replaced if the curves change
+        pin.curve_lst_dct['A'] = pin.curve_lst_dct['A'][:2]
+        s = create_pov_curves( pin, 'A' )
+        assert pin.curve_inc_dct['A'][1] != inc_name
+        assert '#include "' + pin.curve_inc_dct['A'][1] + '"' in s
+        assert os.listdir( pin.path + 'inc/' ) == [ os.path.basename( pin.curve_inc_dct['A'][1] ) ]
+
+    def test__create_pov__without_sage( self ):
+
+        # a scene from precomputed numeric data in a fresh process
+        code = ''
+        code += 'import sys\n'
+        code += 'from orbital.povray.class_pov_input import PovInput\n'
+        code += 'from orbital.povray.povray import create_pov_preamble, create_pov_surface, create_pov_curves\n'
+        code += 'pin = PovInput()\n'
+        code += 'pin.path = "./' + get_time_str() + '_TEST_POVRAY_REMOVE_ME/"\n'
+        code += 'pin.impl = ( 2, [1, 0, 0, 0, 1, 0, 0, 1, 0, -1] )\n'
+        code += 'pin.curve_lst_dct["A"] = [ [ [0.0, 0.0, 1.0], [1.0, 0.0, 0.0], [0.0, 1.0, 0.0] ] ]\n'
+        code += 'pin.curve_dct["A"]["width"] = 0.02\n'
+        code += 's = create_pov_preamble( pin ) + create_pov_surface( pin ) + create_pov_curves( pin, "A" )\n'
+        code += 'assert "object { CURVE_A_0 texture { TEXT_A } }" in s\n'
+        code += 'assert "<1, 0, 0, 0, 1, 0, 0, 1, 0, -1>" in s\n'
+        code += 'print( "sage.all" in sys.modules )\n'
+
+        env = dict( os.environ )
+        src = os.path.dirname( os.path.dirname( os.path.dirname( os.path.abspath( sys.modules[PovInput.__module__].__file__ ) ) ) )
+        env['PYTHONPATH'] = src + os.pathsep + env.get( 'PYTHONPATH', '' )
+        out = subprocess.check_output( [sys.executable, '-c', code], env = env )
+        print( out )
+        assert out.strip() == b'False'
+
+    def test__pov_write_inc( self ):
+
+        path = './' + get_time_str() + '_TEST_POVRAY_REMOVE_ME/'
+
+        name1 = pov_write_inc( path + 'static', ['// a\n', '// b\n'] )
+        name2 = pov_write_inc( path + 'static', ( s for s in ['// a\n', '// b\n'] ) )
+        name3 = pov_write_inc( path + 'static', ['// a\n', '// c\n'] )
+
+        assert name1 == name2
+        assert name1 != name3
+        assert os.path.basename( name1 ).startswith( 'static-' )
+        assert name1.endswith( '.inc' )
+        with open( name1, 'r' ) as inc_file:
+            assert inc_file.read() == '// a\n// b\n'
+
+    def test__pov_render_lst( self ):
+
+        path = './' + get_time_str() + '_TEST_POVRAY_REMOVE_ME/'
+        os.makedirs( path )
+
+        # "touch" simulates the povray command
+        job_lst = []
+        for idx in range( 4 ):
+            output_name = path + 'frame-' + str( idx ) + '.png'
+            job_lst += [( ['touch', output_name], output_name, 'hash' + str( idx ) )]
+        pov_render_lst( job_lst, 2 )
+
+        for cmd, output_name, scene_hash in job_lst:
+            assert os.path.exists( output_name )
+            with open( output_name + '.hash', 'r' ) as hash_file:
+                assert hash_file.read() == scene_hash
+
+        # only the frame with a changed hash is rendered again
+        job_lst[2] = ( job_lst[2][0], job_lst[2][1], 'changed' )
+        assert self.count_pov_run( lambda: pov_render_lst( job_lst, 2 ) ) == [job_lst[2][0]]
+
+    def count_pov_run( self, fun ):
+        '''
+        Calls "fun()", where "povray.pov_run()" is replaced by a stand-in
+        that creates the output image, and "povray_aux.convert_pngs_gif()"
+        is switched off. Returns the list of commands that were run.
+        '''
+        cmd_lst = []
+        def pov_run( cmd ):
+            cmd_lst.append( cmd )
+            output_name = [ arg for arg in cmd if arg.startswith( '+O' ) ]
+            output_name = output_name[0][2:] if output_name != [] else cmd[-1]
+            open( output_name, 'w' ).close()
+            return 0, b'', b''
+
+        prv_run, prv_gif = povray.pov_run, povray.convert_pngs_gif
+        povray.pov_run = pov_run
+        povray.convert_pngs_gif = lambda *arg_lst: None
+        try:
+            fun()
+        finally:
+            povray.pov_run, povray.convert_pngs_gif = prv_run, prv_gif
+
+        return cmd_lst
+
+    def test__create_pov__ani( self ):
+
+        pin = PovInput()
+        pin.path = './' + get_time_str() + '_TEST_POVRAY_REMOVE_ME/'
+        pin.fname = 'orb'
+        pin.impl = ( 2, [1, 0, 0, 0, 1, 0, 0, 1, 0, -1] )
+        pin.curve_lst_dct['A'] = [ [ [0.0, 0.0, 1.0], [1.0, 0.0, 0.0] ], [ [0.0, 1.0, 0.0], [0.0, 0.0, 1.0] ] ]
+        pin.curve_dct['A']['width'] = 0.02
+
+        cmd_lst = self.count_pov_run( lambda: create_pov( pin, ['A'], True, True ) )
+        assert len( cmd_lst ) == 2 + 5
+        assert os.path.exists( pin.path + 'ani/orb_A-0.png' )
+
+        # a second run renders nothing
+        assert self.count_pov_run( lambda: create_pov( pin, ['A'], True, True ) ) == []
+
+        # only the frames are rendered again if the static part changed
+        pin.impl = ( 2, [1, 0, 0, 0, 2, 0, 0, 1, 0, -1] )
+        assert len( self.count_pov_run( lambda: create_pov( pin, ['A'], True, True ) ) ) == 2 + 5
+
+        # the outdated static part is removed
+        inc_lst = [ name for name in os.listdir( pin.path + 'ani/' ) if name.startswith( 'orb_A-static-' ) ]
+        assert len( inc_lst ) == 1
+
     def test__povray( self ):
 
         c0, s0, c1, s1 = sage_var( 'c0,s0,c1,s1' )
@@ -82,5 +288,13 @@ class TestPovray( object ):
 if __name__ == '__main__':
 
     TestPovray().test__rgbt2_pov()
+    TestPovray().test__pov_coef_lst()
+    TestPovray().test__pov_nopow()
+    TestPovray().test__get_pmz_grid()
+    TestPovray().test__create_pov_curves()
+    TestPovray().test__create_pov__without_sage()
+    TestPovray().test__pov_write_inc()
+    TestPovray().test__pov_render_lst()
+    TestPovray().test__create_pov__ani()
     TestPovray().test__povray()
     pass
@@ -0,0 +1,86 @@
+'''
+Use of this source code is governed by a MIT-style license that can be found in the LICENSE file.
+Created on Oct 18, 2026
+@author: Niels Lubbes
+'''
+
+import os
+import tempfile
+
+from orbital.prod.class_orb_cache import OrbCache
+
+from orbital.prod.class_orb_input import OrbInput
+
+from orbital.prod.orb_product import orb_product
+
+from orbital.class_orb_tools import OrbTools
+
+
+class TestOrbCache( object ):
+
+    # perseus cyclide
+    s = "['@(4,3)=(deg,emb)', {'pmat': ('P0', 'I', 'I'), 'omat': ('T[1, 0, 0, 0, 0, 0, 0]', 'Orppp', 'T[-1, 0, 0, 0, 0, 0, 0]'), 'vmat': ('T[0, 1, 1, 0, 0, 0, 0]', 'Rrrrs[37, 0, 0, 0]', 'T[0, -1, -1, 0, 0, 0, 0]')}]"
+
+    def test__get_set( self ):
+
+        cache = OrbCache( tempfile.mkdtemp() + '/' )
+        input = OrbInput().set_short_str( self.s )
+
+        assert cache.get( input, 'dde' ) == ( False, None )
+        cache.set( input, 'dde', ( 4, 2 ) )
+        assert cache.get( input, 'dde' ) == ( True, ( 4, 2 ) )
+
+        input.do['sng'] = False  # different key
+        assert cache.get( input, 'dde' ) == ( False, None )
+
+        input.do['sng'] = True
+        input.alg['imp'] = 'modular'  # different key
+        assert cache.get( input, 'dde' ) == ( False, None )
+
+        print( cache )
+        assert ( cache.num_hit, cache.num_miss ) == ( 1, 3 )
+
+    def test__evict( self ):
+
+        cache = OrbCache( tempfile.mkdtemp() + '/' )
+        input = OrbInput().set_short_str( self.s )
+        cache.set( input, 'dde', ( 4, 2 ) )
+
+        # mark the first entry as least recently used, since
+        # mtimes of both entries may otherwise be equal
+        tm, size, dir_name = cache.get_size()[0]
+        os.utime( dir_name, ( 0, 0 ) )
+
+        input.do['sng'] = False  # different key
+        cache.max_size = size
+        cache.set( input, 'dde', ( 4, 2 ) )
+
+        assert len( cache.get_size() ) == 1
+        assert cache.get( input, 'dde' ) == ( True, ( 4, 2 ) )
+        assert cache.size == size
+
+    def test__orb_product( self ):
+
+        cache = OrbCache( tempfile.mkdtemp() + '/' )
+        input = OrbInput().set_short_str( self.s )
+        for key in input.do.keys(): input.do[key] = False
+        input.do['imp'] = True
+        input.do['dde'] = True
+
+        o1 = orb_product( input, cache )
+        o2 = orb_product( input, cache )
+
+        assert cache.num_hit == 2
+        assert o1.imp_lst == o2.imp_lst
+        assert ( o2.deg, o2.emb, o2.dim ) == ( 4, 3, 2 )
+
+
+if __name__ == '__main__':
+
+    OrbTools.filter( None )
+
+    TestOrbCache().test__get_set()
+    TestOrbCache().test__evict()
+    TestOrbCache().test__orb_product()
+
+    pass
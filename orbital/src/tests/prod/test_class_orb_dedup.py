@@ -0,0 +1,52 @@
+'''
+Use of this source code is governed by a MIT-style license that can be found in the LICENSE file.
+Created on Oct 18, 2026
+@author: Niels Lubbes
+'''
+
+from orbital.prod.class_orb_dedup import OrbDedup
+
+from orbital.prod.class_orb_input import OrbInput
+
+from orbital.class_orb_tools import OrbTools
+
+
+class TestOrbDedup( object ):
+
+    v_tup = ( 'T[0, 1, 1, 0, 0, 0, 0]', 'Rrrrs[37, 0, 0, 0]', 'T[0, -1, -1, 0, 0, 0, 0]' )
+
+    def test__get_key( self ):
+
+        input1 = OrbInput().set( ( 'P1', 'I', 'I' ), ( 'I', 'Orppp', 'I' ), self.v_tup )
+        input2 = OrbInput().set( ( 'P1', 'I', 'I' ), ( 'I', 'Osppp', 'I' ), self.v_tup )
+        assert OrbDedup.get_key( input1 ) == OrbDedup.get_key( input2 )
+
+        input2.do['sng'] = False  # different flags
+        assert OrbDedup.get_key( input1 ) != OrbDedup.get_key( input2 )
+
+        input3 = OrbInput().set( ( 'P1', 'I', 'I' ), ( 'I', 'Orrpp', 'I' ), self.v_tup )
+        assert OrbDedup.get_key( input1 ) != OrbDedup.get_key( input3 )
+
+    def test__add( self ):
+
+        dedup = OrbDedup()
+        input1 = OrbInput().set( ( 'P0', 'I', 'I' ), ( 'I', 'Opprp', 'I' ), self.v_tup )
+        input2 = OrbInput().set( ( 'P0', 'I', 'I' ), ( 'I', 'Oppsp', 'I' ), self.v_tup )
+        input3 = OrbInput().set( ( 'P0', 'I', 'I' ), ( 'I', 'Oprpp', 'I' ), self.v_tup )
+
+        assert dedup.add( input1, 'input1' ) == None
+        assert dedup.add( input2, 'input2' ) == 'input1'
+        assert dedup.add( input3, 'input3' ) == None
+
+        print( dedup )
+        assert ( len( dedup.key_dct ), dedup.num_dup ) == ( 2, 1 )
+
+
+if __name__ == '__main__':
+
+    OrbTools.filter( None )
+
+    TestOrbDedup().test__get_key()
+    TestOrbDedup().test__add()
+
+    pass
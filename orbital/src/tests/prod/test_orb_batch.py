@@ -0,0 +1,82 @@
+'''
+Use of this source code is governed by a MIT-style license that can be found in the LICENSE file.
+Created on Oct 18, 2026
+@author: Niels Lubbes
+'''
+
+from orbital.prod.orb_batch import orb_product_batch
+
+from orbital.prod.class_orb_input import OrbInput
+from orbital.prod.class_orb_dedup import OrbDedup
+
+from orbital.class_orb_tools import OrbTools
+
+
+class TestOrbBatch( object ):
+
+    def get_input( self, s ):
+        input = OrbInput().set_short_str( s )
+        for key in input.do.keys(): input.do[key] = False
+        input.do['imp'] = True
+        input.do['dde'] = True
+        return input
+
+    def test__orb_product_batch( self ):
+
+        # perseus cyclide
+        s = "['@(4,3)=(deg,emb)', {'pmat': ('P0', 'I', 'I'), 'omat': ('T[1, 0, 0, 0, 0, 0, 0]', 'Orppp', 'T[-1, 0, 0, 0, 0, 0, 0]'), 'vmat': ('T[0, 1, 1, 0, 0, 0, 0]', 'Rrrrs[37, 0, 0, 0]', 'T[0, -1, -1, 0, 0, 0, 0]')}]"
+        input_lst = [ self.get_input( s ) for i in range( 3 ) ]
+
+        out_lst = list( orb_product_batch( input_lst, workers = 2 ) )
+        print( out_lst )
+
+        assert sorted( [ idx for ( idx, o, err ) in out_lst ] ) == [0, 1, 2]
+        for idx, o, err in out_lst:
+            assert err == None
+            assert ( o.deg, o.emb, o.dim ) == ( 4, 3, 2 )
+
+    def test__orb_product_batch__timeout( self ):
+
+        s = "['@(6,5)=(deg,emb)', {'pmat': ('P1', 'I', 'I'), 'omat': ('T[1, -1, 1, 1, -1, 0, 0]', 'Opsms', 'I'), 'vmat': ('T[1, 0, -1, 0, 0, 0, 0]', 'Rramr[340, 225, 264, 320]', 'T[-1, 0, 1, 0, 0, 0, 0]')}]"
+
+        out_lst = list( orb_product_batch( [self.get_input( s )], workers = 1, timeout = 0.01 ) )
+        print( out_lst )
+
+        assert len( out_lst ) == 1
+        idx, o, err = out_lst[0]
+        assert idx == 0
+        assert o == None
+        assert 'Timeout' in err
+
+    def test__orb_product_batch__dedup( self ):
+
+        # perseus cyclide and an equivalent input
+        s1 = "['@(4,3)=(deg,emb)', {'pmat': ('P0', 'I', 'I'), 'omat': ('T[1, 0, 0, 0, 0, 0, 0]', 'Orppp', 'T[-1, 0, 0, 0, 0, 0, 0]'), 'vmat': ('T[0, 1, 1, 0, 0, 0, 0]', 'Rrrrs[37, 0, 0, 0]', 'T[0, -1, -1, 0, 0, 0, 0]')}]"
+        s2 = "['@(4,3)=(deg,emb)', {'pmat': ('P1', 'I', 'I'), 'omat': ('T[1, 0, 0, 0, 0, 0, 0]', 'Osppp', 'T[-1, 0, 0, 0, 0, 0, 0]'), 'vmat': ('T[0, 1, 1, 0, 0, 0, 0]', 'Rrrrs[37, 0, 0, 0]', 'T[0, -1, -1, 0, 0, 0, 0]')}]"
+        input_lst = [ self.get_input( s1 ), self.get_input( s2 ), self.get_input( s1 ) ]
+
+        dedup = OrbDedup()
+        out_lst = sorted( orb_product_batch( input_lst, workers = 2, dedup = dedup ), key = lambda out: out[0] )
+        print( out_lst )
+        print( dedup )
+
+        assert [ idx for ( idx, o, err ) in out_lst ] == [0, 1, 2]
+        assert out_lst[0][2] == None and out_lst[0][1].deg == 4
+        for idx, o, err in out_lst[1:]:
+            assert o == None and err.startswith( 'Equivalent' )
+        assert dedup.num_dup == 2
+
+        # the index is shared between batches
+        out_lst = list( orb_product_batch( input_lst[:1], workers = 1, dedup = dedup ) )
+        assert out_lst[0][1] == None
+
+
+if __name__ == '__main__':
+
+    OrbTools.filter( None )
+
+    TestOrbBatch().test__orb_product_batch()
+    TestOrbBatch().test__orb_product_batch__timeout()
+    TestOrbBatch().test__orb_product_batch__dedup()
+
+    pass
@@ -0,0 +1,58 @@
+'''
+Use of this source code is governed by a MIT-style license that can be found in the LICENSE file.
+Created on Oct 18, 2026
+@author: Niels Lubbes
+'''
+
+import json
+import tempfile
+
+from orbital.prod.orb_bench import orb_bench
+from orbital.prod.orb_bench import orb_bench_compare
+from orbital.prod.orb_bench import get_bench_input
+
+from orbital.class_orb_tools import OrbTools
+
+
+class TestOrbBench( object ):
+
+    def test__orb_bench( self ):
+
+        fname = tempfile.mkdtemp() + '/bench.json'
+        out_dct = orb_bench( ['perseus'], ['pmz', 'imp', 'dde'], 2, 0, fname )
+        print( out_dct )
+
+        with open( fname, 'r' ) as json_file:
+            assert json.load( json_file ) == out_dct
+
+        assert sorted( out_dct['bench']['perseus'].keys() ) == ['dde', 'imp', 'pmz']
+        for stage, dct in out_dct['bench']['perseus'].items():
+            assert sorted( dct.keys() ) == ['cpu', 'maxrss', 'peak', 'wall']
+            assert dct['peak'] > 0
+
+        out_lst = orb_bench_compare( fname, fname )
+        assert [ out[1] for out in out_lst ] == ['pmz', 'imp', 'dde']
+        assert [ out[4] for out in out_lst ] == [1.0, 1.0, 1.0]
+
+    def test__orb_bench__seed( self ):
+
+        # random projection 'P1' is fixed by the seed
+        input1 = get_bench_input( '65_sing', 0 )
+        input2 = get_bench_input( '65_sing', 0 )
+        assert input1.info_dct['pmat'][0] == 'P1'
+        assert input1.pmat == input2.pmat
+
+        out1 = orb_bench( ['65_sing'], ['prj'], memory = False )
+        assert sorted( out1['bench']['65_sing'].keys() ) == ['prj']
+        assert out1['bench']['65_sing']['prj']['peak'] == None
+        assert out1['info']['seed'] == 0
+
+
+if __name__ == '__main__':
+
+    OrbTools.filter( None )
+
+    TestOrbBench().test__orb_bench()
+    TestOrbBench().test__orb_bench__seed()
+
+    pass
@@ -0,0 +1,79 @@
+'''
+Use of this source code is governed by a MIT-style license that can be found in the LICENSE file.
+Created on Oct 18, 2026
+@author: Niels Lubbes
+'''
+
+from orbital.prod.orb_canonical import get_comp_lst
+from orbital.prod.orb_canonical import get_canonical_key
+
+from orbital.prod.orb_matrices import get_mat
+from orbital.prod.orb_matrices import get_emat
+from orbital.prod.orb_matrices import get_omat
+
+from orbital.sage_interface import sage_identity_matrix
+from orbital.sage_interface import sage_QQ
+
+from orbital.class_orb_tools import OrbTools
+
+
+class TestOrbCanonical( object ):
+
+    def get_vmat( self ):
+        return get_mat( 'T[0, 1, 1, 0, 0, 0, 0]', 'Rrrrs[37, 0, 0, 0]', 'T[0, -1, -1, 0, 0, 0, 0]' )
+
+    def test__get_comp_lst( self ):
+
+        comp_lst = get_comp_lst( get_omat( 'Orpmp' ) )
+        print( comp_lst )
+        assert comp_lst == [( 0, ), ( 1, 2 ), ( 3, ), ( 4, ), ( 5, ), ( 6, ), ( 7, ), ( 8, )]
+
+        comp_lst = get_comp_lst( get_mat( 'I', 'tT', 'I' ) )
+        print( comp_lst )
+        assert comp_lst[0] == ( 0, 1, 2, 8 )
+
+    def test__get_canonical_key__reparametrize( self ):
+
+        vmat = self.get_vmat()
+        omat = get_omat( 'Orrpp' )
+        key = get_canonical_key( omat, vmat )
+
+        # (c0,s0) |--> (-c0,-s0) interchanges the blocks 'r' and 's'
+        assert get_canonical_key( get_omat( 'Osspp' ), vmat ) == key
+        assert get_canonical_key( get_omat( 'Orspp' ), vmat ) != key
+
+        # (c1,s1) |--> (s1,-c1) and scaling of vmat
+        bmat = sage_identity_matrix( sage_QQ, 9 )
+        bmat[1, 1], bmat[1, 2], bmat[2, 1], bmat[2, 2] = 0, 1, -1, 0
+        assert get_canonical_key( omat, 3 * vmat * bmat ) == key
+
+    def test__get_canonical_key__permute( self ):
+
+        vmat = self.get_vmat()
+        omat = get_omat( 'Ormps' )
+
+        # conjugation by a signed permutation
+        dmat = sage_identity_matrix( sage_QQ, 9 )
+        dmat[4, 4] = -1
+        emat = get_emat( 'E[3,4,1,2,7,8,5,6]' ) * dmat
+        key = get_canonical_key( omat, vmat )
+        assert get_canonical_key( emat.T * omat * emat, emat.T * vmat ) == key
+
+        # coordinates of the projection are not permuted
+        pmat = get_mat( 'P0', 'I', 'I' )
+        key = get_canonical_key( omat, vmat, pmat )
+        assert get_canonical_key( emat.T * omat * emat, emat.T * vmat, pmat ) != key
+
+        emat = get_emat( 'E[1,2,3,4,6,5,7,8]' )
+        assert get_canonical_key( emat.T * omat * emat, emat.T * vmat, pmat ) == key
+
+
+if __name__ == '__main__':
+
+    OrbTools.filter( None )
+
+    TestOrbCanonical().test__get_comp_lst()
+    TestOrbCanonical().test__get_canonical_key__reparametrize()
+    TestOrbCanonical().test__get_canonical_key__permute()
+
+    pass
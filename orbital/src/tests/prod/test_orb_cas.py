@@ -0,0 +1,110 @@
+'''
+Use of this source code is governed by a MIT-style license that can be found in the LICENSE file.
+Created on Oct 18, 2026
+@author: Niels Lubbes
+'''
+
+import time
+
+from orbital.prod.orb_cas import get_cas_marker
+from orbital.prod.orb_cas import get_cas_pool
+from orbital.prod.orb_cas import set_cas_pool
+from orbital.prod.orb_cas import OrbCasPool
+from orbital.prod.orb_cas import OrbCasStub
+
+from orbital.class_orb_tools import OrbTools
+
+
+class TestOrbCas( object ):
+
+    def test__get_cas_marker( self ):
+
+        marker, cmd = get_cas_marker( 'maple' )
+        assert marker in cmd and cmd.endswith( ';' )
+        marker, cmd = get_cas_marker( 'magma' )
+        assert marker in cmd and cmd.endswith( ';' )
+
+    def test__eval_lst( self ):
+
+        session_lst = []
+        def factory():
+            session_lst.append( OrbCasStub( 'maple', lambda line: 'out ' + line ) )
+            return session_lst[-1]
+
+        pool = OrbCasPool( 'maple', 3, factory )
+        cmd_lst = [ 'cmd' + str( i ) + ';' for i in range( 10 ) ]
+        out_lst = pool.eval_lst( cmd_lst )
+        print( out_lst )
+        assert out_lst == [ 'out ' + cmd for cmd in cmd_lst ]
+        assert pool.eval_lst( cmd_lst, batch_size = 1 ) == out_lst
+        assert pool.eval( 'cmd;' ) == 'out cmd;'
+        assert len( session_lst ) <= 3
+
+        pool.close()
+
+    def test__timeout( self ):
+
+        def fun( line ):
+            if line == 'sleep;':
+                time.sleep( 0.5 )
+            return 'done'
+
+        session_lst = []
+        def factory():
+            session_lst.append( OrbCasStub( 'magma', fun ) )
+            return session_lst[-1]
+
+        pool = OrbCasPool( 'magma', 1, factory )
+        assert pool.eval( 'cmd;' ) == 'done'
+        try:
+            pool.eval( 'sleep;', 0.1 )
+            assert False
+        except TimeoutError:
+            pass
+        assert session_lst[0].quit_count == 1
+
+        # the worker starts a new session
+        assert pool.eval( 'cmd;' ) == 'done'
+        assert len( session_lst ) == 2
+
+        pool.close()
+
+    def test__error( self ):
+
+        session_lst = []
+        def factory():
+            session_lst.append( OrbCasStub( 'maple', lambda line: 1 // int( line[:-1] ) ) )
+            return session_lst[-1]
+
+        pool = OrbCasPool( 'maple', 1, factory )
+        try:
+            pool.eval( '0;' )
+            assert False
+        except ZeroDivisionError:
+            pass
+        assert session_lst[0].quit_count == 1
+        assert pool.eval_lst( ['1;', '-1;'] ) == ['1', '-1']
+        assert len( session_lst ) == 2
+
+        pool.close()
+
+    def test__get_cas_pool( self ):
+
+        pool = OrbCasPool( 'maple', 1, lambda: OrbCasStub( 'maple', lambda line: '' ) )
+        set_cas_pool( 'maple', pool )
+        assert get_cas_pool( 'maple' ) is pool
+        set_cas_pool( 'maple', None )
+        assert pool.thread_lst == []
+
+
+if __name__ == '__main__':
+
+    OrbTools.filter( None )
+
+    TestOrbCas().test__get_cas_marker()
+    TestOrbCas().test__eval_lst()
+    TestOrbCas().test__timeout()
+    TestOrbCas().test__error()
+    TestOrbCas().test__get_cas_pool()
+
+    pass
@@ -0,0 +1,100 @@
+'''
+Use of this source code is governed by a MIT-style license that can be found in the LICENSE file.
+Created on Oct 18, 2026
+@author: Niels Lubbes
+'''
+
+import multiprocessing
+
+from orbital.prod.orb_elim import get_elim_alg_dct
+from orbital.prod.orb_elim import orb_elim
+from orbital.prod.orb_elim import orb_elim_race
+
+from orbital.prod.orb_product import get_imp
+
+from orbital.prod.orb_matrices import get_mat
+
+from orbital.class_orb_tools import OrbTools
+
+from orbital.class_orb_ring import OrbRing
+
+
+class TestOrbElim( object ):
+
+    def test__orb_elim( self ):
+
+        R = OrbRing.get_ring( 'c0,s0,x0,x1,x2' )
+        c0, s0, x0, x1, x2 = R.gens()
+        g_lst = [x0 - 1, x1 - c0, x2 - s0, c0 ** 2 + s0 ** 2 - 1]
+
+        el_lst = orb_elim( g_lst, [c0, s0] )
+        el_ideal = R.ideal( el_lst )
+        print( el_lst )
+        assert el_ideal == R.ideal( [x0 - 1, x1 ** 2 + x2 ** 2 - 1] )
+
+        for alg in get_elim_alg_dct():
+            el_lst = orb_elim( g_lst, [c0, s0], alg )
+            print( alg, el_lst )
+            assert [ el.parent() for el in el_lst ] == len( el_lst ) * [R]
+            assert R.ideal( el_lst ) == el_ideal
+
+    def test__orb_elim_race( self ):
+
+        R = OrbRing.get_ring( 'c0,s0,x0,x1,x2' )
+        c0, s0, x0, x1, x2 = R.gens()
+        g_lst = [x0 - 1, x1 - c0, x2 - s0, c0 ** 2 + s0 ** 2 - 1]
+
+        el_lst, alg = orb_elim_race( g_lst, [c0, s0], ['std', 'slimgb'] )
+        print( alg, el_lst )
+        assert alg in ['std', 'slimgb']
+        assert R.ideal( el_lst ) == R.ideal( [x0 - 1, x1 ** 2 + x2 ** 2 - 1] )
+
+    def test__orb_elim_race__daemon( self ):
+
+        R = OrbRing.get_ring( 'c0,s0,x0,x1,x2' )
+        c0, s0, x0, x1, x2 = R.gens()
+        g_lst = [x0 - 1, x1 - c0, x2 - s0, c0 ** 2 + s0 ** 2 - 1]
+
+        # a daemonic process cannot have child processes
+        ctx = multiprocessing.get_context( 'fork' )
+        rconn, wconn = ctx.Pipe( False )
+
+        def job():
+            el_lst, alg = orb_elim_race( g_lst, [c0, s0], ['std', 'slimgb'] )
+            wconn.send( ( [ str( el ) for el in el_lst ], alg ) )
+            wconn.close()
+
+        proc = ctx.Process( target = job )
+        proc.daemon = True
+        proc.start()
+        wconn.close()
+        el_lst, alg = rconn.recv()
+        proc.join()
+
+        print( alg, el_lst )
+        assert alg == 'std'
+        assert R.ideal( [ R( el ) for el in el_lst ] ) == R.ideal( [x0 - 1, x1 ** 2 + x2 ** 2 - 1] )
+
+    def test__get_imp__race( self ):
+
+        # perseus cyclide
+        omat = get_mat( 'T[1, 0, 0, 0, 0, 0, 0]', 'Orppp', 'T[-1, 0, 0, 0, 0, 0, 0]' )
+        vmat = get_mat( 'T[0, 1, 1, 0, 0, 0, 0]', 'Rrrrs[37, 0, 0, 0]', 'T[0, -1, -1, 0, 0, 0, 0]' )
+
+        win_dct = {}
+        imp_lst = get_imp( omat, vmat, list( get_elim_alg_dct().keys() ), win_dct )
+        print( win_dct )
+        assert win_dct['imp'] in get_elim_alg_dct()
+        assert OrbRing.R.ideal( imp_lst ) == OrbRing.R.ideal( get_imp( omat, vmat ) )
+
+
+if __name__ == '__main__':
+
+    OrbTools.filter( None )
+
+    TestOrbElim().test__orb_elim()
+    TestOrbElim().test__orb_elim_race()
+    TestOrbElim().test__orb_elim_race__daemon()
+    TestOrbElim().test__get_imp__race()
+
+    pass
@@ -0,0 +1,140 @@
+'''
+Use of this source code is governed by a MIT-style license that can be found in the LICENSE file.
+Created on Oct 18, 2026
+@author: Niels Lubbes
+'''
+
+from orbital.prod.orb_interp import get_torus_pt_lst
+from orbital.prod.orb_interp import get_mon_lst
+from orbital.prod.orb_interp import get_interp_kernel
+from orbital.prod.orb_interp import get_interp_lst
+from orbital.prod.orb_interp import get_interp_dim
+from orbital.prod.orb_interp import get_interp_deg_bound
+from orbital.prod.orb_interp import get_imp_interp
+from orbital.prod.orb_interp import get_project_interp
+
+from orbital.prod.orb_product import get_imp
+from orbital.prod.orb_product import get_pmz
+from orbital.prod.orb_product import get_project
+
+from orbital.prod.orb_matrices import get_mat
+
+from orbital.class_orb_tools import OrbTools
+
+from orbital.class_orb_ring import OrbRing
+
+from orbital.sage_interface import sage_matrix
+from orbital.sage_interface import sage_QQ
+from orbital.sage_interface import sage_vector
+
+
+class TestOrbInterp( object ):
+
+    def test__get_torus_pt_lst( self ):
+
+        pt_lst = get_torus_pt_lst( 100 )
+        assert len( set( pt_lst ) ) == 100
+        for c0, s0, c1, s1 in pt_lst:
+            assert c0 ** 2 + s0 ** 2 == 1 and c1 ** 2 + s1 ** 2 == 1
+
+        assert get_torus_pt_lst( 10, 1 ) == get_torus_pt_lst( 10, 1 )
+
+        # all points are different, also if many points are sampled
+        pt_lst = get_torus_pt_lst( 100000 )
+        assert len( set( pt_lst ) ) == 100000
+
+        # the points do not depend on the cache of OrbTools
+        OrbTools.set_enable_tool_dct( False )
+        try:
+            assert get_torus_pt_lst( 10, 1 ) == get_torus_pt_lst( 10, 1 )
+        finally:
+            OrbTools.set_enable_tool_dct( True )
+
+    def test__get_mon_lst( self ):
+
+        assert get_mon_lst( 2, 2 ) == [( 2, 0 ), ( 1, 1 ), ( 0, 2 )]
+        assert len( get_mon_lst( 9, 4 ) ) == 495
+
+    def test__get_interp_kernel( self ):
+
+        # points on the conic x1^2+x2^2=x0^2 and the line x3=0
+        val_lst = [[5, 3, 4, 0], [5, -4, 3, 0], [13, 5, 12, 0], [17, 8, -15, 0], [25, -7, -24, 0], [1, 1, 0, 0], [1, 0, 1, 0]]
+        for d in [1, 2, 3]:
+            mon_lst = get_mon_lst( 4, d )
+            ker = get_interp_kernel( val_lst, mon_lst, 2 ** 10 )
+            print( ker )
+            row_lst = [ [ v0 ** e[0] * v1 ** e[1] * v2 ** e[2] * v3 ** e[3] for e in mon_lst ] for v0, v1, v2, v3 in val_lst ]
+            assert ker == sage_matrix( sage_QQ, row_lst ).right_kernel_matrix( basis = 'echelon' )
+
+        # trivial kernel
+        ker = get_interp_kernel( [ val[:3] for val in val_lst ], get_mon_lst( 3, 1 ) )
+        assert ker.nrows() == 0
+
+    def test__get_interp_lst( self ):
+
+        # circle in plane x3=0
+        pmz_lst = OrbRing.coerce( '[1, c0, s0, 0]' )
+        gen_lst = get_interp_lst( pmz_lst, 'x0,x1,x2,x3', 3 )
+        print( gen_lst )
+        Rx = gen_lst[0].parent()
+        x0, x1, x2, x3 = Rx.gens()
+        assert Rx.ideal( gen_lst ) == Rx.ideal( [x3, x1 ** 2 + x2 ** 2 - x0 ** 2] )
+        assert len( gen_lst ) == 2
+
+    def test__get_imp_interp( self ):
+
+        # perseus cyclide
+        omat = get_mat( 'T[1, 0, 0, 0, 0, 0, 0]', 'Orppp', 'T[-1, 0, 0, 0, 0, 0, 0]' )
+        vmat = get_mat( 'T[0, 1, 1, 0, 0, 0, 0]', 'Rrrrs[37, 0, 0, 0]', 'T[0, -1, -1, 0, 0, 0, 0]' )
+
+        c1, s1 = OrbRing.coerce( 'c1,s1' )
+        pmz_lst = list( omat * vmat * sage_vector( [1, c1, s1, 0, 0, 0, 0, 0, 0] ) )
+        assert get_interp_dim( pmz_lst ) == 2
+        assert get_interp_deg_bound( pmz_lst ) >= 4
+
+        imp_lst = get_imp_interp( omat, vmat, 4 )
+        print( imp_lst )
+        assert OrbRing.R.ideal( imp_lst ) == OrbRing.R.ideal( get_imp( omat, vmat ) )
+
+        # stops before the degree bound
+        assert OrbRing.R.ideal( get_imp_interp( omat, vmat ) ) == OrbRing.R.ideal( imp_lst )
+
+        win_dct = {}
+        assert get_imp( omat, vmat, 'interp', win_dct ) == imp_lst
+        assert win_dct == {'imp':'interp'}
+
+    def test__get_project_interp( self ):
+
+        # perseus cyclide
+        pmat = get_mat( 'P0', 'I', 'I' )
+        omat = get_mat( 'T[1, 0, 0, 0, 0, 0, 0]', 'Orppp', 'T[-1, 0, 0, 0, 0, 0, 0]' )
+        vmat = get_mat( 'T[0, 1, 1, 0, 0, 0, 0]', 'Rrrrs[37, 0, 0, 0]', 'T[0, -1, -1, 0, 0, 0, 0]' )
+
+        pmz_lst, prj_pmz_lst = get_pmz( pmat, omat, vmat )
+        fx, fxyz = get_project_interp( pmz_lst, pmat )
+        print( fx )
+        assert fx.total_degree() == 4
+
+        gx, gxyz = get_project( get_imp( omat, vmat ), pmat )
+        assert fx == gx
+
+        # a degenerate projection is replaced by a random projection
+        x0, x1, x2, x3 = OrbRing.coerce( 'x0,x1,x2,x3' )
+        dmat = sage_matrix( sage_QQ, 4, 9, {( 0, 0 ):1, ( 1, 1 ):1, ( 2, 2 ):1, ( 3, 1 ):1} )
+        fx, fxyz = get_project_interp( pmz_lst, dmat )
+        assert fx.total_degree() == 4
+        assert len( fx.variables() ) == 4
+
+
+if __name__ == '__main__':
+
+    OrbTools.filter( None )
+
+    TestOrbInterp().test__get_torus_pt_lst()
+    TestOrbInterp().test__get_mon_lst()
+    TestOrbInterp().test__get_interp_kernel()
+    TestOrbInterp().test__get_interp_lst()
+    TestOrbInterp().test__get_imp_interp()
+    TestOrbInterp().test__get_project_interp()
+
+    pass
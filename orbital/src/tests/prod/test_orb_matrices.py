@@ -11,6 +11,10 @@ from orbital.prod.orb_matrices import get_pmat
 from orbital.prod.orb_matrices import get_emat
 from orbital.prod.orb_matrices import get_xmat
 from orbital.prod.orb_matrices import get_mat
+from orbital.prod.orb_matrices import get_mat_comp
+from orbital.prod.orb_matrices import get_mat_comp_cached
+
+from orbital.cossin.cos_sin import get_cs_approx
 
 from orbital.class_orb_ring import OrbRing
 
@@ -107,6 +111,14 @@ class TestOrbMatrices( object ):
         assert str( list( out ) ) == '[(1, 0, 0, 0, 0, 0, 0, 0, 0), (0, 1, 0, 0, 0, 0, 0, 0, 0), (0, 0, 1, 0, 0, 0, 0, 0, 0), (0, 0, 0, 119/169, -120/169, 0, 0, 0, 0), (0, 0, 0, 120/169, 119/169, 0, 0, 0, 0), (0, 0, 0, 0, 0, 1, 0, 0, 0), (0, 0, 0, 0, 0, 0, 1, 0, 0), (0, 0, 0, 0, 0, 0, 0, 1, 0), (0, 0, 0, 0, 0, 0, 0, 0, 1)]'
 
 
+    def test__get_rmat_3( self ):
+        out = get_rmat( 'Rprpp[0,37.5,0,0]' )
+        print( out )
+        c, s = get_cs_approx( 37.5 )
+        assert out[3, 3] == c and out[3, 4] == -s and out[4, 3] == s and out[4, 4] == c
+        assert c != 4 / 5
+
+
     def test__get_pmat__True( self ):
         out = get_pmat( True )
         print( out )
@@ -189,6 +201,44 @@ class TestOrbMatrices( object ):
         assert str( list( out ) ) == '[(1, 0, 0, 0, 0, 0, 0, 0, 0), (0, 1, 0, 0, 0, 0, 0, 0, 0), (0, 0, c0, -s0, 0, 0, 0, 0, 0), (0, 0, s0, c0, 0, 0, 0, 0, 0), (0, 0, 0, 0, 1, 0, 0, 0, 0), (0, 0, 0, 0, 0, 1, 0, 0, 0), (0, 0, 0, 0, 0, 0, 1, 0, 0), (0, 0, 0, 0, 0, 0, 0, 1, 0), (0, 0, 0, 0, 0, 0, 0, 0, 1)]'
 
 
+    def test__get_tmat__T( self ):
+        q = [1, -2, 0, 3, 0, 0, 1]
+        out = get_tmat( 'T' + str( q ) )
+        print( out )
+        t = OrbRing.coerce( '[t1,t2,t3,t4,t5,t6,t7]' )
+        dct = {t[i]:q[i] for i in range( 7 )}
+        assert list( out ) == list( get_tmat( None ).subs( dct ) )
+        assert out.base_ring() == OrbRing.num_field
+
+
+    def test__get_mat_comp( self ):
+        get_mat_comp_cached.cache_clear()
+
+        out = get_mat_comp( 'Rrppp[45,0,0,0]' )
+        assert out.is_immutable()
+        assert get_mat_comp( 'Rrppp[45,0,0,0]' ) is out
+        assert get_mat_comp_cached.cache_info().hits == 1
+
+        # random matrices are not cached
+        out = get_mat_comp( 'E' )
+        assert out.is_immutable()
+        assert get_mat_comp_cached.cache_info().currsize == 1
+
+        try:
+            get_mat_comp( 'Q' )
+            assert False
+        except ValueError:
+            pass
+
+
+    def test__get_mat__immutable( self ):
+        tup = ( 'T[0, 1, 1, 0, 0, 0, 0]', 'Rrrrs[37, 0, 0, 0]', 'T[0, -1, -1, 0, 0, 0, 0]' )
+        out = get_mat( *tup )
+        assert out.is_immutable()
+        assert out == get_tmat( tup[0] ) * get_rmat( tup[1] ) * get_tmat( tup[2] )
+        assert get_mat( *tup ) == out
+        assert hash( get_mat( *tup ) ) == hash( out )
+
 
 
 if __name__ == '__main__':
@@ -198,6 +248,7 @@ if __name__ == '__main__':
 #     TestOrbMatrices().test__get_omat_2()
 #     TestOrbMatrices().test__get_rmat_1()
 #     TestOrbMatrices().test__get_rmat_2()
+#     TestOrbMatrices().test__get_rmat_3()
 #     TestOrbMatrices().test__get_pmat__True()
 #     TestOrbMatrices().test__get_pmat__False()
 #     TestOrbMatrices().test__get_emat__E_21435678()
@@ -206,5 +257,8 @@ if __name__ == '__main__':
 #     TestOrbMatrices().test__get_xmat__0_90_0()
 #     TestOrbMatrices().test__get_xmat__0_0_90()
 #     TestOrbMatrices().test__get_mat__I_Orppp_I()
+#     TestOrbMatrices().test__get_tmat__T()
+#     TestOrbMatrices().test__get_mat_comp()
+#     TestOrbMatrices().test__get_mat__immutable()
     TestOrbMatrices().test__get_mat_1()
     pass
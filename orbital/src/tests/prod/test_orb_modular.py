@@ -0,0 +1,104 @@
+'''
+Use of this source code is governed by a MIT-style license that can be found in the LICENSE file.
+Created on Oct 18, 2026
+@author: Niels Lubbes
+'''
+
+from orbital.prod.orb_modular import get_crt
+from orbital.prod.orb_modular import get_rat_recon
+from orbital.prod.orb_modular import get_mod_elim
+from orbital.prod.orb_modular import get_lift_verify
+from orbital.prod.orb_modular import orb_modular_elim
+
+from orbital.prod.orb_product import get_imp
+
+from orbital.prod.orb_matrices import get_mat
+
+from orbital.class_orb_tools import OrbTools
+
+from orbital.class_orb_ring import OrbRing
+
+
+class TestOrbModular( object ):
+
+    def test__get_crt( self ):
+
+        assert get_crt( 2, 3, 3, 5 ) == 8
+        assert get_crt( 0, 7, 0, 11 ) == 0
+        x = get_crt( 12345, 32003, 678, 32009 )
+        assert x % 32003 == 12345 and x % 32009 == 678
+
+    def test__get_rat_recon( self ):
+
+        m = 32003 * 32009
+        for num, den in [( 3, 7 ), ( -22, 5 ), ( 0, 1 ), ( 123, 1 )]:
+            a = ( num * pow( den, -1, m ) ) % m
+            assert get_rat_recon( a, m ) == ( num, den )
+
+        # modulus too small for this fraction
+        m = 101
+        a = ( 1000 * pow( 999, -1, m ) ) % m
+        assert get_rat_recon( a, m ) != ( 1000, 999 )
+
+    def test__get_mod_elim( self ):
+
+        R = OrbRing.get_ring( 'c0,s0,x0,x1,x2' )
+        c0, s0, x0, x1, x2 = R.gens()
+        g_lst = [x0 - 1, 3 * x1 - c0, x2 - s0 / 7, c0 ** 2 + s0 ** 2 - 1]
+
+        lm_key, dct_lst = get_mod_elim( g_lst, [c0, s0], 32003 )
+        print( lm_key, dct_lst )
+        assert len( dct_lst ) == 2
+        assert get_mod_elim( g_lst, [c0, s0], 7 ) == None
+
+    def test__get_lift_verify( self ):
+
+        R = OrbRing.get_ring( 'c0,s0,x0,x1,x2' )
+        c0, s0, x0, x1, x2 = R.gens()
+        g_lst = [x0 - 1, 3 * x1 - c0, x2 - s0 / 7, c0 ** 2 + s0 ** 2 - 1]
+        gb_lst = R.ideal( g_lst ).groebner_basis()
+
+        el_lst = R.ideal( g_lst ).elimination_ideal( [c0, s0] ).groebner_basis()
+        assert get_lift_verify( g_lst, [c0, s0], el_lst, gb_lst, 32003 )
+
+        # lift that misses a generator
+        assert not get_lift_verify( g_lst, [c0, s0], [x0 - 1], gb_lst, 32003 )
+
+        # lift that is not contained in the ideal
+        assert not get_lift_verify( g_lst, [c0, s0], [x0 - 1, x1 ** 2 + x2 ** 2 - 1], gb_lst, 32003 )
+
+    def test__orb_modular_elim( self ):
+
+        R = OrbRing.get_ring( 'c0,s0,x0,x1,x2' )
+        c0, s0, x0, x1, x2 = R.gens()
+        g_lst = [x0 - 1, 3 * x1 - c0, x2 - s0 / 7, c0 ** 2 + s0 ** 2 - 1]
+
+        el_lst = orb_modular_elim( g_lst, [c0, s0], workers = 2 )
+        print( el_lst )
+        assert R.ideal( el_lst ) == R.ideal( g_lst ).elimination_ideal( [c0, s0] )
+        assert all( [ el.denominator() == 1 for el in el_lst ] )
+
+    def test__get_imp__modular( self ):
+
+        # perseus cyclide
+        omat = get_mat( 'T[1, 0, 0, 0, 0, 0, 0]', 'Orppp', 'T[-1, 0, 0, 0, 0, 0, 0]' )
+        vmat = get_mat( 'T[0, 1, 1, 0, 0, 0, 0]', 'Rrrrs[37, 0, 0, 0]', 'T[0, -1, -1, 0, 0, 0, 0]' )
+
+        win_dct = {}
+        imp_lst = get_imp( omat, vmat, 'modular', win_dct )
+        assert win_dct == {'imp':'modular'}
+        assert OrbRing.R.ideal( imp_lst ) == OrbRing.R.ideal( get_imp( omat, vmat ) )
+
+
+if __name__ == '__main__':
+
+    OrbTools.filter( None )
+
+    TestOrbModular().test__get_crt()
+    TestOrbModular().test__get_rat_recon()
+    TestOrbModular().test__get_mod_elim()
+    TestOrbModular().test__get_lift_verify()
+    TestOrbModular().test__orb_modular_elim()
+    TestOrbModular().test__get_imp__modular()
+
+    pass
@@ -4,19 +4,36 @@ Created on Apr 5, 2018
 @author: Niels Lubbes
 '''
 import os
+import json
+import tempfile
 
+from orbital.prod.orb_product import get_imp_ideal
 from orbital.prod.orb_product import get_emb_dim
 from orbital.prod.orb_product import get_deg_dim
 from orbital.prod.orb_product import get_project
+from orbital.prod.orb_product import get_project_mod
+from orbital.prod.orb_product import get_project_screen
 from orbital.prod.orb_product import get_factor_lst
+from orbital.prod.orb_product import get_factor_lst_lst
 from orbital.prod.orb_product import get_genus
+from orbital.prod.orb_product import get_genus_lst
 from orbital.prod.orb_product import get_sing_lst
+from orbital.prod.orb_product import get_sing_lst_singular
 from orbital.prod.orb_product import get_pmz
 from orbital.prod.orb_product import get_orb_bp_tree
 from orbital.prod.orb_product import get_imp
+from orbital.prod.orb_product import get_imp_mod
+from orbital.prod.orb_product import get_mod_dde
 from orbital.prod.orb_product import get_pmz_verify
+from orbital.prod.orb_product import get_pmz_verify_mod
+from orbital.prod.orb_product import get_pol_stats
+from orbital.prod.orb_product import get_metrics_writer
 from orbital.prod.orb_product import orb_product
 
+from orbital.prod.orb_cas import OrbCasPool
+from orbital.prod.orb_cas import OrbCasStub
+from orbital.prod.orb_cas import set_cas_pool
+
 from orbital.prod.class_orb_input import OrbInput
 from orbital.prod.class_orb_output import OrbOutput
 
@@ -28,6 +45,7 @@ from orbital.prod.orb_matrices import get_pmat
 from orbital.prod.orb_matrices import get_mat
 
 from orbital.sage_interface import sage__eval
+from orbital.sage_interface import sage_matrix
 from orbital.sage_interface import sage_maple
 from orbital.sage_interface import sage_magma
 from orbital.sage_interface import sage_identity_matrix
@@ -62,6 +80,21 @@ class TestOrbInput( object ):
         print( deg_dim )
         assert deg_dim == ( 4, 2 )
 
+    def test__get_imp_ideal( self ):
+
+        imp_lst = OrbRing.coerce( '[-x0^2+x1^2+x2^2+x3^2+x4^2+x5^2+x6^2+x7^2+x8^2, x8, x7, x6, x5, x1*x2-x0*x4]' )
+        I = get_imp_ideal( imp_lst )
+        assert get_imp_ideal( I ) is I
+        assert I.ring().ngens() == 9
+
+        # Groebner basis is computed once
+        gb = I.groebner_basis()
+        assert I.groebner_basis() is gb
+
+        assert get_emb_dim( I ) == get_emb_dim( imp_lst ) == 3
+        assert get_deg_dim( I ) == get_deg_dim( imp_lst ) == ( 4, 2 )
+        assert get_project( I, get_pmat( False ) ) == get_project( imp_lst, get_pmat( False ) )
+
     def test__get_project( self ):
 
         pol_lst = OrbRing.coerce( '[-x0^2+x1^2+x2^2+x3^2+x4^2+x5^2+x6^2+x7^2+x8^2, x8, x7, x6, x5, x1*x2-x0*x4]' )
@@ -72,6 +105,30 @@ class TestOrbInput( object ):
         print( out )
         assert str( out ) == '(x0^4 - x0^2*x1^2 - x0^2*x2^2 - x1^2*x2^2 - x0^2*x3^2, -x^2*y^2 - x^2 - y^2 - z^2 + 1)'
 
+    def test__get_project_mod( self ):
+
+        pol_lst = OrbRing.coerce( '[-x0^2+x1^2+x2^2+x3^2+x4^2+x5^2+x6^2+x7^2+x8^2, x8, x7, x6, x5, x1*x2-x0*x4]' )
+        assert get_project_mod( pol_lst, get_pmat( False ) )
+
+        # projection to coordinates that vanish on the surface
+        pmat = sage_matrix( [ 5 * [0] + [ int( i == j ) for j in range( 4 )] for i in range( 4 ) ] )
+        assert not get_project_mod( pol_lst, pmat )
+
+    def test__get_project_screen( self ):
+
+        pol_lst = OrbRing.coerce( '[-x0^2+x1^2+x2^2+x3^2+x4^2+x5^2+x6^2+x7^2+x8^2, x8, x7, x6, x5, x1*x2-x0*x4]' )
+        pmat = get_pmat( False )
+        assert get_project_screen( pol_lst, pmat ) == ( pmat, 1 )
+
+        bad_pmat = sage_matrix( [ 5 * [0] + [ int( i == j ) for j in range( 4 )] for i in range( 4 ) ] )
+        new_pmat, tries = get_project_screen( pol_lst, bad_pmat, workers = 2 )
+        print( new_pmat, tries )
+        assert tries > 1
+        assert get_project_mod( pol_lst, new_pmat )
+
+        fx, fxyz = get_project( pol_lst, bad_pmat )
+        assert len( fx.variables() ) == 4
+
     def test__get_factor_lst( self ):
 
         pol = OrbRing.coerce( '(x1-x0)^3*(x1-3*x0)^2*(x2^2+x3^2)' )
@@ -92,6 +149,32 @@ class TestOrbInput( object ):
         print( fct_lst )
         assert str( fct_lst ) == "[('x2-RootOf(_Z^2+1)*x3', '1'), ('x2+RootOf(_Z^2+1)*x3', '1'), ('x0-1/3*x1', '2'), ('x0-x1', '3')]"
 
+    def test__get_factor_lst__stub( self ):
+
+        pol_lst = OrbRing.coerce( '[x1^2-x2^2, (x1-3*x0)^2]' )
+        out_dct = {}
+        out_dct['lprint(evala(AFactors(x1^2 - x2^2)));'] = '[1, [[x1-x2, 1], [x1+x2, 1]]]'
+        out_dct['lprint(evala(AFactors(9*x0^2 - 6*x0*x1 + x1^2)));'] = '[9, [[x0-1/3*x1, 2]]]'
+        out_dct['lprint(algcurves[genus](x1^2 - x2^2,x1,x2));'] = '-1'
+        out_dct['lprint(algcurves[genus](x1^2 + x1*x2 + x2^2,x1,x2));'] = '0'
+        fun = lambda line: out_dct.get( line, 'Error, (in stub) unknown command' )
+
+        set_cas_pool( 'maple', OrbCasPool( 'maple', 2, lambda: OrbCasStub( 'maple', fun ) ) )
+        try:
+            fct_lst_lst = get_factor_lst_lst( pol_lst )
+            print( fct_lst_lst )
+            assert fct_lst_lst == [[( 'x1-x2', '1' ), ( 'x1+x2', '1' )], [( 'x0-1/3*x1', '2' )]]
+            assert get_factor_lst( pol_lst[0] ) == fct_lst_lst[0]
+            assert get_factor_lst( pol_lst[0] * pol_lst[1] ) == []
+
+            # the plane sections with x0=0 are x1^2-x2^2 and x1^2+x1*x2+x2^2
+            pol_lst = OrbRing.coerce( '[x1^2-x2^2+x0^2, x1^2+x1*x2+x2^2+x0*x3, x1^3+x2^3+x3^3]' )
+            gen_lst = get_genus_lst( pol_lst, 'x0' )
+            print( gen_lst )
+            assert gen_lst == [-1, 0, -2]
+        finally:
+            set_cas_pool( 'maple', None )
+
     def test__get_genus( self ):
 
         pol = OrbRing.coerce( '(x1^2+x2^2+x3^2+3*x0^2)^2-16*(x1^2+x2^2)' )
@@ -131,6 +214,25 @@ class TestOrbInput( object ):
         print( sng_lst )
         assert str( sng_lst ) == "[('[x0^2 + 1/3*x3^2,x1,x2]', 2), ('[x0,x1^2 + x2^2 + x3^2]', 2*t + 1)]"
 
+    def test__get_sing_lst_singular( self ):
+        pol = OrbRing.coerce( '(x1^2+x2^2+x3^2+3*x0^2)^2-16*x0^2*(x1^2+x2^2)' )
+        print( pol )
+
+        sng_lst = get_sing_lst_singular( pol )
+        print( sng_lst )
+        assert str( sorted( sng_lst ) ) == "[('[x0,x1^2 + x2^2 + x3^2]', 2*t + 1), ('[x0^2 + 1/3*x3^2,x1,x2]', 2)]"
+
+        # singular locus of the projection of the perseus cyclide
+        input = OrbInput().set_short_str( "['@(4,3)=(deg,emb)', {'pmat': ('P0', 'I', 'I'), 'omat': ('T[1, 0, 0, 0, 0, 0, 0]', 'Orppp', 'T[-1, 0, 0, 0, 0, 0, 0]'), 'vmat': ('T[0, 1, 1, 0, 0, 0, 0]', 'Rrrrs[37, 0, 0, 0]', 'T[0, -1, -1, 0, 0, 0, 0]')}]" )
+        for key in input.do.keys(): input.do[key] = False
+        input.do['imp'] = True
+        input.do['prj'] = True
+        input.do['sng'] = True
+        input.alg['sng'] = 'singular'
+        o = orb_product( input )
+        print( o.sng_lst )
+        assert str( o.sng_lst ) == "[('[x0,x1^2 + x2^2 + x3^2]', 2*t + 1)]"
+
     def test__get_pmz( self ):
         pmat = get_pmat( False )
         omat = sage_identity_matrix( 9 )
@@ -162,6 +264,78 @@ class TestOrbInput( object ):
         print( imp_lst )
         assert str( imp_lst ) == '[x7, x6, x5, x4, 100*x1^2 - 4*x0*x3 - 40*x1*x3 + 9*x3^2 - 200*x1*x8 + 44*x3*x8 + 100*x8^2, 100*x0^2 - 100*x2^2 - 4*x0*x3 - 40*x1*x3 - 91*x3^2 - 200*x1*x8 + 44*x3*x8]'
 
+    def test__get_imp_mod( self ):
+
+        omat = get_mat( 'T[1, 0, 0, 0, 0, 0, 0]', 'Orppp', 'T[-1, 0, 0, 0, 0, 0, 0]' )
+        vmat = get_mat( 'T[0, 1, 1, 0, 0, 0, 0]', 'Rrrrs[37, 0, 0, 0]', 'T[0, -1, -1, 0, 0, 0, 0]' )
+
+        imp_lst = get_imp_mod( omat, vmat )
+        print( imp_lst )
+        assert imp_lst[0].parent().characteristic() == 32003
+        Rp = imp_lst[0].parent()
+        assert Rp.ideal( [ Rp( imp ) for imp in get_imp( omat, vmat ) ] ) == Rp.ideal( imp_lst )
+
+        # 5 divides a denominator of the generators
+        imp_lst = get_imp_mod( omat, vmat, 5 )
+        assert imp_lst[0].parent().characteristic() == 7
+
+        assert get_mod_dde( omat, vmat ) == ( 4, 3, 2 )
+
+    def test__orb_product__mod_filter( self ):
+
+        # perseus cyclide
+        s = "['@(4,3)=(deg,emb)', {'pmat': ('P0', 'I', 'I'), 'omat': ('T[1, 0, 0, 0, 0, 0, 0]', 'Orppp', 'T[-1, 0, 0, 0, 0, 0, 0]'), 'vmat': ('T[0, 1, 1, 0, 0, 0, 0]', 'Rrrrs[37, 0, 0, 0]', 'T[0, -1, -1, 0, 0, 0, 0]')}]"
+
+        input = OrbInput().set_short_str( s )
+        for key in input.do.keys(): input.do[key] = False
+        input.do['imp'] = True
+        input.do['dde'] = True
+
+        o = orb_product( input, mod_filter = lambda deg, emb, dim: deg > 4 )
+        assert o.mod_dde == ( 4, 3, 2 )
+        assert o.imp_lst == None
+
+        o = orb_product( input, mod_filter = lambda deg, emb, dim: deg == 4 )
+        assert o.mod_dde == ( 4, 3, 2 )
+        assert ( o.deg, o.emb, o.dim ) == ( 4, 3, 2 )
+
+    def test__get_pol_stats( self ):
+
+        pol_lst = OrbRing.coerce( '[x0^3 + x1*x2 - 1, x0 - x1]' )
+        assert get_pol_stats( pol_lst ) == ( 2, 3, 5 )
+        assert get_pol_stats( [pol_lst, ( pol_lst[1], 7 )] ) == ( 3, 3, 7 )
+        assert get_pol_stats( None ) == ( 0, 0, 0 )
+
+    def test__orb_product__metrics( self ):
+
+        # perseus cyclide
+        s = "['@(4,3)=(deg,emb)', {'pmat': ('P0', 'I', 'I'), 'omat': ('T[1, 0, 0, 0, 0, 0, 0]', 'Orppp', 'T[-1, 0, 0, 0, 0, 0, 0]'), 'vmat': ('T[0, 1, 1, 0, 0, 0, 0]', 'Rrrrs[37, 0, 0, 0]', 'T[0, -1, -1, 0, 0, 0, 0]')}]"
+
+        input = OrbInput().set_short_str( s )
+        for key in input.do.keys(): input.do[key] = False
+        input.do['imp'] = True
+        input.do['dde'] = True
+        input.do['prj'] = True
+
+        fname = tempfile.mkdtemp() + '/metrics.jsonl'
+        rec_lst = []
+        def metrics( rec ):
+            rec_lst.append( rec )
+            get_metrics_writer( fname )( rec )
+
+        o = orb_product( input, metrics = metrics )
+        assert [ rec['stage'] for rec in rec_lst ] == ['imp', 'dde', 'prj']
+        for rec in rec_lst:
+            assert rec['input'] == str( input.info_dct )
+            assert rec['cached'] == False
+            assert rec['wall'] >= 0 and rec['cpu'] >= 0 and rec['maxrss'] > 0
+        assert rec_lst[0]['num_pol'] == len( o.imp_lst )
+        assert rec_lst[2]['max_deg'] == 4  # projection of a quartic surface
+
+        with open( fname, 'r' ) as json_file:
+            line_lst = json_file.read().splitlines()
+        assert [ json.loads( line ) for line in line_lst ] == rec_lst
+
     def test__get_pmz_verify__perseus( self ):
 
         o = OrbOutput( OrbInput() )
@@ -182,6 +356,24 @@ class TestOrbInput( object ):
         print( tst )
         assert tst == True
 
+        assert get_pmz_verify( o, True ) == True
+        o.input.alg['tst'] = 'exact'
+        assert get_pmz_verify( o ) == True
+
+    def test__get_pmz_verify_mod( self ):
+
+        pmz_lst = OrbRing.coerce( '[1, c0, s0, c1]' )
+        pol = OrbRing.coerce( 'x1^2+x2^2-x0^2' )
+        assert get_pmz_verify_mod( pol, pmz_lst, seed = 1 )
+
+        pol = OrbRing.coerce( 'x1^2+x2^2-x0^2+x3^2' )
+        assert not get_pmz_verify_mod( pol, pmz_lst, seed = 1 )
+
+        # a prime that divides a denominator is skipped
+        pmz_lst = OrbRing.coerce( '[1, c0/5, s0/5, c1]' )
+        pol = OrbRing.coerce( '25*x1^2+25*x2^2-x0^2' )
+        assert get_pmz_verify_mod( pol, pmz_lst, 2 ** -10, 5 )
+
     def test__orb_product__65_smooth( self ):
 
         os.environ['PATH'] += os.pathsep + '/home/niels/Desktop/n/app/maple/link/bin'
@@ -293,14 +485,24 @@ if __name__ == '__main__':
     TestOrbInput().test__get_deg_dim_1()
     TestOrbInput().test__get_deg_dim_2()
     TestOrbInput().test__get_deg_dim_3()
+    TestOrbInput().test__get_imp_ideal()
     TestOrbInput().test__get_project()
+    TestOrbInput().test__get_project_mod()
+    TestOrbInput().test__get_project_screen()
     TestOrbInput().test__get_factor_lst()
+    TestOrbInput().test__get_factor_lst__stub()
     TestOrbInput().test__get_genus()
     TestOrbInput().test__get_sing_lst()
+    TestOrbInput().test__get_sing_lst_singular()
     TestOrbInput().test__get_pmz()
     TestOrbInput().test__get_orb_bp_tree()
     TestOrbInput().test__get_imp()
+    TestOrbInput().test__get_imp_mod()
+    TestOrbInput().test__orb_product__mod_filter()
+    TestOrbInput().test__get_pol_stats()
+    TestOrbInput().test__orb_product__metrics()
     TestOrbInput().test__get_pmz_verify__perseus()
+    TestOrbInput().test__get_pmz_verify_mod()
     TestOrbInput().test__orb_product__65_smooth()
     TestOrbInput().test__orb_product__65_sing()
     TestOrbInput().test__orb_product__43_perseus()
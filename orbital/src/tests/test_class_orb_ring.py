@@ -4,6 +4,10 @@ Created on Nov 23, 2017
 @author: Niels Lubbes
 '''
 
+import os
+import sys
+import subprocess
+
 from orbital.sage_interface import sage_QQ
 from orbital.sage_interface import sage_n
 
@@ -18,6 +22,41 @@ class TestOrbRing( object ):
     def test__coerce( self ):
         assert OrbRing.coerce( 'x8+v8+s1+c1+t7' ) in OrbRing.R
 
+    def test__R__lazy( self ):
+
+        # "OrbRing.R" is constructed on first use in a fresh process
+        code = ''
+        code += 'from orbital.class_orb_ring import OrbRing\n'
+        code += 'assert "R" not in OrbRing.__dict__\n'
+        code += 'R = OrbRing.R\n'
+        code += 'assert OrbRing.__dict__["R"] is R\n'
+        code += 'print( R.ngens() )\n'
+
+        env = dict( os.environ )
+        src = os.path.dirname( os.path.dirname( os.path.abspath( sys.modules[OrbRing.__module__].__file__ ) ) )
+        env['PYTHONPATH'] = src + os.pathsep + env.get( 'PYTHONPATH', '' )
+        out = subprocess.check_output( [sys.executable, '-c', code], env = env )
+        assert out.strip() == b'31'
+        assert OrbRing.R.ngens() == 31
+
+    def test__get_ring( self ):
+
+        R = OrbRing.get_ring( 'c0,s0,c1,s1' )
+        assert R is OrbRing.get_ring( 'c0,s0,c1,s1' )
+        assert R.ngens() == 4
+        assert R.base_ring() == sage_QQ
+
+        pol = OrbRing.coerce( 'c0^2+s1/3' )
+        assert OrbRing.R( R( pol ) ) == pol
+        assert str( R( pol ) ) == str( pol )
+
+    def test__get_var_ring( self ):
+
+        pol_lst = OrbRing.coerce( '[s1*x3+1, c0-v8, 5]' )
+        R = OrbRing.get_var_ring( pol_lst )
+        assert R.variable_names() == ( 'x3', 'v8', 'c0', 's1' )
+        assert OrbRing.get_var_ring( [1] ).variable_names() == ( 'x0', )
+
     def test__random_int( self ):
         val = 10
         rnd = OrbRing.random_int( val )
@@ -125,6 +164,9 @@ class TestOrbRing( object ):
 if __name__ == '__main__':
 
     # TestOrbRing().test__coerce()
+    # TestOrbRing().test__R__lazy()
+    # TestOrbRing().test__get_ring()
+    # TestOrbRing().test__get_var_ring()
     # TestOrbRing().test__random_int()
     # TestOrbRing().test__random_elt()
     # TestOrbRing().test__approx_QQ_coef__1()
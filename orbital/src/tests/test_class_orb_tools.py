@@ -25,6 +25,37 @@ class TestClassOrbTools:
         OrbTools.filter( ['test_class_orb_tools.py'] )
         assert OrbTools.p( 'Only output if called from this class' ) != None
 
+    def test__p__level( self ):
+
+        OrbTools.filter( None )
+        OrbTools.set_level( 1 )
+        assert OrbTools.p( 'Progress is shown.' ) != None
+        assert OrbTools.p( 'Details are not shown.', lvl = 2 ) == None
+
+        OrbTools.set_level( 2 )
+        assert OrbTools.p( 'Details are shown.', lvl = 2 ) != None
+
+        OrbTools.set_level( 0 )
+        assert OrbTools.p( 'Nothing is shown.' ) == None
+        OrbTools.set_level( 2 )
+
+    def test__p__lazy( self ):
+
+        call_lst = []
+        def get_str():
+            call_lst.append( True )
+            return 'expensive'
+
+        OrbTools.filter( [] )
+        assert OrbTools.p( 'Not evaluated:', get_str ) == None
+        assert call_lst == []
+
+        OrbTools.filter( None )
+        out = OrbTools.p( 'Evaluated:', get_str, lambda: 1 + 1 )
+        assert call_lst == [True]
+        assert 'Evaluated: expensive 2' in out
+        assert out.startswith( 'test__p__lazy(' )
+
 
     def test__tool_dct( self ):
 
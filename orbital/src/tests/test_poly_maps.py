@@ -5,6 +5,8 @@ Created on Nov 23, 2017
 '''
 
 from orbital.poly_maps import ring_dict
+from orbital.poly_maps import convert_pol
+from orbital.poly_maps import get_var_info
 from orbital.poly_maps import invert_map
 from orbital.poly_maps import invert_birational_map
 from orbital.poly_maps import image_map
@@ -35,6 +37,40 @@ class TestPolyMaps( object ):
         print( out )
         assert str( out ) == chk
 
+    def test__convert_pol( self ):
+
+        Rx = sage_PolynomialRing( sage_QQ, 'x0,x1,x2' )
+        Ry = sage_PolynomialRing( sage_QQ, 'y2,y1,y0,t' )
+        x0, x1, x2 = Rx.gens()
+        y2, y1, y0, t = Ry.gens()
+
+        out = convert_pol( [x0 ** 2 * x2 - x1 / 3, 5], Ry, {'x0':'y0', 'x1':'y1', 'x2':'y2'} )
+        print( out )
+        assert out == [y0 ** 2 * y2 - y1 / 3, 5]
+        assert out[0].parent() == Ry
+
+        # variables are mapped by name
+        assert convert_pol( x1 + 1, sage_PolynomialRing( sage_QQ, 'x1,z' ) ) == convert_pol( 'x1 + 1', sage_PolynomialRing( sage_QQ, 'x1,z' ) )
+
+        # univariate rings
+        Rt = sage_PolynomialRing( sage_QQ, 't' )
+        assert convert_pol( t ** 3 - 2 * t, Rt ) == Rt.gen() ** 3 - 2 * Rt.gen()
+        assert convert_pol( Rt.gen() ** 2, Ry ) == t ** 2
+
+        try:
+            convert_pol( x0 + x1, Ry )
+            assert False
+        except ValueError:
+            pass
+
+    def test__get_var_info( self ):
+
+        Rx = sage_PolynomialRing( sage_QQ, 'x0,x1,x2,x3' )
+        x0, x1, x2, x3 = Rx.gens()
+
+        assert get_var_info( [x0 - x3, x1, x2], '[x0^2 + x12]' ) == ( 'x', 'y', 12 )
+        assert get_var_info( '[y0, 2*y1^2]' ) == ( 'y', 'x', 1 )
+
     def test__invert_map__stereographic_projection( self ):
         X = '[x1^2 + x2^2 + x3^2 + x4^2 - x0^2]'
         f = '[x0-x4, x1, x2, x3]'
@@ -145,6 +181,8 @@ class TestPolyMaps( object ):
 if __name__ == '__main__':
 
     TestPolyMaps().test__ring_dict()
+    TestPolyMaps().test__convert_pol()
+    TestPolyMaps().test__get_var_info()
     TestPolyMaps().test__invert_map__stereographic_projection()
     TestPolyMaps().test__invert_birational_map__stereographic_projection()
     TestPolyMaps().test__image_map__two_sphere_cyclide()